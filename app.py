@@ -1,6 +1,6 @@
 # app.py
 import os
-from flask import Flask, abort, send_from_directory
+from flask import Flask, send_from_directory
 from flask_cors import CORS
 
 from modules import (
@@ -10,8 +10,10 @@ from modules import (
     gm_mail_bp,
     gm_bp,
     ivr_bp,
+    jobs_bp,
     mail_bp,
     porsche_bp,
+    preflight_bp,
     resultantes_bp,
     sant_hipotecario_bp,
     santander_consumer_bp,
@@ -19,7 +21,8 @@ from modules import (
     sms_bp,
     tanner_bp,
 )
-from frontend import FRONTEND_DIST, FRONTEND_PUBLIC, serve_react_app, ensure_frontend_build
+from services import artifact_registry
+from frontend import FRONTEND_DIST, FRONTEND_PUBLIC, serve_frontend_asset, serve_react_app, ensure_frontend_build
 
 def _register_frontend_routes(app: Flask) -> None:
     spa_paths = [
@@ -47,10 +50,7 @@ def _register_frontend_routes(app: Flask) -> None:
 
     @app.route("/assets/<path:filename>")
     def serve_frontend_assets(filename: str):
-        assets_dir = FRONTEND_DIST / "assets"
-        if not assets_dir.exists():
-            abort(404)
-        return send_from_directory(assets_dir, filename)
+        return serve_frontend_asset(filename)
 
     @app.route("/favicon.svg")
     def serve_frontend_favicon():
@@ -88,8 +88,11 @@ def create_app():
     app.register_blueprint(resultantes_bp)
     app.register_blueprint(crm_bp)
     app.register_blueprint(backoffice_bp)
+    app.register_blueprint(preflight_bp)
+    app.register_blueprint(jobs_bp)
 
     _register_frontend_routes(app)
+    artifact_registry.start_janitor()
 
     if os.getenv("AUTO_BUILD_FRONTEND", "0").lower() in {"1", "true", "yes"}:
         ensure_frontend_build(force=True)
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import gzip
+import hashlib
+import mimetypes
 import os
+import re
 import subprocess
+from pathlib import Path
 
-from flask import Response, abort, send_from_directory
+from flask import Response, abort, request, send_file, send_from_directory
+from werkzeug.security import safe_join
 
 from utils.paths import FRONTEND_DIR, FRONTEND_DIST, FRONTEND_PUBLIC
 
@@ -11,6 +17,19 @@ _BUILD_HINT = "React build no encontrado. Ejecuta `npm install && npm run build`
 _AUTO_BUILD = os.getenv("AUTO_BUILD_FRONTEND", "0").lower() in {"1", "true", "yes"}
 _AUTO_BUILT = False
 
+# Vite nombra los bundles como nombre-<hash>.ext: su contenido no cambia nunca para esa URL.
+_HASHED_ASSET_RE = re.compile(r"-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+_IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+# Variantes generadas por precompress_dist, en orden de preferencia.
+_PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+_COMPRESSIBLE = {".js", ".mjs", ".css", ".html", ".svg", ".json", ".txt", ".map", ".wasm"}
+_COMPRESS_MIN_BYTES = 1024
+# Solo se deja la variante si ahorra al menos este porcentaje.
+_COMPRESS_MIN_SAVING = 0.1
+
+_INDEX_CACHE: tuple[tuple[str, int, int], bytes, str] | None = None
+
 
 def _find_latest_bundle(assets_dir: Path, pattern: str) -> Path | None:
     candidates = sorted(
@@ -53,6 +72,43 @@ def _render_runtime_index() -> str | None:
     )
 
 
+def _index_signature() -> tuple[str, int, int] | None:
+    # Un solo stat por request: index.html compilado o, si no existe, el directorio assets/
+    # (su mtime cambia cuando el build agrega o borra bundles).
+    for path in (FRONTEND_DIST / "index.html", FRONTEND_DIST / "assets"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        return str(path), stat.st_mtime_ns, stat.st_size
+    return None
+
+
+def _load_index() -> bytes | None:
+    dist_index = FRONTEND_DIST / "index.html"
+    if dist_index.exists():
+        return dist_index.read_bytes()
+    runtime_index = _render_runtime_index()
+    return runtime_index.encode("utf-8") if runtime_index is not None else None
+
+
+def _cached_index() -> tuple[bytes, str] | None:
+    """HTML del SPA y su ETag, resueltos una vez por build."""
+    global _INDEX_CACHE
+    signature = _index_signature()
+    if signature is None:
+        return None
+    cached = _INDEX_CACHE
+    if cached is not None and cached[0] == signature:
+        return cached[1], cached[2]
+    body = _load_index()
+    if body is None:
+        return None
+    etag = hashlib.sha256(body).hexdigest()[:32]
+    _INDEX_CACHE = (signature, body, etag)
+    return body, etag
+
+
 def ensure_frontend_build(force: bool = False) -> None:
     dist_index = FRONTEND_DIST / "index.html"
     if not force and dist_index.exists():
@@ -67,6 +123,49 @@ def ensure_frontend_build(force: bool = False) -> None:
         raise RuntimeError("npm no está disponible en el PATH del servidor.") from exc
     except subprocess.CalledProcessError as exc:
         raise RuntimeError("Falló la compilación del frontend React.") from exc
+    precompress_dist()
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def _write_variant(target: Path, original_size: int, data: bytes) -> bool:
+    if len(data) > original_size * (1 - _COMPRESS_MIN_SAVING):
+        target.unlink(missing_ok=True)
+        return False
+    tmp = target.with_name(target.name + ".tmp")
+    tmp.write_bytes(data)
+    tmp.replace(target)
+    return True
+
+
+def precompress_dist(dist: Path = FRONTEND_DIST) -> tuple[int, int, int]:
+    """Genera variantes .gz (y .br si esta instalado brotli) del build; devuelve (archivos, gzip, brotli)."""
+    brotli = _brotli()
+    files = gz_count = br_count = 0
+    for path in sorted(dist.rglob("*")):
+        if not path.is_file() or path.suffix.lower() not in _COMPRESSIBLE:
+            continue
+        raw = path.read_bytes()
+        gz_path = path.with_name(path.name + ".gz")
+        br_path = path.with_name(path.name + ".br")
+        if len(raw) < _COMPRESS_MIN_BYTES:
+            gz_path.unlink(missing_ok=True)
+            br_path.unlink(missing_ok=True)
+            continue
+        files += 1
+        # mtime=0 deja la salida reproducible entre builds identicos.
+        gz_count += _write_variant(gz_path, len(raw), gzip.compress(raw, compresslevel=9, mtime=0))
+        if brotli is not None:
+            br_count += _write_variant(br_path, len(raw), brotli.compress(raw, quality=11))
+        else:
+            br_path.unlink(missing_ok=True)
+    return files, gz_count, br_count
 
 
 def _require_build(file_name: str) -> None:
@@ -82,16 +181,39 @@ def serve_react_app():
         ensure_frontend_build(force=True)
         _AUTO_BUILT = True
 
-    dist_index = FRONTEND_DIST / "index.html"
-    if dist_index.exists():
+    resolved = _cached_index()
+    if resolved is None:
+        _require_build("index.html")
         return send_from_directory(FRONTEND_DIST, "index.html")
 
-    runtime_index = _render_runtime_index()
-    if runtime_index is not None:
-        return Response(runtime_index, mimetype="text/html")
+    body, etag = resolved
+    response = Response(body, mimetype="text/html")
+    response.set_etag(etag)
+    # El HTML apunta a los bundles del build actual: siempre se revalida (304 si no cambio).
+    response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
 
-    _require_build("index.html")
-    return send_from_directory(FRONTEND_DIST, "index.html")
 
-
-__all__ = ["FRONTEND_DIST", "FRONTEND_PUBLIC", "serve_react_app", "ensure_frontend_build"]
+def serve_frontend_asset(filename: str):
+    """Sirve dist/assets con cache inmutable para bundles con hash y variante .br/.gz si el cliente la acepta."""
+    assets_dir = FRONTEND_DIST / "assets"
+    path = safe_join(str(assets_dir), filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    target, encoding = path, None
+    for name, suffix in _PRECOMPRESSED:
+        if request.accept_encodings[name] and os.path.isfile(path + suffix):
+            target, encoding = path + suffix, name
+            break
+
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    response = send_file(target, mimetype=mimetype, conditional=True)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.headers["Cache-Control"] = _IMMUTABLE_CACHE if _HASHED_ASSET_RE.search(filename) else "no-cache"
+    return response
+
+
+__all__ = ["FRONTEND_DIST", "FRONTEND_PUBLIC", "serve_react_app", "serve_frontend_asset", "ensure_frontend_build", "precompress_dist"]
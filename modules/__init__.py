@@ -2,6 +2,8 @@ from modules.procesos import crm_bp, gm_mail_bp, ivr_bp, mail_bp, santander_cons
 from modules.cargas import bit_bp, gm_bp, porsche_bp, sant_hipotecario_bp, tanner_bp
 from modules.resultantes import resultantes_bp
 from modules.backoffice import backoffice_bp
+from modules.preflight import preflight_bp
+from modules.jobs import jobs_bp
 
 __all__ = [
     "sms_bp",
@@ -18,4 +20,6 @@ __all__ = [
     "sant_hipotecario_bp",
     "resultantes_bp",
     "backoffice_bp",
+    "preflight_bp",
+    "jobs_bp",
 ]
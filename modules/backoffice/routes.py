@@ -5,8 +5,10 @@ from datetime import datetime
 from flask import Blueprint, jsonify, request
 
 from frontend import serve_react_app
-from services import campo1_catalog, config_registry, mail_templates
+from services import campo1_catalog, config_registry, config_store, mail_templates, template_registry
 from services.constants import MANDANTE_CHOICES
+from utils.db_resultantes import resultantes_pool_stats
+from utils.db_sqlserver import stc_pool_stats
 
 
 backoffice_bp = Blueprint("backoffice", __name__)
@@ -28,7 +30,7 @@ def backoffice_catalogos_data():
             "segmentoinstitucion": item.segmentoinstitucion,
             "mandante": item.mandante,
         }
-        for item in mail_templates.MAIL_TEMPLATE_OPTIONS
+        for item in mail_templates.mail_template_options()
     ]
 
     config_files = config_registry.list_config_files()
@@ -43,10 +45,20 @@ def backoffice_catalogos_data():
             "mail_templates": templates,
             "config_files": config_files,
         },
+        "config_cache": config_store.cache_stats(),
+        "template_versions": template_registry.versions(),
     }
     return jsonify(payload)
 
 
+@backoffice_bp.get("/api/backoffice/db-pools")
+def backoffice_db_pools():
+    return jsonify({
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "pools": [stc_pool_stats(), resultantes_pool_stats()],
+    })
+
+
 @backoffice_bp.get("/api/backoffice/campo1")
 def backoffice_campo1_list():
     return jsonify({"items": campo1_catalog.list_items(active_only=False)})
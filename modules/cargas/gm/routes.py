@@ -1,11 +1,13 @@
 # routes/gm.py
-import pandas as pd
 from datetime import datetime
-from flask import Blueprint, request, send_file
+from flask import Blueprint, request
 
+from services import jobs
 from services.gm_service import procesar_gm
+from services.jobs import JobOutput
 from utils.excel_export import zip_named_dfs_bytes
-from utils import api_error_response
+from utils.excel_reader import read_input_table
+from utils import api_error_response, job_accepted_response, send_output, wants_background_job
 from frontend import serve_react_app
 
 gm_bp = Blueprint("gm", __name__)
@@ -20,40 +22,45 @@ def gm_page():
     if request.method == "GET":
         return serve_react_app()
 
-    try:
-        comparar = request.form.get("habilitar_comparacion") == "on"
-        masividades = request.form.get("habilitar_masividades") == "on"
-
-        archivo = request.files.get("archivo")
-        if not archivo or archivo.filename == "":
-            return _gm_error("Debes subir el archivo Collection (Nuevo).")
-
-        df_nuevo = pd.read_excel(archivo)
-
-        df_ant = None
-        if comparar:
-            archivo_anterior = request.files.get("archivo_anterior")
-            if not archivo_anterior or archivo_anterior.filename == "":
-                return _gm_error("Activaste comparación, pero no subiste archivo anterior.")
-            df_ant = pd.read_excel(archivo_anterior)
-
-        # Procesa y devuelve lista de (nombre_excel, df)
-        named_dfs = procesar_gm(
-            df_nuevo=df_nuevo,
-            df_antiguo=df_ant,
-            comparar=comparar,
-            masividades=masividades,
-        )
-
-        fecha = datetime.now().strftime("%d-%m")
-        zip_buf = zip_named_dfs_bytes(named_dfs)
-
-        return send_file(
-            zip_buf,
-            as_attachment=True,
-            download_name=f"Procesamiento_GM_{fecha}.zip",
-            mimetype="application/zip",
-        )
+    comparar = request.form.get("habilitar_comparacion") == "on"
+    masividades = request.form.get("habilitar_masividades") == "on"
+
+    archivo = request.files.get("archivo")
+    if not archivo or archivo.filename == "":
+        return _gm_error("Debes subir el archivo Collection (Nuevo).")
 
+    data_anterior = None
+    if comparar:
+        archivo_anterior = request.files.get("archivo_anterior")
+        if not archivo_anterior or archivo_anterior.filename == "":
+            return _gm_error("Activaste comparación, pero no subiste archivo anterior.")
+        data_anterior = archivo_anterior.read()
+
+    params = dict(data_anterior=data_anterior, comparar=comparar, masividades=masividades)
+    data = archivo.read()
+    if wants_background_job():
+        return job_accepted_response(jobs.submit("gm", generate_gm, data, **params))
+    try:
+        return send_output(generate_gm(data, **params))
     except Exception as e:
         return _gm_error(f"Error al procesar: {e}", status=500)
+
+
+def generate_gm(data: bytes, *, data_anterior: bytes | None, comparar: bool, masividades: bool) -> JobOutput:
+    jobs.report_progress(message="Leyendo archivos")
+    df_nuevo = read_input_table(data)
+    df_ant = read_input_table(data_anterior) if data_anterior is not None else None
+
+    # Procesa y devuelve lista de (nombre_excel, df)
+    jobs.report_progress(total=len(df_nuevo), message="Procesando Collection")
+    named_dfs = procesar_gm(
+        df_nuevo=df_nuevo,
+        df_antiguo=df_ant,
+        comparar=comparar,
+        masividades=masividades,
+    )
+
+    jobs.report_progress(done=len(df_nuevo), message="Generando archivos")
+    fecha = datetime.now().strftime("%d-%m")
+    zip_buf = zip_named_dfs_bytes(named_dfs)
+    return JobOutput(zip_buf, f"Procesamiento_GM_{fecha}.zip", "application/zip", rows=len(df_nuevo))
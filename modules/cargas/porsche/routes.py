@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-import pandas as pd
 from flask import Blueprint, request, send_file
 
 from frontend import serve_react_app
 from services.porsche_asignacion_service import build_porsche_asignacion, porsche_asignacion_filename
 from utils import api_error_response
 from utils.excel_export import df_to_xlsx_bytesio
+from utils.excel_reader import read_input_table
 
 
 porsche_bp = Blueprint("porsche_asignacion", __name__)
@@ -26,7 +26,7 @@ def porsche_page():
         return _porsche_error("Debes subir el archivo de Asignacion Porsche.")
 
     try:
-        df_raw = pd.read_excel(archivo, dtype=str, header=None)
+        df_raw = read_input_table(archivo, dtype=str, header=None)
         df_out = build_porsche_asignacion(df_raw)
         nombre = porsche_asignacion_filename()
         buf = df_to_xlsx_bytesio(df_out, sheet_name="AsignacionPorsche")
@@ -1,16 +1,15 @@
-import uuid
-
 from flask import Blueprint, request, send_file, jsonify
 
 from services.sant_hipotecario_service import leer_csv_sant_hipotecario, generar_crm
 from services.sant_hipotecario_masividad_service import generar_masividad
 from frontend import serve_react_app
 from utils import api_error_response
-from utils.paths import storage_path
+from services import artifact_registry
 
 sant_hipotecario_bp = Blueprint("sant_hipotecario", __name__)
 
-GENERADOS = {}  # token -> data
+_NAMESPACE = "sant_hipotecario"
+_XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
 
 def _sant_error(message: str, status: int = 400):
@@ -29,64 +28,61 @@ def sant_hipotecario_page():
         if not archivo:
             return _sant_error("Debes subir un archivo CSV.")
 
+        artifact = None
         try:
             df = leer_csv_sant_hipotecario(archivo)
 
-            output_dir = storage_path("outputs", "sant_hipotecario")
+            # Cada proceso escribe en su propia carpeta: dos cargas del mismo dia no se pisan.
+            artifact = artifact_registry.reserve(_NAMESPACE)
+            output_dir = str(artifact.directory)
 
             crm_res = generar_crm(df, output_dir)
-            data = {
-                "crm_path": crm_res["crm_path"],
-                "crm_name": crm_res["crm_name"],
-                "masiv_path": None,
-                "masiv_name": None
-            }
+            files = {"crm": (crm_res["crm_path"], crm_res["crm_name"], _XLSX_MIMETYPE)}
+            masiv_name = None
 
             if masividades:
                 mas_res = generar_masividad(df, output_dir)
-                data["masiv_path"] = mas_res["masiv_path"]
-                data["masiv_name"] = mas_res["masiv_name"]
+                masiv_name = mas_res["masiv_name"]
+                files["masividad"] = (mas_res["masiv_path"], masiv_name, _XLSX_MIMETYPE)
 
-            token = str(uuid.uuid4())
-            GENERADOS[token] = data
+            artifact_registry.publish(artifact, files)
 
             return jsonify({
                 "message": "Archivo procesado correctamente.",
-                "token": token,
-                "crm_name": data["crm_name"],
-                "masiv_name": data["masiv_name"],
+                "token": artifact.token,
+                "crm_name": crm_res["crm_name"],
+                "masiv_name": masiv_name,
                 "masividades_activadas": masividades,
             })
 
         except Exception as e:
+            if artifact is not None:
+                artifact_registry.discard(artifact)
             return _sant_error(f"Error procesando archivo: {e}", status=500)
 
     return serve_react_app()
 
 
-@sant_hipotecario_bp.route("/sant-hipotecario/descargar/crm/<token>")
-def descargar_crm(token):
-    data = GENERADOS.get(token)
-    if not data or not data.get("crm_path"):
-        return _sant_error("No se encontró el CRM para descargar.", status=404)
-
+def _send_artifact(item: artifact_registry.ArtifactFile):
     return send_file(
-        data["crm_path"],
+        item.path,
         as_attachment=True,
-        download_name=data["crm_name"],
-        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        download_name=item.download_name,
+        mimetype=item.mimetype,
     )
 
 
+@sant_hipotecario_bp.route("/sant-hipotecario/descargar/crm/<token>")
+def descargar_crm(token):
+    item = artifact_registry.resolve(token, "crm", namespace=_NAMESPACE)
+    if item is None:
+        return _sant_error("No se encontró el CRM para descargar (puede haber vencido, vuelve a procesar).", status=404)
+    return _send_artifact(item)
+
+
 @sant_hipotecario_bp.route("/sant-hipotecario/descargar/masividad/<token>")
 def descargar_masividad(token):
-    data = GENERADOS.get(token)
-    if not data or not data.get("masiv_path"):
+    item = artifact_registry.resolve(token, "masividad", namespace=_NAMESPACE)
+    if item is None:
         return _sant_error("No se encontró masividad para descargar (activa el switch y procesa).", status=404)
-
-    return send_file(
-        data["masiv_path"],
-        as_attachment=True,
-        download_name=data["masiv_name"],
-        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-    )
+    return _send_artifact(item)
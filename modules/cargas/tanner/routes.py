@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-import pandas as pd
 from flask import Blueprint, request, send_file
 
 from frontend import serve_react_app
 from services.tanner_asignacion_service import build_tanner_asignacion, tanner_asignacion_filename
 from utils import api_error_response
 from utils.excel_export import df_to_xlsx_bytesio
+from utils.excel_reader import read_input_table
 
 
 tanner_bp = Blueprint("tanner_asignacion", __name__)
@@ -26,7 +26,7 @@ def tanner_page():
         return _tanner_error("Debes subir el archivo de Asignacion Tanner.")
 
     try:
-        df_raw = pd.read_excel(archivo, dtype=str)
+        df_raw = read_input_table(archivo, dtype=str)
         df_out = build_tanner_asignacion(df_raw)
         nombre = tanner_asignacion_filename()
         buf = df_to_xlsx_bytesio(df_out, sheet_name="AsignacionTanner")
@@ -0,0 +1,3 @@
+from modules.jobs.routes import jobs_bp
+
+__all__ = ["jobs_bp"]
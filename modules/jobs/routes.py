@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from flask import Blueprint, jsonify, send_file, url_for
+
+from services import jobs
+
+
+jobs_bp = Blueprint("jobs", __name__)
+
+
+@jobs_bp.get("/api/jobs/<job_id>")
+def job_status(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"message": "Trabajo no encontrado."}), 404
+    payload = job.to_dict()
+    payload["download_url"] = url_for("jobs.job_download", job_id=job.id) if job.status == jobs.DONE else None
+    return jsonify(payload)
+
+
+@jobs_bp.get("/api/jobs/<job_id>/download")
+def job_download(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"message": "Trabajo no encontrado."}), 404
+    if job.status in {jobs.QUEUED, jobs.RUNNING}:
+        return jsonify({"message": "El trabajo aun no termina."}), 409
+    if job.status == jobs.ERROR:
+        return jsonify({"message": job.error or "El trabajo termino con error."}), 400
+    item = jobs.resolve_download(job)
+    if item is None:
+        return jsonify({"message": "El archivo ya no esta disponible. Vuelve a generarlo."}), 410
+    return send_file(item.path, as_attachment=True, download_name=item.download_name, mimetype=item.mimetype)
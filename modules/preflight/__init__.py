@@ -0,0 +1,3 @@
+from modules.preflight.routes import preflight_bp
+
+__all__ = ["preflight_bp"]
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from flask import Blueprint, jsonify, request
+
+from services.preflight import inspect_upload
+
+
+preflight_bp = Blueprint("preflight", __name__)
+
+
+@preflight_bp.post("/api/preflight")
+def preflight_upload():
+    file = request.files.get("file") or request.files.get("archivo")
+    if not file or file.filename == "":
+        return jsonify({"message": "Debes adjuntar un archivo para validar."}), 400
+
+    proceso = (request.form.get("proceso") or "").strip().lower()
+    try:
+        return jsonify(inspect_upload(file.stream, file.filename, proceso))
+    except ValueError as exc:
+        return jsonify({"message": str(exc)}), 400
+    except Exception as exc:
+        return jsonify({"message": f"No se pudo leer el archivo: {exc}"}), 400
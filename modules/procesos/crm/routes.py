@@ -2,43 +2,42 @@ from __future__ import annotations
 
 import io
 import re
-import uuid
-from datetime import datetime, timedelta
+from datetime import datetime
+from typing import IO
 
+import numpy as np
 import pandas as pd
 from flask import Blueprint, request, send_file
 
 from frontend import serve_react_app
+from services import crm_schedule, crm_sessions
+from services.column_resolver import find_column
 from services.mail_service import build_mail_crm_output
-from services.sms_service import build_crm_output as build_sms_crm_output
+from services.sms_service import build_crm_output as build_sms_crm_output, iter_crm_outputs_by_group
 from utils import api_error_response
 from utils.excel_export import df_to_xlsx_bytesio, zip_named_dfs_bytes
+from utils.excel_reader import excel_engine
+from utils.upload_cache import cached_frame
 
 
 crm_bp = Blueprint("crm", __name__)
 
-CRM_SESSIONS: dict[str, dict[str, object]] = {}
-CRM_SESSION_TTL_MINUTES = 90
+USER_COLUMN_ALIASES = {
+    "usuario",
+    "usuario_crm",
+    "agente",
+    "ejecutivo",
+    "usuario_gestion",
+    "usuario crm",
+    "usuario gestion",
+    "user",
+}
 
 
 def _crm_error(message: str, status: int = 400):
     return api_error_response(message, "crm.crm_page", status=status)
 
 
-def _cleanup_sessions() -> None:
-    now = datetime.now()
-    expired: list[str] = []
-    for token, payload in CRM_SESSIONS.items():
-        created = payload.get("created_at")
-        if not isinstance(created, datetime):
-            expired.append(token)
-            continue
-        if now - created > timedelta(minutes=CRM_SESSION_TTL_MINUTES):
-            expired.append(token)
-    for token in expired:
-        CRM_SESSIONS.pop(token, None)
-
-
 def _slugify(value: str) -> str:
     value = (value or "").strip()
     normalized = re.sub(r"[^A-Za-z0-9-_]+", "_", value)
@@ -53,45 +52,20 @@ def _filename_token(value: str) -> str:
     return normalized or "MANDANTE"
 
 
-def _normalize_key(value: str) -> str:
-    return (
-        (value or "")
-        .strip()
-        .lower()
-        .replace(" ", "")
-        .replace("_", "")
-        .replace("-", "")
-    )
-
-
-def _find_user_column(df: pd.DataFrame) -> str | None:
-    aliases = {
-        "usuario",
-        "usuario_crm",
-        "agente",
-        "ejecutivo",
-        "usuario_gestion",
-        "usuario crm",
-        "usuario gestion",
-        "user",
-    }
-    normalized = {_normalize_key(col): col for col in df.columns}
-    for alias in aliases:
-        key = _normalize_key(alias)
-        if key in normalized:
-            return normalized[key]
-    return None
-
-
 def _read_any_dataframe(file_bytes: bytes, filename: str | None = None) -> pd.DataFrame:
     name = (filename or "").lower()
+    variant = "crm:csv" if name.endswith(".csv") else f"crm:excel:{excel_engine()}"
+    return cached_frame(file_bytes, variant, lambda raw: _parse_any_dataframe(raw, name))
+
+
+def _parse_any_dataframe(file_bytes: bytes, name: str) -> pd.DataFrame:
     if name.endswith(".csv"):
         try:
             return pd.read_csv(io.BytesIO(file_bytes), sep=";", dtype=str, keep_default_na=False, na_filter=False)
         except Exception:
             return pd.read_csv(io.BytesIO(file_bytes), dtype=str, keep_default_na=False, na_filter=False)
     try:
-        return pd.read_excel(io.BytesIO(file_bytes), dtype=str)
+        return pd.read_excel(io.BytesIO(file_bytes), dtype=str, engine=excel_engine())
     except Exception:
         return pd.read_csv(io.BytesIO(file_bytes), sep=";", dtype=str, keep_default_na=False, na_filter=False)
 
@@ -103,7 +77,6 @@ def crm_page():
 
 @crm_bp.post("/crm/session")
 def crm_session_create():
-    _cleanup_sessions()
     file = request.files.get("file")
     mode = (request.form.get("mode") or "").strip().lower()
     source = (request.form.get("source") or "").strip()
@@ -116,22 +89,19 @@ def crm_session_create():
     if not file_bytes:
         return _crm_error("El archivo enviado está vacío.")
 
-    token = uuid.uuid4().hex
-    CRM_SESSIONS[token] = {
-        "mode": mode,
-        "source": source,
-        "filename": file.filename,
-        "file_bytes": file_bytes,
-        "created_at": datetime.now(),
-    }
+    try:
+        df = _read_any_dataframe(file_bytes, file.filename)
+    except Exception as exc:
+        return _crm_error(f"No se pudo leer el archivo para la sesión CRM: {exc}")
+    session = crm_sessions.create_session(df, mode=mode, source=source, filename=file.filename)
 
     return {
         "ok": True,
-        "token": token,
+        "token": session.token,
         "mode": mode,
         "source": source,
         "filename": file.filename,
-        "expires_in_minutes": CRM_SESSION_TTL_MINUTES,
+        "expires_in_minutes": crm_sessions.CRM_SESSION_TTL_MINUTES,
     }
 
 
@@ -145,44 +115,43 @@ def _build_sms_ivr_multi_zip(
     intervalo: int | None,
     fecha_label: str,
     mandante_token: str,
-) -> tuple[io.BytesIO, str]:
-    user_col = _find_user_column(df)
+) -> tuple[IO[bytes], str]:
+    user_col = find_column(df, USER_COLUMN_ALIASES)
     if not user_col:
         raise ValueError("No se encontró una columna de usuario en el archivo (USUARIO_CRM/USUARIO/AGENTE).")
-
-    base = df.copy()
-    usuarios = base[user_col].fillna("").astype(str).str.strip()
-    base["__usuario_display"] = usuarios
-    base["__usuario_key"] = usuarios.str.lower()
-    valid = base[base["__usuario_key"].str.len() > 0].copy()
-    if valid.empty:
+    # Valida el rango horario antes de generar cualquier salida por usuario.
+    crm_schedule.window_seconds(hora_inicio, hora_fin)
+
+    usuarios = df[user_col].fillna("").astype(str).str.strip()
+    keys = usuarios.str.lower()
+    # Codigos 0..n-1 en orden alfabetico de usuario; las filas sin usuario quedan en -1.
+    codes, user_keys = pd.factorize(keys.where(keys.str.len() > 0), sort=True)
+    if len(user_keys) == 0:
         raise ValueError("La columna de usuarios está vacía. Verifica el archivo de origen.")
+    _, first_rows = np.unique(codes, return_index=True)
+    displays = usuarios.to_numpy()[first_rows[-len(user_keys):]].tolist()
 
-    named_outputs: list[tuple[str, pd.DataFrame]] = []
-    user_keys = pd.unique(valid["__usuario_key"]).tolist()
-    for key in sorted(str(item) for item in user_keys):
-        group = valid.loc[valid["__usuario_key"] == key].copy()
-        display = group["__usuario_display"].iloc[0]
-        subset = group.drop(columns=["__usuario_display", "__usuario_key"])
-        salida = build_sms_crm_output(
-            subset,
-            usuario=display,
+    def named_outputs():
+        # Cada salida se escribe en el ZIP a medida que se recorre.
+        outputs = iter_crm_outputs_by_group(
+            df,
+            codes,
+            displays,
             fecha=fecha,
             hora_inicio=hora_inicio,
             hora_fin=hora_fin,
             observacion=observacion,
             intervalo_segundos=intervalo,
         )
-        filename = f"cargaCRM_{mandante_token}_{_slugify(display)}_{fecha_label}.xlsx"
-        named_outputs.append((filename, salida))
+        for code, salida in outputs:
+            filename = f"cargaCRM_{mandante_token}_{_slugify(displays[code])}_{fecha_label}.xlsx"
+            yield filename, salida
 
-    return zip_named_dfs_bytes(named_outputs), f"cargaCRM_{mandante_token}_{fecha_label}_por_usuario.zip"
+    return zip_named_dfs_bytes(named_outputs()), f"cargaCRM_{mandante_token}_{fecha_label}_por_usuario.zip"
 
 
 @crm_bp.post("/crm/carga")
 def crm_carga():
-    _cleanup_sessions()
-
     mode = (request.form.get("mode") or "").strip().lower()
     token = (request.form.get("token") or "").strip()
     file = request.files.get("file")
@@ -222,27 +191,19 @@ def crm_carga():
     except ValueError:
         return _crm_error("Formato de fecha inválido (usa AAAA-MM-DD).")
 
-    payload = CRM_SESSIONS.get(token) if token else None
-    if token and not payload:
+    loaded = crm_sessions.load_session(token) if token else None
+    if token and not loaded:
         return _crm_error("La sesión CRM expiró o no existe. Vuelve a generar desde el proceso.", status=404)
 
-    if payload:
-        source_mode = str(payload.get("mode") or "")
-        if source_mode and source_mode != mode:
+    if loaded:
+        session, df = loaded
+        if session.mode and session.mode != mode:
             return _crm_error("El modo seleccionado no coincide con la sesión precargada.")
-        file_bytes = payload.get("file_bytes")
-        filename = str(payload.get("filename") or "")
-        if not isinstance(file_bytes, (bytes, bytearray)):
-            return _crm_error("La sesión CRM no contiene un archivo válido.", status=500)
-        df = _read_any_dataframe(bytes(file_bytes), filename)
     else:
         if not file or file.filename == "":
             return _crm_error("Debes subir archivo manual o usar sesión precargada.")
-        try:
-            df = pd.read_excel(file, dtype=str)
-        except Exception:
-            file.stream.seek(0)
-            df = pd.read_csv(file.stream, sep=";", dtype=str, keep_default_na=False, na_filter=False)
+        # Sin nombre se intenta Excel primero y luego CSV ';', como antes.
+        df = _read_any_dataframe(file.read())
 
     try:
         fecha_salida = fecha.strftime("%d-%m")
@@ -1,9 +1,8 @@
 from __future__ import annotations
 
-import io
-import zipfile
 from datetime import date, datetime
 import re
+from typing import IO
 
 from flask import Blueprint, request, send_file
 
@@ -11,7 +10,7 @@ from frontend import serve_react_app
 from services.gm_mail_service import build_gm_mail_crm_output, build_gm_mail_from_excel
 from services.gm_mail_templates import get_gm_mail_template, list_gm_mail_templates
 from utils import api_error_response
-from utils.excel_export import df_to_xlsx_bytes, df_to_xlsx_bytesio
+from utils.excel_export import ZipBundle, df_to_xlsx_bytesio
 
 
 gm_mail_bp = Blueprint("gm_mail", __name__)
@@ -33,15 +32,12 @@ def _zip_gm_mail_outputs(
     template_df,
     crm_filename_base: str,
     crm_df,
-) -> io.BytesIO:
-    zip_bio = io.BytesIO()
-    with zipfile.ZipFile(zip_bio, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        zf.writestr(template_filename, df_to_xlsx_bytes(template_df, sheet_name=template_sheet))
-        zf.writestr(f"{crm_filename_base}.xlsx", df_to_xlsx_bytes(crm_df, sheet_name="CRM"))
-        csv_payload = crm_df.to_csv(index=False, sep=";", encoding="utf-8-sig")
-        zf.writestr(f"{crm_filename_base}.csv", csv_payload)
-    zip_bio.seek(0)
-    return zip_bio
+) -> IO[bytes]:
+    with ZipBundle() as bundle:
+        bundle.add_xlsx(template_filename, template_df, sheet_name=template_sheet)
+        bundle.add_xlsx(f"{crm_filename_base}.xlsx", crm_df, sheet_name="CRM")
+        bundle.add_csv(f"{crm_filename_base}.csv", crm_df, encoding="utf-8", index=False, sep=";")
+        return bundle.finish()
 
 
 @gm_mail_bp.get("/gm-mail")
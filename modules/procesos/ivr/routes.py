@@ -1,15 +1,13 @@
 
-import io
-import zipfile
-import pandas as pd
 from datetime import date, datetime
 from flask import Blueprint, jsonify, request, send_file
 import re
 import unicodedata
 
-from services.ivr_service import build_crm_output as build_ivr_crm_output, build_ivr_output, get_campo1_choices, sample_ivr_df
-from services.mandante_rules import apply_mandante_rules
-from utils.excel_export import df_to_xlsx_bytes, df_to_xlsx_bytesio
+from services.ivr_service import INPUT_COLUMNS as IVR_INPUT_COLUMNS, build_crm_output as build_ivr_crm_output, build_ivr_output, get_campo1_choices, sample_ivr_df
+from services.mandante_rules import RULE_COLUMNS, apply_mandante_rules
+from utils.excel_export import ZipBundle, df_to_xlsx_bytesio
+from utils.excel_reader import read_input_table
 from utils import api_error_response
 from frontend import serve_react_app
 
@@ -44,14 +42,6 @@ def _crm_rule_for_ivr(mandante: str) -> tuple[str, str] | None:
     return IVR_CRM_RULES.get((mandante or "").strip().lower())
 
 
-def _zip_ivr_outputs(files: list[tuple[str, bytes]]) -> io.BytesIO:
-    zip_bio = io.BytesIO()
-    with zipfile.ZipFile(zip_bio, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for filename, payload in files:
-            zf.writestr(filename, payload)
-    zip_bio.seek(0)
-    return zip_bio
-
 @ivr_bp.get("/ivr")
 def ivr_page():
     return serve_react_app()
@@ -110,7 +100,7 @@ def ivr_process():
         crm_fecha = None
 
     try:
-        df = pd.read_excel(file, dtype=str)
+        df = read_input_table(file, IVR_INPUT_COLUMNS | RULE_COLUMNS, dtype=str)
         df = apply_mandante_rules(df, mandante_nombre)
         out = build_ivr_output(df, campo1_value=campo1)
         fecha = datetime.now().strftime("%d-%m")
@@ -129,13 +119,13 @@ def ivr_process():
                 observacion_value=observacion,
             )
             crm_base = f"carga_CRM_IVR_{mandante_token}_{fecha}"
-            files = [
-                (name, df_to_xlsx_bytes(out, sheet_name="Hoja1")),
-                (f"{crm_base}.xlsx", df_to_xlsx_bytes(crm_df, sheet_name="cargaCRM")),
-                (f"{crm_base}.csv", crm_df.to_csv(index=False, sep=";", encoding="utf-8-sig").encode("utf-8-sig")),
-            ]
+            with ZipBundle() as bundle:
+                bundle.add_xlsx(name, out, sheet_name="Hoja1")
+                bundle.add_xlsx(f"{crm_base}.xlsx", crm_df, sheet_name="cargaCRM")
+                bundle.add_csv(f"{crm_base}.csv", crm_df, index=False, sep=";")
+                zip_file = bundle.finish()
             return send_file(
-                _zip_ivr_outputs(files),
+                zip_file,
                 as_attachment=True,
                 download_name=f"IVR_{mandante_token}_{fecha}.zip",
                 mimetype="application/zip",
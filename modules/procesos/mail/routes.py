@@ -1,16 +1,17 @@
-import io
-import zipfile
 import pandas as pd
 from datetime import date, datetime
 from flask import Blueprint, request, send_file
 import re
 import unicodedata
 
-from services.mail_templates import MAIL_TEMPLATE_OPTIONS, build_mail_template, sample_mail_template
+from services.mail_templates import build_mail_template, get_template, mail_template_options, sample_mail_template
 from services.mail_service import build_mail_crm_output
 from services.mandante_rules import apply_mandante_rules
-from utils.excel_export import df_to_xlsx_bytes, df_to_xlsx_bytesio
-from utils import api_error_response
+from services import jobs
+from services.jobs import JobOutput
+from utils.excel_export import ZipBundle, df_to_xlsx_bytesio
+from utils.excel_reader import read_input_table
+from utils import api_error_response, job_accepted_response, send_output, wants_background_job
 from frontend import serve_react_app
 
 mail_bp = Blueprint('mail', __name__)
@@ -37,7 +38,7 @@ def _filename_safe(value: str) -> str:
 
 
 def _template_output_name(template_code: str, mandante_nombre: str) -> str:
-    template = next((item for item in MAIL_TEMPLATE_OPTIONS if item.code == template_code), None)
+    template = get_template(template_code)
     template_id = str(template.message_id) if template else '00000'
     template_name = _filename_safe(template.label if template else template_code)
     mandante_name = _filename_safe(mandante_nombre)
@@ -49,15 +50,6 @@ def _crm_rule_for_mail(mandante: str) -> tuple[str, str] | None:
     return MAIL_CRM_RULES.get((mandante or '').strip().lower())
 
 
-def _zip_mail_outputs(files: list[tuple[str, bytes]]) -> io.BytesIO:
-    zip_bio = io.BytesIO()
-    with zipfile.ZipFile(zip_bio, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
-        for filename, payload in files:
-            zf.writestr(filename, payload)
-    zip_bio.seek(0)
-    return zip_bio
-
-
 def _filter_mail_crm_seed_rows(df: pd.DataFrame) -> pd.DataFrame:
     rut_col = next((col for col in df.columns if str(col).strip().lower() in {'rut', 'rut ', 'rut+dv', 'rutdv'}), None)
     if not rut_col:
@@ -112,52 +104,75 @@ def mail_template_process():
         crm_rule = None
         crm_fecha = None
 
+    params = dict(
+        mandante_nombre=mandante_nombre,
+        template_code=template_code,
+        template_fecha=template_fecha,
+        crm_rule=crm_rule,
+        crm_fecha=crm_fecha,
+        crm_hora_inicio=crm_hora_inicio,
+        crm_hora_fin=crm_hora_fin,
+    )
+    data = file.read()
+    if wants_background_job():
+        return job_accepted_response(jobs.submit('mail', generate_mail_template, data, **params))
     try:
-        df = pd.read_excel(file, dtype=str)
-        df = apply_mandante_rules(df, mandante_nombre)
-        salida = build_mail_template(df, template_code, mandante_nombre, template_date=template_fecha)
-        nombre = _template_output_name(template_code, mandante_nombre)
-
-        if include_crm and crm_rule and crm_fecha:
-            usuario, observacion = crm_rule
-            crm_source = _filter_mail_crm_seed_rows(salida)
-            crm_df = build_mail_crm_output(
-                crm_source,
-                fecha=crm_fecha,
-                hora_inicio=crm_hora_inicio,
-                hora_fin=crm_hora_fin,
-                usuario_value=usuario,
-                observacion_value=observacion,
-                require_operacion=False,
-            )
-            fecha_salida = datetime.now().strftime('%d-%m-%Y')
-            mandante_token = _filename_safe(mandante_nombre)
-            template_token = _filename_safe(template_code)
-            crm_base = f'cargaCRM_MAIL_{mandante_token}_{template_token}_{fecha_salida}'
-            files = [
-                (nombre, df_to_xlsx_bytes(salida, sheet_name='PlantillaMail')),
-                (f'{crm_base}.xlsx', df_to_xlsx_bytes(crm_df, sheet_name='cargaMailCRM')),
-                (f'{crm_base}.csv', crm_df.to_csv(index=False, sep=';', encoding='utf-8-sig').encode('utf-8-sig')),
-            ]
-            zip_name = f'MAIL_{mandante_token}_{template_token}_{fecha_salida}.zip'
-            return send_file(_zip_mail_outputs(files), as_attachment=True, download_name=zip_name, mimetype='application/zip')
-
-        buf = df_to_xlsx_bytesio(salida, sheet_name='PlantillaMail')
-
-        return send_file(
-            buf,
-            as_attachment=True,
-            download_name=nombre,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        )
+        return send_output(generate_mail_template(data, **params))
     except ValueError as e:
         return _mail_error(str(e))
     except Exception as e:
         return _mail_error(f'Ocurrió un error procesando el archivo: {e}', status=500)
 
+
+def generate_mail_template(
+    data: bytes,
+    *,
+    mandante_nombre: str,
+    template_code: str,
+    template_fecha: date | None,
+    crm_rule: tuple[str, str] | None,
+    crm_fecha: date | None,
+    crm_hora_inicio: str,
+    crm_hora_fin: str,
+) -> JobOutput:
+    jobs.report_progress(message='Leyendo archivo')
+    df = read_input_table(data, dtype=str)
+    df = apply_mandante_rules(df, mandante_nombre)
+    jobs.report_progress(total=len(df), message='Armando plantilla')
+    salida = build_mail_template(df, template_code, mandante_nombre, template_date=template_fecha)
+    nombre = _template_output_name(template_code, mandante_nombre)
+    jobs.report_progress(done=len(df), message='Generando archivos')
+
+    if crm_rule and crm_fecha:
+        usuario, observacion = crm_rule
+        crm_source = _filter_mail_crm_seed_rows(salida)
+        crm_df = build_mail_crm_output(
+            crm_source,
+            fecha=crm_fecha,
+            hora_inicio=crm_hora_inicio,
+            hora_fin=crm_hora_fin,
+            usuario_value=usuario,
+            observacion_value=observacion,
+            require_operacion=False,
+        )
+        fecha_salida = datetime.now().strftime('%d-%m-%Y')
+        mandante_token = _filename_safe(mandante_nombre)
+        template_token = _filename_safe(template_code)
+        crm_base = f'cargaCRM_MAIL_{mandante_token}_{template_token}_{fecha_salida}'
+        with ZipBundle() as bundle:
+            bundle.add_xlsx(nombre, salida, sheet_name='PlantillaMail')
+            bundle.add_xlsx(f'{crm_base}.xlsx', crm_df, sheet_name='cargaMailCRM')
+            bundle.add_csv(f'{crm_base}.csv', crm_df, index=False, sep=';')
+            zip_file = bundle.finish()
+        zip_name = f'MAIL_{mandante_token}_{template_token}_{fecha_salida}.zip'
+        return JobOutput(zip_file, zip_name, 'application/zip', rows=len(salida))
+
+    buf = df_to_xlsx_bytesio(salida, sheet_name='PlantillaMail')
+    return JobOutput(buf, nombre, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', rows=len(salida))
+
 @mail_bp.get('/mail/sample/template')
 def mail_template_sample():
-    template_code = (request.args.get('template_code') or '').strip() or MAIL_TEMPLATE_OPTIONS[0].code
+    template_code = (request.args.get('template_code') or '').strip() or mail_template_options()[0].code
     try:
         salida = sample_mail_template(template_code)
     except ValueError as exc:
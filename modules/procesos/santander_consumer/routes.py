@@ -3,12 +3,14 @@ from __future__ import annotations
 from datetime import date, datetime
 import re
 
-from flask import Blueprint, request, send_file
+from flask import Blueprint, request
 
 from frontend import serve_react_app
+from services import jobs
+from services.jobs import JobOutput
 from services.santander_consumer_service import build_santander_consumer_terreno_from_excel
 from services.santander_consumer_templates import get_santander_consumer_template
-from utils import api_error_response
+from utils import api_error_response, job_accepted_response, send_output, wants_background_job
 from utils.excel_export import df_to_xlsx_bytesio
 
 
@@ -55,23 +57,27 @@ def santander_consumer_terreno_process():
         except ValueError:
             return _sc_error("La fecha de plazo máximo válido no es válida.")
 
+    params = dict(template_key=template_key, asignacion_mode=asignacion_mode, offer_deadline=offer_deadline)
+    data = file.read()
+    if wants_background_job():
+        return job_accepted_response(jobs.submit("santander_consumer", generate_terreno, data, **params))
     try:
-        salida = build_santander_consumer_terreno_from_excel(
-            file,
-            template_key=template_key,
-            asignacion_mode=asignacion_mode,
-            offer_deadline=offer_deadline,
-        )
-        fecha = datetime.now().strftime("%d-%m")
-        nombre = f"sc_terreno_{_filename_token(template_key)}_{fecha}.xlsx"
-        buf = df_to_xlsx_bytesio(salida, sheet_name="SantanderConsumer")
-        return send_file(
-            buf,
-            as_attachment=True,
-            download_name=nombre,
-            mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
+        return send_output(generate_terreno(data, **params))
     except ValueError as exc:
         return _sc_error(str(exc))
     except Exception as exc:
         return _sc_error(f"Ocurrió un error procesando el archivo: {exc}", status=500)
+
+
+def generate_terreno(data: bytes, *, template_key: str, asignacion_mode: str, offer_deadline: date | None) -> JobOutput:
+    salida = build_santander_consumer_terreno_from_excel(
+        data,
+        template_key=template_key,
+        asignacion_mode=asignacion_mode,
+        offer_deadline=offer_deadline,
+    )
+    jobs.report_progress(message="Generando archivo")
+    fecha = datetime.now().strftime("%d-%m")
+    nombre = f"sc_terreno_{_filename_token(template_key)}_{fecha}.xlsx"
+    buf = df_to_xlsx_bytesio(salida, sheet_name="SantanderConsumer")
+    return JobOutput(buf, nombre, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", rows=len(salida))
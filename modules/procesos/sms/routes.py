@@ -1,7 +1,4 @@
 # routes/sms.py
-import io
-import pandas as pd
-import zipfile
 from datetime import date, datetime
 from flask import Blueprint, request, send_file, abort
 
@@ -9,14 +6,18 @@ from services.sms_service import (
     build_athenas_output,
     build_axia_output,
     build_crm_output as build_sms_crm_output,
+    input_columns as sms_input_columns,
     sample_athenas_df,
     sample_axia_df,
 )
-from services.constants import COLUMN_MAP
-from services.mandante_rules import apply_mandante_rules
+from services.column_resolver import COLUMN_MAP_TABLE
+from services.mandante_rules import RULE_COLUMNS, apply_mandante_rules
 from services.sms_itau_vencida import build_itau_carterizado_messages, filename_token, prepend_itau_seed_rows
-from utils.excel_export import df_to_xlsx_bytes, df_to_xlsx_bytesio
-from utils import api_error_response
+from services import jobs
+from services.jobs import JobOutput
+from utils.excel_export import ZipBundle, df_to_xlsx_bytesio
+from utils.excel_reader import read_input_table
+from utils import api_error_response, job_accepted_response, send_output, wants_background_job
 from frontend import serve_react_app
 
 sms_bp = Blueprint("sms", __name__)
@@ -40,43 +41,10 @@ def _sms_error(message: str, status: int = 400):
     return api_error_response(message, "sms.sms_page", status=status)
 
 
-def _normalize_key(value: str) -> str:
-    return (
-        (value or "")
-        .strip()
-        .lower()
-        .replace(" ", "")
-        .replace("_", "")
-        .replace("-", "")
-    )
-
-
-def _find_column(df: pd.DataFrame, logical: str) -> str | None:
-    logical = (logical or "").lower()
-    normalized = {_normalize_key(col): col for col in df.columns}
-    candidates = {logical}
-    if logical in COLUMN_MAP:
-        candidates |= {_normalize_key(name) for name in COLUMN_MAP[logical]}
-    for candidate in candidates:
-        key = _normalize_key(candidate)
-        if key in normalized:
-            return normalized[key]
-    return None
-
-
 def _crm_rule_for_sms(mandante: str) -> tuple[str, str] | None:
     return SMS_CRM_RULES.get((mandante or "").strip().lower())
 
 
-def _zip_sms_outputs(files: list[tuple[str, bytes]]) -> io.BytesIO:
-    zip_bio = io.BytesIO()
-    with zipfile.ZipFile(zip_bio, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for filename, payload in files:
-            zf.writestr(filename, payload)
-    zip_bio.seek(0)
-    return zip_bio
-
-
 @sms_bp.get("/")
 def main():
     return serve_react_app()
@@ -158,87 +126,114 @@ def sms_athenas_process():
         crm_rule = None
         crm_fecha = None
 
+    params = dict(
+        mensaje=mensaje,
+        tipo_salida=tipo_salida,
+        mandante_nombre=mandante_nombre,
+        mensajes_personalizados=mensajes_personalizados,
+        modo_carterizado_itau=modo_carterizado_itau,
+        crm_rule=crm_rule,
+        crm_fecha=crm_fecha,
+        crm_hora_inicio=crm_hora_inicio,
+        crm_hora_fin=crm_hora_fin,
+    )
+    data = file.read()
+    if wants_background_job():
+        return job_accepted_response(jobs.submit("sms", generate_sms, data, **params))
     try:
-        df = pd.read_excel(file, dtype=str)
-        df = apply_mandante_rules(df, mandante_nombre)
-        mensaje_series = None
-        if modo_carterizado_itau:
-            mensaje_series = build_itau_carterizado_messages(df, mandante_nombre)
-            valid_mask = mensaje_series.fillna("").astype(str).str.strip() != ""
-            if not valid_mask.any():
-                return _sms_error("No hay filas SMS válidas para generar salida Itaú (revisa MASIVIDAD).")
-            df = df.loc[valid_mask].copy()
-            mensaje_series = mensaje_series.loc[valid_mask].copy()
-            mensaje = "SMS ITAU CARTERIZADO"
-            mensajes_personalizados = True
-        elif mensajes_personalizados:
-            mensaje_col = _find_column(df, "mensaje")
-            if not mensaje_col:
-                return _sms_error("Activaste múltiples mensajes pero no existe una columna 'Mensaje' en el archivo.")
-            mensaje_series = df[mensaje_col].fillna("").astype(str).str.strip()
-            if mensaje_series.eq("").all() and not mensaje:
-                return _sms_error("La columna 'Mensaje' está vacía y no ingresaste un mensaje base.")
-            if not mensaje:
-                primera = mensaje_series[mensaje_series != ""]
-                if primera.empty:
-                    return _sms_error("No hay mensajes válidos en la columna 'Mensaje'.")
-                mensaje = primera.iloc[0]
-            mensaje_series = mensaje_series.where(mensaje_series != "", mensaje)
-
-        fecha_actual = datetime.now().strftime("%d-%m")
-        mandante_token = filename_token(mandante_nombre)
-
-        if tipo_salida == "AXIA":
-            carga = build_axia_output(df, mensaje=mensaje, mensajes_series=mensaje_series if mensajes_personalizados else None)
-            if modo_carterizado_itau and mensaje_series is not None:
-                carga, _ = prepend_itau_seed_rows(carga, tipo_salida, mensaje_series)
-            nombre = f"carga_AXIA_SMS_{mandante_token}_{fecha_actual}.xlsx"
-            main_sheet = "Hoja1"
-            main_header = False
-        else:
-            carga = build_athenas_output(df, mensaje=mensaje, mensajes_series=mensaje_series if mensajes_personalizados else None)
-            if modo_carterizado_itau and mensaje_series is not None:
-                carga, _ = prepend_itau_seed_rows(carga, tipo_salida, mensaje_series)
-            nombre = f"cargaAthenas_SMS_{mandante_token}_{fecha_actual}.xlsx"
-            main_sheet = "cargaAthenas"
-            main_header = True
-
-        files: list[tuple[str, bytes]] = [(nombre, df_to_xlsx_bytes(carga, sheet_name=main_sheet, header=main_header))]
-        if tipo_salida == "AXIA":
-            csv_name = nombre.replace(".xlsx", ".csv")
-            files.append((csv_name, carga.to_csv(index=False, header=False, sep=";", encoding="utf-8-sig").encode("utf-8-sig")))
-
-        if include_crm and crm_rule and crm_fecha:
-            usuario, observacion = crm_rule
-            crm_df = build_sms_crm_output(
-                df,
-                usuario=usuario,
-                fecha=crm_fecha,
-                hora_inicio=crm_hora_inicio,
-                hora_fin=crm_hora_fin,
-                observacion=observacion,
-            )
-            crm_base = f"carga_CRM_SMS_{mandante_token}_{fecha_actual}"
-            files.append((f"{crm_base}.xlsx", df_to_xlsx_bytes(crm_df, sheet_name="cargaCRM")))
-            files.append((f"{crm_base}.csv", crm_df.to_csv(index=False, sep=";", encoding="utf-8-sig").encode("utf-8-sig")))
-
-        if len(files) > 1:
-            zip_name = f"SMS_{tipo_salida}_{mandante_token}_{fecha_actual}.zip"
-            return send_file(
-                _zip_sms_outputs(files),
-                as_attachment=True,
-                download_name=zip_name,
-                mimetype="application/zip",
-            )
-
-        buf = df_to_xlsx_bytesio(carga, sheet_name=main_sheet, header=main_header)
-
-        return send_file(
-            buf,
-            as_attachment=True,
-            download_name=nombre,
-            mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
-
+        return send_output(generate_sms(data, **params))
+    except ValueError as e:
+        return _sms_error(str(e))
     except Exception as e:
         return _sms_error(f"Ocurrió un error procesando el archivo: {e}", status=500)
+
+
+def generate_sms(
+    data: bytes,
+    *,
+    mensaje: str,
+    tipo_salida: str,
+    mandante_nombre: str,
+    mensajes_personalizados: bool,
+    modo_carterizado_itau: bool,
+    crm_rule: tuple[str, str] | None,
+    crm_fecha: date | None,
+    crm_hora_inicio: str,
+    crm_hora_fin: str,
+) -> JobOutput:
+    jobs.report_progress(message="Leyendo archivo")
+    # Itau carterizado busca columnas propias (agente, masividad): ahi se lee el Excel completo.
+    columns = None if modo_carterizado_itau else sms_input_columns(mensajes_personalizados) | RULE_COLUMNS
+    df = read_input_table(data, columns, dtype=str)
+    df = apply_mandante_rules(df, mandante_nombre)
+    jobs.report_progress(total=len(df), message="Armando mensajes")
+    mensaje_series = None
+    if modo_carterizado_itau:
+        mensaje_series = build_itau_carterizado_messages(df, mandante_nombre)
+        valid_mask = mensaje_series.fillna("").astype(str).str.strip() != ""
+        if not valid_mask.any():
+            raise ValueError("No hay filas SMS válidas para generar salida Itaú (revisa MASIVIDAD).")
+        df = df.loc[valid_mask].copy()
+        mensaje_series = mensaje_series.loc[valid_mask].copy()
+        mensaje = "SMS ITAU CARTERIZADO"
+        mensajes_personalizados = True
+    elif mensajes_personalizados:
+        mensaje_col = COLUMN_MAP_TABLE.column(df, "mensaje")
+        if not mensaje_col:
+            raise ValueError("Activaste múltiples mensajes pero no existe una columna 'Mensaje' en el archivo.")
+        mensaje_series = df[mensaje_col].fillna("").astype(str).str.strip()
+        if mensaje_series.eq("").all() and not mensaje:
+            raise ValueError("La columna 'Mensaje' está vacía y no ingresaste un mensaje base.")
+        if not mensaje:
+            primera = mensaje_series[mensaje_series != ""]
+            if primera.empty:
+                raise ValueError("No hay mensajes válidos en la columna 'Mensaje'.")
+            mensaje = primera.iloc[0]
+        mensaje_series = mensaje_series.where(mensaje_series != "", mensaje)
+
+    fecha_actual = datetime.now().strftime("%d-%m")
+    mandante_token = filename_token(mandante_nombre)
+
+    if tipo_salida == "AXIA":
+        carga = build_axia_output(df, mensaje=mensaje, mensajes_series=mensaje_series if mensajes_personalizados else None)
+        if modo_carterizado_itau and mensaje_series is not None:
+            carga, _ = prepend_itau_seed_rows(carga, tipo_salida, mensaje_series)
+        nombre = f"carga_AXIA_SMS_{mandante_token}_{fecha_actual}.xlsx"
+        main_sheet = "Hoja1"
+        main_header = False
+    else:
+        carga = build_athenas_output(df, mensaje=mensaje, mensajes_series=mensaje_series if mensajes_personalizados else None)
+        if modo_carterizado_itau and mensaje_series is not None:
+            carga, _ = prepend_itau_seed_rows(carga, tipo_salida, mensaje_series)
+        nombre = f"cargaAthenas_SMS_{mandante_token}_{fecha_actual}.xlsx"
+        main_sheet = "cargaAthenas"
+        main_header = True
+
+    crm_df = None
+    if crm_rule and crm_fecha:
+        usuario, observacion = crm_rule
+        crm_df = build_sms_crm_output(
+            df,
+            usuario=usuario,
+            fecha=crm_fecha,
+            hora_inicio=crm_hora_inicio,
+            hora_fin=crm_hora_fin,
+            observacion=observacion,
+        )
+
+    jobs.report_progress(done=len(df), message="Generando archivos")
+    if tipo_salida == "AXIA" or crm_df is not None:
+        with ZipBundle() as bundle:
+            bundle.add_xlsx(nombre, carga, sheet_name=main_sheet, header=main_header)
+            if tipo_salida == "AXIA":
+                bundle.add_csv(nombre.replace(".xlsx", ".csv"), carga, index=False, header=False, sep=";")
+            if crm_df is not None:
+                crm_base = f"carga_CRM_SMS_{mandante_token}_{fecha_actual}"
+                bundle.add_xlsx(f"{crm_base}.xlsx", crm_df, sheet_name="cargaCRM")
+                bundle.add_csv(f"{crm_base}.csv", crm_df, index=False, sep=";")
+            zip_file = bundle.finish()
+        zip_name = f"SMS_{tipo_salida}_{mandante_token}_{fecha_actual}.zip"
+        return JobOutput(zip_file, zip_name, "application/zip", rows=len(carga))
+
+    buf = df_to_xlsx_bytesio(carga, sheet_name=main_sheet, header=main_header)
+    return JobOutput(buf, nombre, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", rows=len(carga))
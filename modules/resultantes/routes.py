@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-import io
-from datetime import datetime
+from datetime import date, datetime
 
-from flask import Blueprint, request, send_file
+from flask import Blueprint, Response, request, stream_with_context
 
 from frontend import serve_react_app
-from services.resultantes_service import build_resultante_file
-from utils import api_error_response
+from services import jobs
+from services.jobs import JobOutput
+from services.resultantes_service import stream_resultante_file
+from utils import api_error_response, job_accepted_response, wants_background_job
 
 
 resultantes_bp = Blueprint("resultantes", __name__)
@@ -26,6 +27,7 @@ def resultantes_page():
 def resultantes_download():
     mandante = (request.args.get("mandante") or "").strip()
     modo = (request.args.get("modo") or "rango").strip().lower()
+    use_cache = (request.args.get("refresh") or "").strip().lower() not in {"1", "true", "yes"}
     fecha_inicio_raw = (request.args.get("fecha_inicio") or request.args.get("fecha") or "").strip()
     fecha_fin_raw = (request.args.get("fecha_fin") or fecha_inicio_raw).strip()
 
@@ -48,15 +50,27 @@ def resultantes_download():
     except ValueError:
         return _resultantes_error("Formato de fecha invalido (usa AAAA-MM-DD).")
 
+    if wants_background_job():
+        job_id = jobs.submit(
+            "resultantes", generate_resultante, mandante, fecha_inicio, fecha_fin, modo=modo, use_cache=use_cache
+        )
+        return job_accepted_response(job_id)
     try:
-        payload, filename, mimetype = build_resultante_file(mandante, fecha_inicio, fecha_fin, modo=modo)
-        return send_file(
-            io.BytesIO(payload),
-            as_attachment=True,
-            download_name=filename,
-            mimetype=mimetype,
+        chunks, filename, mimetype = stream_resultante_file(
+            mandante, fecha_inicio, fecha_fin, modo=modo, use_cache=use_cache
+        )
+        return Response(
+            stream_with_context(chunks),
+            content_type=mimetype,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
         )
     except ValueError as exc:
         return _resultantes_error(str(exc))
     except Exception as exc:
         return _resultantes_error(f"No se pudo generar la resultante: {exc}", status=500)
+
+
+def generate_resultante(mandante: str, fecha_inicio: date, fecha_fin: date, *, modo: str, use_cache: bool) -> JobOutput:
+    jobs.report_progress(message="Consultando resultantes")
+    chunks, filename, mimetype = stream_resultante_file(mandante, fecha_inicio, fecha_fin, modo=modo, use_cache=use_cache)
+    return JobOutput(chunks, filename, mimetype)
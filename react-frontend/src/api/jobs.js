@@ -0,0 +1,32 @@
+import api from './client'
+
+const POLL_INTERVAL_MS = 1000
+// Tope de espera por trabajo; pasado este tiempo se deja de consultar y se informa error.
+const MAX_WAIT_MS = 30 * 60 * 1000
+
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms))
+
+const jsonBlob = payload => new Blob([JSON.stringify(payload)], { type: 'application/json' })
+
+// Encola la generacion en segundo plano (async=1), consulta /api/jobs/<id> hasta que termine y
+// descarga el archivo. Devuelve una respuesta con la misma forma que una descarga directa.
+export const runJob = async (request, { onProgress, maxWaitMs = MAX_WAIT_MS } = {}) => {
+  const accepted = await request()
+  if (accepted.status !== 202) return accepted
+  const { status_url: statusUrl, download_url: downloadUrl } = JSON.parse(await accepted.data.text())
+
+  const deadline = Date.now() + maxWaitMs
+  while (Date.now() < deadline) {
+    await sleep(POLL_INTERVAL_MS)
+    const { status, data } = await api.get(statusUrl)
+    if (status >= 400) return { status, headers: {}, data: jsonBlob(data) }
+    onProgress?.(data)
+    if (data.status === 'done') return api.get(downloadUrl, { responseType: 'blob' })
+    if (data.status === 'error') return { status: 400, headers: {}, data: jsonBlob({ message: data.error }) }
+  }
+  return {
+    status: 504,
+    headers: {},
+    data: jsonBlob({ message: 'El trabajo no terminó en el tiempo máximo de espera. Revisa más tarde o vuelve a intentarlo.' }),
+  }
+}
@@ -1,11 +1,14 @@
 import api from './client'
+import { runJob } from './jobs'
 
 export const submitMailTemplate = async (formData) => {
-  const response = await api.post('/mail/template', formData, {
-    headers: { 'Content-Type': 'multipart/form-data' },
-    responseType: 'blob',
-  })
-  return response
+  return runJob(() =>
+    api.post('/mail/template', formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+      params: { async: 1 },
+      responseType: 'blob',
+    }),
+  )
 }
 
 export const downloadMailTemplateSample = async (templateCode) => {
@@ -1,8 +1,11 @@
 import api from './client'
+import { runJob } from './jobs'
 
 export const downloadResultante = async ({ mandante, fechaInicio, fechaFin, modo }) => {
-  return api.get('/resultantes/download', {
-    params: { mandante, fecha_inicio: fechaInicio, fecha_fin: fechaFin, modo },
-    responseType: 'blob',
-  })
+  return runJob(() =>
+    api.get('/resultantes/download', {
+      params: { mandante, fecha_inicio: fechaInicio, fecha_fin: fechaFin, modo, async: 1 },
+      responseType: 'blob',
+    }),
+  )
 }
@@ -1,9 +1,12 @@
 import api from './client'
+import { runJob } from './jobs'
 
 export const submitSantanderConsumerTerreno = async (formData) => {
-  const response = await api.post('/santander-consumer/terreno', formData, {
-    headers: { 'Content-Type': 'multipart/form-data' },
-    responseType: 'blob',
-  })
-  return response
+  return runJob(() =>
+    api.post('/santander-consumer/terreno', formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+      params: { async: 1 },
+      responseType: 'blob',
+    }),
+  )
 }
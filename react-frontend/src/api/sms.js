@@ -1,4 +1,5 @@
 import api from './client'
+import { runJob } from './jobs'
 
 export const downloadSmsSample = async (type) => {
   const response = await api.get(`/sms/sample/${type}`, { responseType: 'blob' })
@@ -6,9 +7,11 @@ export const downloadSmsSample = async (type) => {
 }
 
 export const submitSmsMasivo = async (formData) => {
-  const response = await api.post('/sms/athenas', formData, {
-    headers: { 'Content-Type': 'multipart/form-data' },
-    responseType: 'blob',
-  })
-  return response
+  return runJob(() =>
+    api.post('/sms/athenas', formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+      params: { async: 1 },
+      responseType: 'blob',
+    }),
+  )
 }
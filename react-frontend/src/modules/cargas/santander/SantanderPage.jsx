@@ -165,7 +165,7 @@ function SantanderPage() {
         <section className="rounded-3xl bg-white p-5 shadow-sm ring-1 ring-slate-200">
           <p className="font-semibold text-slate-800">Notas</p>
           <ul className="mt-2 list-disc space-y-1 pl-5 text-sm text-slate-600">
-            <li>CRM siempre se genera y queda disponible hasta reiniciar la app (token en memoria).</li>
+            <li>CRM siempre se genera y queda disponible para descarga durante unas horas (luego debes volver a procesar).</li>
             <li>Masividad solo existe si activas el switch y los correos pasan las validaciones.</li>
             <li>Las descargas usan los mismos endpoints `/sant-hipotecario/descargar/...` del backend Flask.</li>
           </ul>
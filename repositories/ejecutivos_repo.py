@@ -89,6 +89,32 @@ def fetch_by_mandante_and_nombre(mandante: str, nombre: str) -> Optional[Ejecuti
     return None
 
 
+def list_directory_entries(mandante: str) -> list[tuple[Ejecutivo, list[str]]]:
+    """Ejecutivos activos del mandante con sus alias, en una sola consulta."""
+    if not mandante:
+        return []
+    query = (
+        f"SELECT e.*, a.alias AS alias_nombre FROM {EJECUTIVOS_TABLE} e "
+        f"LEFT JOIN {ALIAS_TABLE} a ON a.ejecutivo_id = e.id "
+        "WHERE e.mandante = ? AND e.activo = 1 "
+        "ORDER BY e.id"
+    )
+    with get_stc_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(query, (mandante,))
+        rows = _fetchall_dicts(cur)
+
+    entries: dict[int, tuple[Ejecutivo, list[str]]] = {}
+    for row in rows:
+        ejecutivo_id = row["id"]
+        if ejecutivo_id not in entries:
+            entries[ejecutivo_id] = (_row_to_ejecutivo(row), [])
+        alias = row.get("alias_nombre")
+        if alias:
+            entries[ejecutivo_id][1].append(str(alias))
+    return list(entries.values())
+
+
 def list_ejecutivos(*, mandante: Optional[str] = None, activos: Optional[bool] = None) -> list[Ejecutivo]:
     clauses: list[str] = []
     params: list[Any] = []
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import hashlib
 import os
 from datetime import date
-from typing import Any, cast
+from typing import Any, Iterator, Optional, cast
 
 from services.resultantes_queries.index import (
     PORSCHE_QUERY,
@@ -20,43 +21,93 @@ def _resultantes_enabled() -> bool:
     return os.getenv("RESULT_DB_ENABLED", "0").lower() in {"1", "true", "yes"}
 
 
-def fetch_tanner_resultantes(fecha_inicio: date, fecha_fin: date) -> list[Row]:
-    """Consulta resultantes Tanner entre fechas (inclusive)."""
-    if not _resultantes_enabled():
-        return []
-
+def _tanner_settings() -> tuple[int, str, str]:
     cartera = int(os.getenv("RESULTANTES_TANNER_CARTERA", "519"))
     discador_user = (os.getenv("RESULTANTES_TANNER_DISCADOR_USER") or "VDAD").strip() or "VDAD"
     query = (os.getenv("RESULTANTES_TANNER_QUERY") or TANNER_QUERY).strip()
+    return cartera, discador_user, query
+
+
+def _porsche_settings() -> tuple[int, str]:
+    cartera = int(os.getenv("RESULTANTES_PORSCHE_CARTERA", "528"))
+    query = (os.getenv("RESULTANTES_PORSCHE_QUERY") or PORSCHE_QUERY).strip()
+    return cartera, query
+
+
+def query_identity(mandante: str) -> Optional[dict[str, Any]]:
+    """Cartera, usuario y hash de la consulta vigente; None si la fuente esta deshabilitada."""
+    if not _resultantes_enabled():
+        return None
+    if mandante == "TANNER":
+        cartera, discador_user, query = _tanner_settings()
+        extra = {"discador_user": discador_user}
+    elif mandante == "PORSCHE":
+        cartera, query = _porsche_settings()
+        extra = {}
+    else:
+        return None
+    return {
+        "cartera": cartera,
+        "query_sha": hashlib.sha256(query.encode("utf-8")).hexdigest(),
+        **extra,
+    }
+
+
+def _fetch_size() -> int:
+    return max(1, int(os.getenv("RESULT_DB_FETCH_SIZE", "5000")))
+
+
+def _stream_rows(query: str, params: Any = None, batch_size: int | None = None) -> Iterator[list[Row]]:
+    """Ejecuta la consulta con cursor sin buffer y entrega las filas en lotes."""
+    size = batch_size or _fetch_size()
+    with get_resultantes_connection() as conn:
+        cur = conn.cursor(dictionary=True, buffered=False)
+        try:
+            cur.execute(query, params)
+            while True:
+                batch = cur.fetchmany(size)
+                if not batch:
+                    break
+                yield cast(list[Row], batch)
+        finally:
+            # Con filas sin leer el pool descarta la conexion; cerrar el cursor fallaria.
+            if not getattr(conn, "unread_result", False):
+                cur.close()
+
+
+def iter_tanner_resultantes(fecha_inicio: date, fecha_fin: date, batch_size: int | None = None) -> Iterator[list[Row]]:
+    """Resultantes Tanner entre fechas (inclusive), en lotes de filas."""
+    if not _resultantes_enabled():
+        return iter(())
+
+    cartera, discador_user, query = _tanner_settings()
     params = build_tanner_params(
         cartera=cartera,
         discador_user=discador_user,
         fecha_inicio=fecha_inicio,
         fecha_fin=fecha_fin,
     )
-
-    with get_resultantes_connection() as conn:
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute(query, params)
-            rows = cur.fetchall() or []
-    return cast(list[Row], rows)
+    return _stream_rows(query, params, batch_size)
 
 
-def fetch_porsche_resultantes(fecha_inicio: date, fecha_fin: date) -> list[Row]:
+def iter_porsche_resultantes(fecha_inicio: date, fecha_fin: date, batch_size: int | None = None) -> Iterator[list[Row]]:
     if not _resultantes_enabled():
-        return []
+        return iter(())
 
-    cartera = int(os.getenv("RESULTANTES_PORSCHE_CARTERA", "528"))
-    query = (os.getenv("RESULTANTES_PORSCHE_QUERY") or PORSCHE_QUERY).strip()
+    cartera, query = _porsche_settings()
     params = build_porsche_params(cartera=cartera, fecha_inicio=fecha_inicio, fecha_fin=fecha_fin)
     cartera_sql, inicio_sql, fin_sql = params
     rendered_query = query
     rendered_query = rendered_query.replace("__CARTERA__", str(cartera_sql), 1)
     rendered_query = rendered_query.replace("__INICIO__", inicio_sql, 1)
     rendered_query = rendered_query.replace("__FIN__", fin_sql, 1)
+    return _stream_rows(rendered_query, None, batch_size)
 
-    with get_resultantes_connection() as conn:
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute(rendered_query)
-            rows = cur.fetchall() or []
-    return cast(list[Row], rows)
+
+def fetch_tanner_resultantes(fecha_inicio: date, fecha_fin: date) -> list[Row]:
+    """Consulta resultantes Tanner entre fechas (inclusive)."""
+    return [row for batch in iter_tanner_resultantes(fecha_inicio, fecha_fin) for row in batch]
+
+
+def fetch_porsche_resultantes(fecha_inicio: date, fecha_fin: date) -> list[Row]:
+    return [row for batch in iter_porsche_resultantes(fecha_inicio, fecha_fin) for row in batch]
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.sms_service import build_crm_output, iter_crm_outputs_by_group
+
+FECHA = date(2026, 3, 2)
+HORA_INICIO, HORA_FIN = "09:00:00", "18:00:00"
+
+
+def _build_frame(rows: int, users: int) -> pd.DataFrame:
+    rng = np.random.default_rng(20260418)
+    agentes = np.array([f"Agente{idx:03d}" for idx in range(users)] + [""], dtype=object)
+    return pd.DataFrame(
+        {
+            "RUT": rng.integers(1_000_000, 1_000_000 + rows // 2, rows).astype(str),
+            "OPERACION": rng.integers(1, 10**9, rows).astype(str),
+            "TELEFONO": rng.integers(900_000_000, 999_999_999, rows).astype(str),
+            "USUARIO": agentes[rng.integers(0, users + 1, rows)],
+        }
+    )
+
+
+def _legacy(df: pd.DataFrame) -> list[tuple[str, pd.DataFrame]]:
+    """Recorrido anterior: mascara booleana y build_crm_output completo por usuario."""
+    usuarios = df["USUARIO"].fillna("").astype(str).str.strip()
+    base = df.copy()
+    base["__usuario_display"] = usuarios
+    base["__usuario_key"] = usuarios.str.lower()
+    valid = base[base["__usuario_key"].str.len() > 0].copy()
+    outputs = []
+    for key in sorted(str(item) for item in pd.unique(valid["__usuario_key"]).tolist()):
+        group = valid.loc[valid["__usuario_key"] == key].copy()
+        display = group["__usuario_display"].iloc[0]
+        subset = group.drop(columns=["__usuario_display", "__usuario_key"])
+        outputs.append((display, build_crm_output(subset, display, FECHA, HORA_INICIO, HORA_FIN, "SMS")))
+    return outputs
+
+
+def _grouped(df: pd.DataFrame) -> list[tuple[str, pd.DataFrame]]:
+    usuarios = df["USUARIO"].fillna("").astype(str).str.strip()
+    keys = usuarios.str.lower()
+    codes, user_keys = pd.factorize(keys.where(keys.str.len() > 0), sort=True)
+    _, first_rows = np.unique(codes, return_index=True)
+    displays = usuarios.to_numpy()[first_rows[-len(user_keys):]].tolist()
+    outputs = iter_crm_outputs_by_group(df, codes, displays, FECHA, HORA_INICIO, HORA_FIN, "SMS")
+    return [(displays[code], salida) for code, salida in outputs]
+
+
+def _timed(label: str, func):
+    started = time.perf_counter()
+    result = func()
+    print(f"{label}: {time.perf_counter() - started:.3f}s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de la division CRM SMS/IVR por usuario.")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--users", type=int, default=300)
+    args = parser.parse_args()
+
+    df = _build_frame(args.rows, args.users)
+    print(f"filas={len(df)} usuarios={args.users}")
+    legacy = _timed("mascara por usuario (anterior)", lambda: _legacy(df))
+    grouped = _timed("agrupado en una pasada", lambda: _grouped(df))
+    identical = len(legacy) == len(grouped) and all(
+        name_a == name_b and out_a.astype(str).equals(out_b.astype(str))
+        for (name_a, out_a), (name_b, out_b) in zip(legacy, grouped)
+    )
+    print(f"archivos={len(grouped)} salida identica: {identical}")
+
+
+if __name__ == "__main__":
+    main()
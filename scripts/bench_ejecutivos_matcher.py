@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from repositories.ejecutivos_repo import Ejecutivo
+from services.ejecutivos_directory import EjecutivoDirectory, _ascii_fold
+
+
+FIRST_NAMES = [
+    "Ariel", "Daniela", "Paula", "Claudia", "Erika", "Yessenia", "Paulina", "Pamela", "Luis", "Karen",
+    "Maricel", "Juan", "Pablo", "Camila", "Javiera", "Francisca", "Rodrigo", "Felipe", "Ignacio", "Valentina",
+]
+LAST_NAMES = [
+    "Silva", "Cañicul", "Alarcon", "Sandoval", "Alderete", "Salinas", "Ortiz", "Alamos", "Toledo", "Avendaño",
+    "Galvez", "Rios", "Fuentes", "Muñoz", "Rojas", "Diaz", "Perez", "Soto", "Contreras", "Sepulveda",
+    "Morales", "Araya", "Flores", "Espinoza", "Valenzuela",
+]
+
+
+def _build_ejecutivos(count: int, rng: random.Random) -> list[Ejecutivo]:
+    names: set[str] = set()
+    while len(names) < count:
+        names.add(f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}")
+    return [
+        Ejecutivo(
+            id=idx,
+            mandante="BENCH",
+            nombre_clave=name.upper().replace(" ", "_"),
+            nombre_mostrar=name,
+            correo=f"ejecutivo{idx}@phoenixservice.cl",
+            telefono=f"569{idx:08d}",
+            reenviador=None,
+            activo=True,
+            metadata=None,
+        )
+        for idx, name in enumerate(sorted(names), start=1)
+    ]
+
+
+def _typo(name: str, rng: random.Random) -> str:
+    pos = rng.randrange(len(name))
+    return name[:pos] + name[pos + 1:]
+
+
+def _build_names(ejecutivos: list[Ejecutivo], distinct: int, rng: random.Random) -> list[str]:
+    names: dict[str, None] = {}
+    while len(names) < distinct:
+        ejecutivo = rng.choice(ejecutivos)
+        display = ejecutivo.nombre_mostrar or ""
+        kind = rng.random()
+        if kind < 0.4:
+            names[_typo(display, rng)] = None
+        elif kind < 0.7:
+            parts = display.split()
+            names[" ".join(parts[1:] + parts[:1])] = None
+        elif kind < 0.85:
+            names[_ascii_fold(display).upper()] = None
+        else:
+            names[f"{rng.choice(FIRST_NAMES)} Desconocido {rng.randrange(100000)}"] = None
+    return list(names)
+
+
+def _legacy_match(ejecutivos: list[Ejecutivo], nombre: str) -> Ejecutivo | None:
+    target = _ascii_fold(nombre).lower().strip()
+    best = None
+    best_score = 0.0
+    for item in ejecutivos:
+        options = [
+            _ascii_fold(item.nombre_mostrar or "").lower().strip(),
+            (item.nombre_clave or "").replace("_", " ").lower().strip(),
+        ]
+        for option in options:
+            if not option:
+                continue
+            score = SequenceMatcher(None, target, option).ratio()
+            if score > best_score:
+                best_score = score
+                best = item
+    return best if best and best_score >= 0.92 else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de resolucion difusa de ejecutivos.")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--distinct", type=int, default=5000)
+    parser.add_argument("--ejecutivos", type=int, default=400)
+    parser.add_argument("--legacy-sample", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = random.Random(20260401)
+    ejecutivos = _build_ejecutivos(args.ejecutivos, rng)
+    distinct_names = _build_names(ejecutivos, args.distinct, rng)
+    rows = [rng.choice(distinct_names) for _ in range(args.rows)]
+
+    started = time.perf_counter()
+    directory = EjecutivoDirectory("BENCH", [(ejecutivo, []) for ejecutivo in ejecutivos])
+    build_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    resolved = [directory.resolve(name) for name in rows]
+    indexed_seconds = time.perf_counter() - started
+
+    sample = rows[: args.legacy_sample]
+    started = time.perf_counter()
+    legacy = [_legacy_match(ejecutivos, name) for name in sample]
+    legacy_sample_seconds = time.perf_counter() - started
+    legacy_estimate = legacy_sample_seconds / max(len(sample), 1) * len(rows)
+
+    found = sum(1 for item in resolved if item is not None)
+    agreement = sum(
+        1
+        for old, new in zip(legacy, resolved)
+        if old is None or (new is not None and new.id == old.id)
+    )
+    print(f"filas={len(rows)} distintos={len(set(rows))} ejecutivos={len(ejecutivos)}")
+    print(f"indice: construccion {build_seconds:.3f}s, resolucion {indexed_seconds:.3f}s, encontrados {found}")
+    print(
+        f"escaneo SequenceMatcher: {legacy_sample_seconds:.3f}s para {len(sample)} filas, "
+        f"estimado {legacy_estimate:.1f}s para {len(rows)} filas"
+    )
+    print(f"coincidencias con escaneo en muestra: {agreement}/{len(sample)}")
+    if indexed_seconds > 0:
+        print(f"aceleracion estimada: x{legacy_estimate / indexed_seconds:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.mandante_rules import RULE_COLUMNS
+from services.sms_service import input_columns
+from utils import upload_cache
+from utils.excel_reader import excel_engine, read_input_table
+
+
+def _build_workbook(rows: int, extra_columns: int) -> bytes:
+    rng = np.random.default_rng(7)
+    data = {
+        "RUT": rng.integers(1_000_000, 30_000_000, rows).astype(str),
+        "OPERACION": rng.integers(10**9, 10**12, rows).astype(str),
+        "TELEFONO": rng.integers(900_000_000, 999_999_999, rows).astype(str),
+    }
+    for idx in range(extra_columns):
+        data[f"DATO_{idx + 1}"] = rng.integers(0, 10**8, rows).astype(str)
+    buffer = io.BytesIO()
+    pd.DataFrame(data).to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+def _timed(label: str, func):
+    started = time.perf_counter()
+    result = func()
+    print(f"{label}: {time.perf_counter() - started:.2f}s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de lectura de Excel de entrada (SMS).")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--extra-columns", type=int, default=15)
+    args = parser.parse_args()
+
+    print(f"filas={args.rows} columnas={args.extra_columns + 3} motor={excel_engine() or 'openpyxl'}")
+    workbook = _timed("generar libro", lambda: _build_workbook(args.rows, args.extra_columns))
+    print(f"tamano={len(workbook) / 1024 / 1024:.1f}MB")
+
+    columns = input_columns() | RULE_COLUMNS
+    with tempfile.TemporaryDirectory() as tmp:
+        upload_cache.cache_dir = lambda: Path(tmp)
+        legacy = _timed("pd.read_excel (anterior)", lambda: pd.read_excel(io.BytesIO(workbook), dtype=str))
+
+        os.environ["UPLOAD_CACHE_ENABLED"] = "0"
+        pruned = _timed("read_input_table sin cache", lambda: read_input_table(workbook, columns, dtype=str))
+
+        os.environ["UPLOAD_CACHE_ENABLED"] = "1"
+        _timed("read_input_table primera carga", lambda: read_input_table(workbook, columns, dtype=str))
+        cached = _timed("read_input_table misma carga", lambda: read_input_table(workbook, columns, dtype=str))
+
+    expected = legacy[list(pruned.columns)]
+    print(f"columnas leidas: {list(pruned.columns)}")
+    print(f"salida identica: {pruned.equals(expected) and cached.equals(expected)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from repositories.ejecutivos_repo import Ejecutivo
+from services import ejecutivos_directory
+from services import sms_itau_vencida as itau
+from services.ejecutivos_directory import EjecutivoDirectory
+
+MANDANTE = "Itau Vencida"
+MASIVIDADES = ["SMS MOROSIDAD", "SMS COMPROMISO DE PAGO", "SMS COMPROMISO ROTO", "SMS CAMPAÑA"]
+
+
+def _install_directory(count: int) -> list[str]:
+    ejecutivos = [
+        Ejecutivo(
+            id=idx,
+            mandante=MANDANTE,
+            nombre_clave=f"EJECUTIVO_{idx:03d}",
+            nombre_mostrar=f"Ejecutivo {idx:03d}",
+            correo=None,
+            telefono=f"9{idx:08d}",
+            reenviador=None,
+            activo=True,
+            metadata=None,
+        )
+        for idx in range(1, count + 1)
+    ]
+    directory = EjecutivoDirectory(MANDANTE, [(ejecutivo, []) for ejecutivo in ejecutivos])
+    ejecutivos_directory._CACHE[MANDANTE] = (time.monotonic() + 10**9, directory)
+    return [ejecutivo.nombre_mostrar or "" for ejecutivo in ejecutivos]
+
+
+def _build_frame(rows: int, names: list[str], rng: random.Random) -> pd.DataFrame:
+    variants = names + [name.upper() for name in names] + ["Ejecutivo Desconocido", ""]
+    return pd.DataFrame(
+        {
+            "RUT": [str(rng.randrange(1_000_000, 30_000_000)) for _ in range(rows)],
+            "CARTERIZADO": [rng.choice(variants) for _ in range(rows)],
+            "MASIVIDAD": [rng.choice(MASIVIDADES) for _ in range(rows)],
+        }
+    )
+
+
+def _legacy_messages(df: pd.DataFrame, mandante: str) -> pd.Series:
+    """Recorrido fila a fila anterior (referencia para comparar tiempos y salida)."""
+    masividad_to_template = itau._itau_masividad_to_template_from_config(itau.load_itau_sms_config())
+    template_cache: dict[str, str] = {}
+    messages: list[str] = []
+    for raw_name, raw_masividad in zip(df["CARTERIZADO"].tolist(), df["MASIVIDAD"].tolist()):
+        key = masividad_to_template.get(itau.ascii_fold(itau.normalize_spaces(raw_masividad)).upper())
+        if not key:
+            messages.append("")
+            continue
+        if key not in template_cache:
+            template_cache[key] = itau._strip_trailing_phone(itau.load_itau_sms_template(key))
+        phone = itau._resolve_itau_phone(mandante, itau.normalize_spaces(raw_name))
+        messages.append(f"{template_cache[key]} {phone}".strip() if phone else "")
+    return pd.Series(messages, index=df.index)
+
+
+def _timed(label: str, func):
+    started = time.perf_counter()
+    result = func()
+    print(f"{label}: {time.perf_counter() - started:.3f}s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark del armado de mensajes SMS Itau carterizados.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--ejecutivos", type=int, default=40)
+    args = parser.parse_args()
+
+    rng = random.Random(20260417)
+    names = _install_directory(args.ejecutivos)
+    df = _build_frame(args.rows, names, rng)
+    print(f"filas={len(df)} carterizados={df['CARTERIZADO'].nunique()} masividades={df['MASIVIDAD'].nunique()}")
+
+    legacy = _timed("fila a fila (anterior)", lambda: _legacy_messages(df, MANDANTE))
+    current = _timed("pares distintos", lambda: itau.build_itau_carterizado_messages(df, MANDANTE))
+    print(f"salida identica: {legacy.equals(current)}")
+
+    carga = pd.DataFrame({"FONO": df["RUT"], "MENSAJE": current})
+    _, seeds = _timed("semillas", lambda: itau.prepend_itau_seed_rows(carga, "AXIA", current))
+    print(f"semillas agregadas: {seeds}")
+
+
+if __name__ == "__main__":
+    main()
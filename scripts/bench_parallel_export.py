@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from utils import excel_export
+
+
+def _build_frames(files: int, rows: int) -> list[tuple[str, pd.DataFrame]]:
+    rng = np.random.default_rng(20260418)
+    frames = []
+    for idx in range(files):
+        frames.append(
+            (
+                f"carga_{idx:02d}.xlsx",
+                pd.DataFrame(
+                    {
+                        "RUT": rng.integers(1_000_000, 30_000_000, rows).astype(str),
+                        "NOMBRE": [f"Cliente {value}" for value in rng.integers(0, 50_000, rows)],
+                        "MONTO": rng.integers(10_000, 5_000_000, rows),
+                        "MENSAJE": "Estimado cliente, su deuda se encuentra vencida.",
+                    }
+                ),
+            )
+        )
+    return frames
+
+
+def _export(frames: list[tuple[str, pd.DataFrame]], workers: int) -> tuple[float, bytes]:
+    os.environ["EXPORT_WORKERS"] = str(workers)
+    started = time.perf_counter()
+    data = excel_export.zip_named_dfs_bytes(frames).read()
+    return time.perf_counter() - started, data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de exportacion ZIP secuencial vs pool de procesos.")
+    parser.add_argument("--files", type=int, default=12)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    frames = _build_frames(args.files, args.rows)
+    print(f"archivos={args.files} filas_por_archivo={args.rows} cpus={os.cpu_count()} workers={args.workers}")
+
+    sequential, data_seq = _export(frames, 0)
+    print(f"secuencial: {sequential:.3f}s")
+    # Primera pasada paralela levanta el pool; se mide la segunda.
+    _export(frames, max(args.workers, 2))
+    parallel, data_par = _export(frames, max(args.workers, 2))
+    print(f"paralelo: {parallel:.3f}s (x{sequential / parallel:.2f})")
+
+    with zipfile.ZipFile(io.BytesIO(data_seq)) as zseq, zipfile.ZipFile(io.BytesIO(data_par)) as zpar:
+        same_names = sorted(zseq.namelist()) == sorted(zpar.namelist())
+        name = frames[0][0]
+        same_data = pd.read_excel(zseq.open(name)).equals(pd.read_excel(zpar.open(name)))
+    print(f"mismas entradas: {same_names} contenido identico ({name}): {same_data}")
+
+
+if __name__ == "__main__":
+    main()
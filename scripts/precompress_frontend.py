@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from frontend import FRONTEND_DIST, precompress_dist
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Genera variantes .gz (y .br si esta instalado brotli) del build React.")
+    parser.add_argument("--dist", type=Path, default=FRONTEND_DIST)
+    args = parser.parse_args()
+
+    if not args.dist.exists():
+        raise SystemExit(f"No existe {args.dist}. Ejecuta `npm run build` primero.")
+    files, gz_count, br_count = precompress_dist(args.dist)
+    brotli_note = "" if importlib.util.find_spec("brotli") is not None else " (brotli no instalado, solo gzip)"
+    print(f"archivos={files} gzip={gz_count} brotli={br_count}{brotli_note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import io
 import shutil
 import sys
 import tempfile
+from dataclasses import replace
 from datetime import date
 from pathlib import Path
 
@@ -12,7 +14,9 @@ ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from repositories import ejecutivos_repo
 from repositories.ejecutivos_repo import Ejecutivo
+from services import ejecutivos_directory
 from services.mail_service import build_mail_crm_output
 from services.mail_templates import TEMPLATE_COLUMNS_ARAUCANA, TEMPLATE_COLUMNS_ARAUCANA_ALTERNATIVAS, TEMPLATE_COLUMNS_BIT, TEMPLATE_COLUMNS_ITAU_CASTIGO, TEMPLATE_COLUMNS_ITAU_VENCIDA, build_mail_template
 from services.gm_mail_service import build_gm_mail_crm_output, build_gm_mail_output
@@ -21,7 +25,7 @@ from services.ivr_service import build_ivr_output
 from services.sant_hipotecario_masividad_service import generar_masividad
 from services.sant_hipotecario_service import generar_crm
 from services.santander_consumer_service import MEDIOS_PAGO_COLUMNS, OUTPUT_COLUMNS, build_santander_consumer_terreno_output
-from services.sms_service import build_athenas_output, build_axia_output, build_crm_output as build_sms_crm_output
+from services.sms_service import build_athenas_output, build_axia_output, build_crm_output as build_sms_crm_output, iter_crm_outputs_by_group
 
 
 def _fake_ejecutivo(nombre: str = "Ariel Silva") -> Ejecutivo:
@@ -38,14 +42,23 @@ def _fake_ejecutivo(nombre: str = "Ariel Silva") -> Ejecutivo:
     )
 
 
+def _patch_ejecutivos_directory():
+    original = ejecutivos_repo.list_directory_entries
+    ejecutivos_repo.list_directory_entries = lambda mandante: [(_fake_ejecutivo(), [])]
+    ejecutivos_directory.clear_directory_cache()
+    return original
+
+
+def _restore_ejecutivos_directory(original) -> None:
+    ejecutivos_repo.list_directory_entries = original
+    ejecutivos_directory.clear_directory_cache()
+
+
 def validate_sms_itau() -> None:
     from services import sms_itau_vencida
 
-    original_fetch = sms_itau_vencida.ejecutivos_repo.fetch_by_mandante_and_nombre
-    original_list = sms_itau_vencida.ejecutivos_repo.list_ejecutivos
+    original_directory = _patch_ejecutivos_directory()
     try:
-        sms_itau_vencida.ejecutivos_repo.fetch_by_mandante_and_nombre = lambda mandante, nombre: _fake_ejecutivo(nombre)
-        sms_itau_vencida.ejecutivos_repo.list_ejecutivos = lambda mandante=None, activos=True: [_fake_ejecutivo()]
         df = pd.DataFrame(
             {
                 "CARTERIZADO": ["Ariel Silva", "Ariel Silva", "Ariel Silva", "Ariel Silva"],
@@ -58,8 +71,7 @@ def validate_sms_itau() -> None:
         axia_seeded, axia_seed_count = sms_itau_vencida.prepend_itau_seed_rows(axia, "AXIA", messages)
         athenas_seeded, athenas_seed_count = sms_itau_vencida.prepend_itau_seed_rows(athenas, "ATHENAS", messages)
     finally:
-        sms_itau_vencida.ejecutivos_repo.fetch_by_mandante_and_nombre = original_fetch
-        sms_itau_vencida.ejecutivos_repo.list_ejecutivos = original_list
+        _restore_ejecutivos_directory(original_directory)
 
     assert len(messages) == 4, "SMS Itau debe generar mensajes"
     assert "Itau" in messages.iloc[0], "SMS Itau no contiene texto esperado"
@@ -71,6 +83,71 @@ def validate_sms_itau() -> None:
     print("SMS_ITAU_OK")
 
 
+def validate_sms_itau_phone_fallback() -> None:
+    from services import sms_itau_vencida
+
+    sin_telefono = replace(_fake_ejecutivo(), id=1, telefono=None)
+    con_telefono = replace(_fake_ejecutivo(), id=2, nombre_clave="ARIEL_SILVA_2", telefono="56987654321")
+    original = ejecutivos_repo.list_directory_entries
+    ejecutivos_repo.list_directory_entries = lambda mandante: [(sin_telefono, []), (con_telefono, ["Ariel Silva M"])]
+    ejecutivos_directory.clear_directory_cache()
+    try:
+        exacto = sms_itau_vencida._resolve_itau_phone("Itau Vencida", "Ariel Silva")
+        difuso = sms_itau_vencida._resolve_itau_phone("Itau Vencida", "Ariel Silvaa")
+    finally:
+        _restore_ejecutivos_directory(original)
+
+    assert exacto == "+56987654321", "SMS Itau debe caer al ejecutivo con telefono si el exacto no tiene"
+    assert difuso == "+56987654321", "SMS Itau difuso debe considerar solo ejecutivos con telefono"
+    print("SMS_ITAU_PHONE_FALLBACK_OK")
+
+
+def validate_preflight_matches_generators() -> None:
+    from services import ivr_service, sms_itau_vencida
+    from services.preflight import inspect_upload
+
+    def generate(proceso: str, df: pd.DataFrame) -> None:
+        if proceso in {"sms", "sms_itau"}:
+            build_athenas_output(df, mensaje="base")
+            if proceso == "sms_itau":
+                sms_itau_vencida.build_itau_carterizado_messages(df, "Itau Vencida")
+        elif proceso == "ivr":
+            ivr_service.build_ivr_output(df, campo1_value="PRUEBA")
+        elif proceso == "ivr_crm":
+            ivr_service.build_crm_output(df, fecha=date(2026, 6, 22), hora_inicio="10:00", hora_fin="11:00", usuario_value="u")
+        else:
+            build_mail_crm_output(df, fecha=date(2026, 6, 22), hora_inicio="10:00", hora_fin="11:00", usuario_value="u", observacion_value="MAIL")
+
+    headers = [
+        ["Rut", "Celular", "Operacion"],
+        ["RUT", "FONO", "OP"],
+        ["Id Cliente", "Teléfono", "Nro Documento"],
+        ["id_cliente (rut)", "Movil", "NRO-DOCUMENTO"],
+        ["RUT", "FONO", "OP", "CARTERIZADO", "MASIVIDAD"],
+        ["Rut", "Fono", "Operacion", "Nombre Agente", "Tipo SMS"],
+        ["RUT", "OPERACION", "E-Mail"],
+        ["RUT", "OP", "Mail_Agente"],
+    ]
+    sample_values = {"CARTERIZADO": "Ariel Silva", "NOMBRE AGENTE": "Ariel Silva", "MASIVIDAD": "SMS MOROSIDAD", "TIPO SMS": "SMS MOROSIDAD"}
+    original_directory = _patch_ejecutivos_directory()
+    try:
+        for proceso in ("sms", "sms_itau", "ivr", "ivr_crm", "mail_crm"):
+            for header in headers:
+                values = [sample_values.get(col.upper(), "11111111-1") for col in header]
+                csv_bytes = f"{';'.join(header)}\n{';'.join(values)}\n".encode("utf-8")
+                report = inspect_upload(io.BytesIO(csv_bytes), "preflight.csv", proceso)
+                df = pd.DataFrame([values], columns=header)
+                try:
+                    generate(proceso, df)
+                    accepted = True
+                except ValueError:
+                    accepted = False
+                assert accepted == (not report["missing"]), f"Preflight {proceso} {header}: faltantes={report['missing']} pero generador {'acepta' if accepted else 'rechaza'}"
+    finally:
+        _restore_ejecutivos_directory(original_directory)
+    print("PREFLIGHT_GENERATORS_OK")
+
+
 def validate_massive_dedupe() -> None:
     ivr = build_ivr_output(
         pd.DataFrame(
@@ -104,11 +181,8 @@ def validate_massive_dedupe() -> None:
 def validate_mail_itau() -> None:
     from services import mail_templates
 
-    original_fetch = mail_templates.ejecutivos_repo.fetch_by_mandante_and_nombre
-    original_list = mail_templates.ejecutivos_repo.list_ejecutivos
+    original_directory = _patch_ejecutivos_directory()
     try:
-        mail_templates.ejecutivos_repo.fetch_by_mandante_and_nombre = lambda mandante, nombre: _fake_ejecutivo(nombre)
-        mail_templates.ejecutivos_repo.list_ejecutivos = lambda mandante=None, activos=True: [_fake_ejecutivo()]
         df = pd.DataFrame(
             {
                 "Oper": ["2046954", "2046955"],
@@ -122,8 +196,7 @@ def validate_mail_itau() -> None:
         )
         output = build_mail_template(df, "ITAU_VENCIDA_MAIL", mandante="Itau Vencida")
     finally:
-        mail_templates.ejecutivos_repo.fetch_by_mandante_and_nombre = original_fetch
-        mail_templates.ejecutivos_repo.list_ejecutivos = original_list
+        _restore_ejecutivos_directory(original_directory)
 
     assert not output.empty, "Mail Itau no genero filas"
     assert list(output.columns) == TEMPLATE_COLUMNS_ITAU_VENCIDA, "Mail Itau columnas inesperadas"
@@ -326,6 +399,27 @@ def validate_crm_dedupe() -> None:
     assert len(crm_sms) == 1, "CRM SMS/IVR debe deduplicar por RUT"
     assert crm_sms.loc[0, "NRO_DOCUMENTO"] == "OP1", "CRM SMS/IVR no conservo la primera fila"
 
+    por_usuario = dict(
+        iter_crm_outputs_by_group(
+            pd.DataFrame(
+                {
+                    "RUT": ["11111111-1", "11111111-1", "11111111-1", "22222222-2"],
+                    "OP": ["OP1", "OP2", "OP3", "OP4"],
+                    "FONO": ["912345678", "923456789", "934567890", "945678901"],
+                }
+            ),
+            [1, 0, 1, -1],
+            ["ana", "beto"],
+            fecha=date(2026, 6, 22),
+            hora_inicio="10:00",
+            hora_fin="11:00",
+            observacion="SMS CRM",
+        )
+    )
+    assert por_usuario[0]["NRO_DOCUMENTO"].tolist() == ["OP2"], "CRM por usuario debe deduplicar RUT dentro de cada usuario"
+    assert por_usuario[1]["NRO_DOCUMENTO"].tolist() == ["OP1"], "CRM por usuario no conservo la primera fila del usuario"
+    assert por_usuario[1].loc[0, "USUARIO"] == "beto", "CRM por usuario no asigna el usuario del grupo"
+
     crm_mail = build_mail_crm_output(
         pd.DataFrame(
             {
@@ -581,13 +675,11 @@ def validate_sc_telefonia_mail() -> None:
 
 def validate_santander_consumer() -> None:
     from services import santander_consumer_service as sc_service
-    from services import santander_consumer_assignments as sc_assignments
     from services import santander_consumer_sources as sc_sources
 
     original_bench = sc_sources.fetch_tmp_bench_rows
     original_emails = sc_sources.fetch_emails_by_rut
-    original_fetch = sc_assignments.ejecutivos_repo.fetch_by_mandante_and_nombre
-    original_list = sc_assignments.ejecutivos_repo.list_ejecutivos
+    original_directory = _patch_ejecutivos_directory()
     try:
         sc_sources.fetch_tmp_bench_rows = lambda operaciones: {
             "123456": {
@@ -631,8 +723,6 @@ def validate_santander_consumer() -> None:
             }
         }
         sc_sources.fetch_emails_by_rut = lambda ruts: {"111111111": "cliente.sc@example.com", "222222222": "CLIENTE.SC@EXAMPLE.COM"}
-        sc_assignments.ejecutivos_repo.fetch_by_mandante_and_nombre = lambda mandante, nombre: _fake_ejecutivo(nombre)
-        sc_assignments.ejecutivos_repo.list_ejecutivos = lambda mandante=None, activos=True: [_fake_ejecutivo()]
         output = build_santander_consumer_terreno_output(
             pd.DataFrame({"OPERACION": ["123456"]}),
             template_key="vigente",
@@ -654,8 +744,7 @@ def validate_santander_consumer() -> None:
     finally:
         sc_sources.fetch_tmp_bench_rows = original_bench
         sc_sources.fetch_emails_by_rut = original_emails
-        sc_assignments.ejecutivos_repo.fetch_by_mandante_and_nombre = original_fetch
-        sc_assignments.ejecutivos_repo.list_ejecutivos = original_list
+        _restore_ejecutivos_directory(original_directory)
 
     assert list(output.columns) == OUTPUT_COLUMNS, "Santander Consumer columnas inesperadas"
     assert output.loc[0, "ENCONTRADO_DB"] == "SI", "Santander Consumer no marco encontrado"
@@ -725,6 +814,8 @@ def validate_santander_hipotecario() -> None:
 
 def main() -> None:
     validate_sms_itau()
+    validate_sms_itau_phone_fallback()
+    validate_preflight_matches_generators()
     validate_massive_dedupe()
     validate_mail_itau()
     validate_mail_template_dedupe()
@@ -58,11 +58,11 @@ def main() -> None:
     assert paths.DATA_DIR.exists(), "No existe data/"
     assert paths.PROJECT_ROOT.exists(), "No existe PROJECT_ROOT"
 
-    assert mail_templates.MAIL_TEMPLATE_OPTIONS, "Sin opciones Mail"
+    assert mail_templates.mail_template_options(), "Sin opciones Mail"
     assert len(mail_templates._load_itau_seed_rows()) > 0, "Sin semillas Mail Itau"
     assert gm_mail_templates.list_gm_mail_templates(), "Sin templates GM Mail"
     assert sc_telefonia_mail_templates.list_sc_telefonia_mail_templates(), "Sin templates SC Telefonia Mail"
-    assert santander_consumer_templates.SANTANDER_CONSUMER_TEMPLATES, "Sin templates Santander Consumer"
+    assert santander_consumer_templates.list_santander_consumer_templates(), "Sin templates Santander Consumer"
 
     sms_config = sms_itau_vencida.load_itau_sms_config()
     assert sms_config and sms_config.get("templates"), "Sin config SMS Itau"
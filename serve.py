@@ -0,0 +1,136 @@
+# serve.py
+"""
+Servidor de produccion.
+
+En Linux usa gunicorn con la app precargada: pandas/openpyxl, plantillas y el
+directorio de ejecutivos se cargan una vez en el proceso maestro y los workers
+(forkeados) comparten esas paginas copy-on-write. En Windows no hay fork y se
+usa waitress con un proceso multihilo. ``python app.py`` queda solo para desarrollo.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import os
+
+from app import app
+from frontend import FRONTEND_DIST, precompress_dist
+from services import campo1_catalog, crm_schedule, ejecutivos_directory, template_registry
+from utils.db_resultantes import reset_resultantes_pool
+from utils.db_sqlserver import reset_stc_pool
+
+logger = logging.getLogger("serve")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _default_backend() -> str:
+    return os.getenv("SERVE_BACKEND") or ("waitress" if os.name == "nt" else "gunicorn")
+
+
+def warm_up() -> None:
+    """Precarga el estado de modulo que comparten los workers y cierra conexiones antes de forkear."""
+    versions = template_registry.versions()
+    campo1_catalog.list_choices()
+    crm_schedule._time_labels()
+    mandantes = ejecutivos_directory.warm_up()
+    if FRONTEND_DIST.exists():
+        # Variantes .gz/.br del build actual, por si se compilo con npm sin pasar por Python.
+        precompress_dist()
+    # Un socket abierto no puede compartirse entre procesos: cada worker abre su propio pool.
+    reset_stc_pool()
+    reset_resultantes_pool()
+    logger.info("Precarga lista: %s plantillas, directorio de ejecutivos para %s mandantes", len(versions), len(mandantes))
+
+
+def _max_upload_bytes() -> int:
+    return _env_int("SERVE_MAX_UPLOAD_MB", 1024) * 1024 * 1024
+
+
+def _run_gunicorn(args: argparse.Namespace) -> None:
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError as exc:
+        raise SystemExit("gunicorn no esta instalado (pip install -r requirements.txt) o usa --backend waitress.") from exc
+
+    options = {
+        "bind": f"{args.host}:{args.port}",
+        "workers": args.workers,
+        "threads": args.threads,
+        "worker_class": "gthread",
+        "preload_app": True,
+        "timeout": args.timeout,
+        "graceful_timeout": _env_int("SERVE_GRACEFUL_TIMEOUT", 120),
+        "keepalive": _env_int("SERVE_KEEPALIVE", 5),
+        "max_requests": _env_int("SERVE_MAX_REQUESTS", 0),
+        "max_requests_jitter": _env_int("SERVE_MAX_REQUESTS_JITTER", 0),
+        "accesslog": os.getenv("SERVE_ACCESS_LOG", "-"),
+        "errorlog": "-",
+    }
+
+    class _Server(BaseApplication):
+        def load_config(self) -> None:
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return app
+
+    # Los objetos precargados no se mueven mas; asi el GC no los toca y no se copian sus paginas en cada worker.
+    gc.freeze()
+    _Server().run()
+
+
+def _run_waitress(args: argparse.Namespace) -> None:
+    try:
+        from waitress import serve
+    except ImportError as exc:
+        raise SystemExit("waitress no esta instalado (pip install -r requirements.txt).") from exc
+
+    if args.workers > 1:
+        logger.info("waitress usa un solo proceso; se ignoran %s workers y se sirven %s hilos", args.workers, args.threads)
+    serve(
+        app,
+        host=args.host,
+        port=args.port,
+        threads=args.threads,
+        channel_timeout=args.timeout,
+        max_request_body_size=_max_upload_bytes(),
+        connection_limit=_env_int("SERVE_CONNECTION_LIMIT", 200),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servidor de produccion de Formato_SMS.")
+    parser.add_argument("--backend", choices=["gunicorn", "waitress"], default=_default_backend())
+    parser.add_argument("--host", default=os.getenv("SERVE_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=_env_int("SERVE_PORT", 5013))
+    parser.add_argument("--workers", type=int, default=_env_int("SERVE_WORKERS", 2))
+    parser.add_argument("--threads", type=int, default=_env_int("SERVE_THREADS", 8))
+    parser.add_argument("--timeout", type=int, default=_env_int("SERVE_TIMEOUT", 600), help="Segundos por request (subidas y generaciones largas).")
+    parser.add_argument("--no-warmup", action="store_true", help="No precargar plantillas ni directorio de ejecutivos.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    # Flask responde 413 sobre este limite con cualquier backend (gunicorn no limita el cuerpo).
+    app.config["MAX_CONTENT_LENGTH"] = _max_upload_bytes()
+    if not args.no_warmup:
+        warm_up()
+    logger.info(
+        "Sirviendo con %s en %s:%s (workers=%s, hilos=%s, timeout=%ss)",
+        args.backend, args.host, args.port, args.workers, args.threads, args.timeout,
+    )
+    if args.backend == "gunicorn":
+        _run_gunicorn(args)
+    else:
+        _run_waitress(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from utils.file_lock import file_lock
+from utils.paths import storage_path
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"^[0-9a-f]{32}$")
+
+_JANITOR_LOCK = threading.Lock()
+_JANITOR: Optional[threading.Thread] = None
+
+
+@dataclass(frozen=True)
+class ArtifactFile:
+    path: str
+    download_name: str
+    mimetype: str
+    size: int = 0
+
+
+@dataclass
+class Artifact:
+    token: str
+    namespace: str
+    created_at: float
+    files: dict[str, ArtifactFile] = field(default_factory=dict)
+
+    @property
+    def directory(self) -> Path:
+        return _artifact_dir(self.token)
+
+
+def registry_dir() -> Path:
+    return storage_path("artifacts")
+
+
+def ttl_seconds() -> float:
+    return float(os.getenv("ARTIFACT_TTL_MINUTES", "240")) * 60
+
+
+def _max_bytes() -> int:
+    return int(float(os.getenv("ARTIFACT_MAX_MB", "1024")) * 1024 * 1024)
+
+
+def _artifact_dir(token: str) -> Path:
+    return registry_dir() / token
+
+
+def _meta_path(token: str) -> Path:
+    return registry_dir() / f"{token}.json"
+
+
+def _lock_path() -> Path:
+    return registry_dir() / ".lock"
+
+
+def _drop(token: str) -> None:
+    try:
+        _meta_path(token).unlink(missing_ok=True)
+    except OSError as exc:
+        logger.debug("No se pudo eliminar metadata de artefacto %s: %s", token, exc)
+    shutil.rmtree(_artifact_dir(token), ignore_errors=True)
+
+
+def _read(token: str) -> Optional[Artifact]:
+    try:
+        raw = json.loads(_meta_path(token).read_text(encoding="utf-8"))
+        files = {key: ArtifactFile(**value) for key, value in (raw.get("files") or {}).items()}
+        return Artifact(token=raw["token"], namespace=raw["namespace"], created_at=raw["created_at"], files=files)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def reserve(namespace: str) -> Artifact:
+    """Crea la carpeta donde el proceso escribe sus salidas antes de publicarlas."""
+    artifact = Artifact(token=uuid.uuid4().hex, namespace=namespace, created_at=time.time())
+    artifact.directory.mkdir(parents=True, exist_ok=True)
+    return artifact
+
+
+def publish(artifact: Artifact, files: dict[str, tuple[str, str, str]]) -> Artifact:
+    """Registra las salidas ``{clave: (ruta, nombre_descarga, mimetype)}`` y aplica TTL/cuota."""
+    for key, (path, download_name, mimetype) in files.items():
+        size = Path(path).stat().st_size
+        artifact.files[key] = ArtifactFile(path=str(path), download_name=download_name, mimetype=mimetype, size=size)
+    payload = json.dumps(
+        {
+            "token": artifact.token,
+            "namespace": artifact.namespace,
+            "created_at": artifact.created_at,
+            "files": {key: asdict(item) for key, item in artifact.files.items()},
+        },
+        ensure_ascii=False,
+    )
+    meta_path = _meta_path(artifact.token)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{meta_path.name}.", suffix=".tmp", dir=str(meta_path.parent))
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        handle.write(payload)
+    os.replace(tmp_name, meta_path)
+    prune(keep=artifact.token)
+    return artifact
+
+
+def discard(artifact: Artifact) -> None:
+    with file_lock(_lock_path()):
+        _drop(artifact.token)
+
+
+def resolve(token: str, key: str, namespace: Optional[str] = None) -> Optional[ArtifactFile]:
+    if not _TOKEN_RE.match(token or ""):
+        return None
+    artifact = _read(token)
+    if artifact is None or (namespace and artifact.namespace != namespace):
+        return None
+    if time.time() - artifact.created_at > ttl_seconds():
+        return None
+    item = artifact.files.get(key)
+    if item is None or not Path(item.path).exists():
+        return None
+    return item
+
+
+def prune(keep: Optional[str] = None) -> None:
+    """Elimina artefactos vencidos, carpetas huerfanas y los mas antiguos sobre la cuota total."""
+    directory = registry_dir()
+    if not directory.exists():
+        return
+    now = time.time()
+    ttl = ttl_seconds()
+    with file_lock(_lock_path()):
+        alive: list[tuple[float, int, str]] = []
+        known: set[str] = set()
+        for meta_path in directory.glob("*.json"):
+            token = meta_path.stem
+            known.add(token)
+            artifact = _read(token)
+            if artifact is None or now - artifact.created_at > ttl:
+                _drop(token)
+                continue
+            alive.append((artifact.created_at, sum(item.size for item in artifact.files.values()), token))
+
+        # Carpetas reservadas que nunca se publicaron (proceso caido a mitad).
+        for path in directory.iterdir():
+            if path.is_dir() and path.name not in known and path.name != keep:
+                try:
+                    age = now - path.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+                if age > ttl:
+                    shutil.rmtree(path, ignore_errors=True)
+
+        total = sum(size for _, size, _ in alive)
+        limit = _max_bytes()
+        for _, size, token in sorted(alive):
+            if total <= limit:
+                break
+            if token == keep:
+                continue
+            _drop(token)
+            total -= size
+
+
+def _janitor_loop(interval: float) -> None:
+    while True:
+        time.sleep(interval)
+        try:
+            prune()
+        except Exception as exc:  # pragma: no cover - el janitor no debe morir
+            logger.warning("Fallo limpieza de artefactos: %s", exc)
+
+
+def start_janitor(interval: Optional[float] = None) -> None:
+    """Inicia (una vez por proceso) el hilo que limpia artefactos vencidos."""
+    global _JANITOR
+    with _JANITOR_LOCK:
+        if _JANITOR is not None and _JANITOR.is_alive():
+            return
+        seconds = interval if interval is not None else float(os.getenv("ARTIFACT_JANITOR_INTERVAL", "300"))
+        _JANITOR = threading.Thread(target=_janitor_loop, args=(seconds,), name="artifact-janitor", daemon=True)
+        _JANITOR.start()
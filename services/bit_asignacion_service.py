@@ -2,12 +2,12 @@ from __future__ import annotations
 
 from datetime import datetime
 import io
-import re
-import unicodedata
 
 import chardet
 import pandas as pd
 
+from services.column_resolver import AliasTable, alnum_key
+
 
 CRM_COLUMNS = [
     "Nro_Documento", "RUT - DV", "NOMBRE", "AD1", "NombreProducto", "AD2", "AD3", "AD4", "AD5", "AD6", "AD7",
@@ -35,13 +35,6 @@ ADICIONAL_COLUMNS = [
 ]
 
 
-def _normalize_key(value: str) -> str:
-    text = unicodedata.normalize("NFKD", str(value or ""))
-    text = text.encode("ascii", "ignore").decode("ascii")
-    text = text.lower().strip().replace(" ", "").replace("_", "")
-    return re.sub(r"[^a-z0-9]", "", text)
-
-
 def _detect_encoding(file_bytes: bytes) -> str:
     detected = chardet.detect(file_bytes)
     return str(detected.get("encoding") or "utf-8")
@@ -81,15 +74,6 @@ def _read_bit_csv(file_storage) -> pd.DataFrame:
     return df
 
 
-def _find_col(df: pd.DataFrame, aliases: set[str]) -> str | None:
-    idx = {_normalize_key(c): c for c in df.columns}
-    for alias in aliases:
-        key = _normalize_key(alias)
-        if key in idx:
-            return idx[key]
-    return None
-
-
 def _text_series(df: pd.DataFrame, col: str | None) -> pd.Series:
     if not col or col not in df.columns:
         return pd.Series([" "] * len(df), index=df.index, dtype=object)
@@ -133,38 +117,82 @@ def _clean_dataframe_text(df: pd.DataFrame) -> pd.DataFrame:
     return out
 
 
+BIT_COLUMNS = AliasTable(
+    {
+        "NRO_OPERACION": {"NRO_OPERACION"},
+        "RUT": {"RUT"},
+        "DV": {"DV"},
+        "NOMBRE": {"NOMBRE_CLIENTE"},
+        "FECHA_CURSE": {"FECHA_CURSE"},
+        "GRUPO_PRODUCTO": {"GRUPO_PRODUCTO"},
+        "CUOTAS_MOROSAS": {"CUOTAS_MOROSAS"},
+        "NRO_TOTAL_CUOTAS": {"NRO_TOTAL_CUOTAS"},
+        "FE_VTO": {"FE_VTO_CUOTA"},
+        "MTO_CUOTA": {"MTO_CUOTA"},
+        "NOMBRE_EJE": {"NOMBRE_EJE_COMER"},
+        "FEC_MORA": {"FEC_MORA"},
+        "DEUDA_TOTAL": {"DEUDA_TOTAL"},
+        "CORREO_EJE": {"CORREO_EJE_COMER"},
+        "FONO_EJE": {"TELEFONO_EJE_NORM"},
+        "CAMPANA": {"CAMPANA"},
+        "MONTO_MORA_TOTAL": {"MONTO_MORA_TOTAL"},
+        "DIR_PART": {"DIR_PARTICULAR"},
+        "COMUNA": {"COMUNA"},
+        "CIUDAD": {"CIUDAD"},
+        "DIR_COM": {"DIR_COMERCIAL"},
+        "COMUNA_COM": {"COMUNA_COMERCIAL"},
+        "CIUDAD_COM": {"CIUDAD_COMERCIAL"},
+        "MAIL": {"MAIL"},
+        "FONO1": {"TELEFONO1"},
+        "FONO2": {"TELEFONO2"},
+        "FONO3": {"TELEFONO3"},
+        "CARTERA": {"CARTERA"},
+        "PRODUCTO": {"PRODUCTO"},
+        "PORC_DCTO_PUT": {"PORC_DCTO_PUT"},
+        "PORC_DCTO_AP": {"PORC_DCTO_AP"},
+        "PORC_ABONO_EXIGIDO_RENE": {"PORC_ABONO_EXIGIDO_RENE"},
+        "PORC_ABONO_EXIGIDO_AP": {"PORC_ABONO_EXIGIDO_AP"},
+        "FECHA_TOPE_OFERTA": {"FECHA_TOPE_OFERTA"},
+        "DSCTO_GTOS_COBRANZAS": {"DSCTO_GTOS_COBRANZAS"},
+        "MTO_TRANSFERIR": {"MTO_TRANSFERIR"},
+    },
+    normalize=alnum_key,
+)
+
+
 def build_bit_outputs(file_storage, campana_nueva: bool) -> list[tuple[str, pd.DataFrame]]:
     df = _read_bit_csv(file_storage)
 
-    nro_operacion = _find_col(df, {"NRO_OPERACION"})
-    rut = _find_col(df, {"RUT"})
-    dv = _find_col(df, {"DV"})
-    nombre = _find_col(df, {"NOMBRE_CLIENTE"})
-    fecha_curse = _find_col(df, {"FECHA_CURSE"})
-    grupo_producto = _find_col(df, {"GRUPO_PRODUCTO"})
-    cuotas_morosas = _find_col(df, {"CUOTAS_MOROSAS"})
-    nro_total_cuotas = _find_col(df, {"NRO_TOTAL_CUOTAS"})
-    fe_vto = _find_col(df, {"FE_VTO_CUOTA"})
-    mto_cuota = _find_col(df, {"MTO_CUOTA"})
-    nombre_eje = _find_col(df, {"NOMBRE_EJE_COMER"})
-    fec_mora = _find_col(df, {"FEC_MORA"})
-    deuda_total = _find_col(df, {"DEUDA_TOTAL"})
-    correo_eje = _find_col(df, {"CORREO_EJE_COMER"})
-    fono_eje = _find_col(df, {"TELEFONO_EJE_NORM"})
-    campana = _find_col(df, {"CAMPANA"})
-    monto_mora_total = _find_col(df, {"MONTO_MORA_TOTAL"})
-    dir_part = _find_col(df, {"DIR_PARTICULAR"})
-    comuna = _find_col(df, {"COMUNA"})
-    ciudad = _find_col(df, {"CIUDAD"})
-    dir_com = _find_col(df, {"DIR_COMERCIAL"})
-    comuna_com = _find_col(df, {"COMUNA_COMERCIAL"})
-    ciudad_com = _find_col(df, {"CIUDAD_COMERCIAL"})
-    mail = _find_col(df, {"MAIL"})
-    fono1 = _find_col(df, {"TELEFONO1"})
-    fono2 = _find_col(df, {"TELEFONO2"})
-    fono3 = _find_col(df, {"TELEFONO3"})
-    cartera = _find_col(df, {"CARTERA"})
-    producto = _find_col(df, {"PRODUCTO"})
+    cols = BIT_COLUMNS.resolve(df)
+    nro_operacion = cols["NRO_OPERACION"]
+    rut = cols["RUT"]
+    dv = cols["DV"]
+    nombre = cols["NOMBRE"]
+    fecha_curse = cols["FECHA_CURSE"]
+    grupo_producto = cols["GRUPO_PRODUCTO"]
+    cuotas_morosas = cols["CUOTAS_MOROSAS"]
+    nro_total_cuotas = cols["NRO_TOTAL_CUOTAS"]
+    fe_vto = cols["FE_VTO"]
+    mto_cuota = cols["MTO_CUOTA"]
+    nombre_eje = cols["NOMBRE_EJE"]
+    fec_mora = cols["FEC_MORA"]
+    deuda_total = cols["DEUDA_TOTAL"]
+    correo_eje = cols["CORREO_EJE"]
+    fono_eje = cols["FONO_EJE"]
+    campana = cols["CAMPANA"]
+    monto_mora_total = cols["MONTO_MORA_TOTAL"]
+    dir_part = cols["DIR_PART"]
+    comuna = cols["COMUNA"]
+    ciudad = cols["CIUDAD"]
+    dir_com = cols["DIR_COM"]
+    comuna_com = cols["COMUNA_COM"]
+    ciudad_com = cols["CIUDAD_COM"]
+    mail = cols["MAIL"]
+    fono1 = cols["FONO1"]
+    fono2 = cols["FONO2"]
+    fono3 = cols["FONO3"]
+    cartera = cols["CARTERA"]
+    producto = cols["PRODUCTO"]
 
     if not all([nro_operacion, rut, dv, nombre, mail]):
         raise ValueError("El CSV BIT no contiene las columnas mínimas requeridas (NRO_OPERACION, RUT, DV, NOMBRE_CLIENTE, MAIL).")
@@ -204,14 +232,14 @@ def build_bit_outputs(file_storage, campana_nueva: bool) -> list[tuple[str, pd.D
 
     adicional = pd.DataFrame({c: " " for c in ADICIONAL_COLUMNS}, index=df.index)
     adicional["rut"] = _text_series(df, rut).str.strip().str.cat(_text_series(df, dv).str.strip(), sep="-", na_rep=" ")
-    adicional["PORC_DCTO_PUT"] = _text_series(df, _find_col(df, {"PORC_DCTO_PUT"}))
-    adicional["PORC_DCTO_AP"] = _text_series(df, _find_col(df, {"PORC_DCTO_AP"}))
-    adicional["PORC_ABONO_EXIGIDO_RENE"] = _text_series(df, _find_col(df, {"PORC_ABONO_EXIGIDO_RENE"}))
-    adicional["PORC_ABONO_EXIGIDO_AP"] = _text_series(df, _find_col(df, {"PORC_ABONO_EXIGIDO_AP"}))
-    adicional["FECHA_TOPE_OFERTA"] = _text_series(df, _find_col(df, {"FECHA_TOPE_OFERTA"}))
+    adicional["PORC_DCTO_PUT"] = _text_series(df, cols["PORC_DCTO_PUT"])
+    adicional["PORC_DCTO_AP"] = _text_series(df, cols["PORC_DCTO_AP"])
+    adicional["PORC_ABONO_EXIGIDO_RENE"] = _text_series(df, cols["PORC_ABONO_EXIGIDO_RENE"])
+    adicional["PORC_ABONO_EXIGIDO_AP"] = _text_series(df, cols["PORC_ABONO_EXIGIDO_AP"])
+    adicional["FECHA_TOPE_OFERTA"] = _text_series(df, cols["FECHA_TOPE_OFERTA"])
     adicional["Campana"] = _text_series(df, campana)
-    adicional["DSCTO_GTOS_COBRANZAS"] = _text_series(df, _find_col(df, {"DSCTO_GTOS_COBRANZAS"}))
-    adicional["MTO_TRANSFERIR"] = _text_series(df, _find_col(df, {"MTO_TRANSFERIR"}))
+    adicional["DSCTO_GTOS_COBRANZAS"] = _text_series(df, cols["DSCTO_GTOS_COBRANZAS"])
+    adicional["MTO_TRANSFERIR"] = _text_series(df, cols["MTO_TRANSFERIR"])
     adicional = _clean_dataframe_text(adicional)
 
     now = datetime.now()
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import json
+import os
+import tempfile
 import threading
+from pathlib import Path
 from typing import Any
 
-from utils.paths import data_path
+from utils.file_lock import file_lock
+from utils.paths import data_path, storage_path
 
 
 DEFAULT_CAMPO1_ITEMS = [
@@ -24,6 +28,12 @@ DEFAULT_CAMPO1_ITEMS = [
 
 _CATALOG_PATH = data_path("campo1_catalog.json")
 _LOCK = threading.Lock()
+# Ultima lectura del catalogo: ((mtime_ns, tamano), items). Se revalida contra el archivo en cada acceso.
+_CACHE: tuple[tuple[int, int], tuple[dict[str, Any], ...]] | None = None
+
+
+def _lock_path() -> Path:
+    return storage_path("locks", "campo1_catalog.lock")
 
 
 def _clean_text(value: str) -> str:
@@ -34,26 +44,54 @@ def _next_id(items: list[dict[str, Any]]) -> int:
     return max((int(item.get("id") or 0) for item in items), default=0) + 1
 
 
+def _signature() -> tuple[int, int] | None:
+    try:
+        stat = _CATALOG_PATH.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _write_catalog(items: list[dict[str, Any]]) -> None:
+    """Escritura atomica; debe llamarse con file_lock(_lock_path()) tomado."""
+    global _CACHE
+    _CATALOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    payload = json.dumps(items, ensure_ascii=True, indent=2)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{_CATALOG_PATH.name}.", suffix=".tmp", dir=str(_CATALOG_PATH.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(payload)
+        os.replace(tmp_name, _CATALOG_PATH)
+    finally:
+        tmp_path = Path(tmp_name)
+        if tmp_path.exists():
+            tmp_path.unlink()
+    signature = _signature()
+    with _LOCK:
+        _CACHE = (signature, tuple(dict(item) for item in items)) if signature else None
+
+
 def _bootstrap_catalog() -> None:
     if _CATALOG_PATH.exists():
         return
-    _CATALOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    items = []
-    for idx, row in enumerate(DEFAULT_CAMPO1_ITEMS, start=1):
-        items.append(
-            {
-                "id": idx,
-                "label": row["label"],
-                "value": row["value"],
-                "active": bool(row.get("active", True)),
-            }
+    with file_lock(_lock_path()):
+        if _CATALOG_PATH.exists():
+            return
+        _write_catalog(
+            [
+                {
+                    "id": idx,
+                    "label": row["label"],
+                    "value": row["value"],
+                    "active": bool(row.get("active", True)),
+                }
+                for idx, row in enumerate(DEFAULT_CAMPO1_ITEMS, start=1)
+            ]
         )
-    _CATALOG_PATH.write_text(json.dumps(items, ensure_ascii=True, indent=2), encoding="utf-8")
 
 
-def _read_catalog() -> list[dict[str, Any]]:
-    _bootstrap_catalog()
-    raw = json.loads(_CATALOG_PATH.read_text(encoding="utf-8") or "[]")
+def _parse_catalog(text: str) -> list[dict[str, Any]]:
+    raw = json.loads(text or "[]")
     items: list[dict[str, Any]] = []
     for row in raw if isinstance(raw, list) else []:
         label = _clean_text(str(row.get("label") or ""))
@@ -72,21 +110,31 @@ def _read_catalog() -> list[dict[str, Any]]:
     return items
 
 
-def _write_catalog(items: list[dict[str, Any]]) -> None:
-    _CATALOG_PATH.write_text(json.dumps(items, ensure_ascii=True, indent=2), encoding="utf-8")
+def _cached_catalog() -> tuple[dict[str, Any], ...]:
+    """Catalogo compartido (no modificar); se vuelve a leer solo si cambia mtime o tamano del archivo."""
+    global _CACHE
+    _bootstrap_catalog()
+    signature = _signature()
+    with _LOCK:
+        if _CACHE and _CACHE[0] == signature:
+            return _CACHE[1]
+        items = tuple(_parse_catalog(_CATALOG_PATH.read_text(encoding="utf-8")))
+        _CACHE = (signature, items) if signature else None
+        return items
+
+
+def _read_catalog() -> list[dict[str, Any]]:
+    """Copia editable leida directo del archivo; para escrituras bajo file_lock."""
+    _bootstrap_catalog()
+    return _parse_catalog(_CATALOG_PATH.read_text(encoding="utf-8"))
 
 
 def list_items(*, active_only: bool = False) -> list[dict[str, Any]]:
-    with _LOCK:
-        items = _read_catalog()
-    if active_only:
-        return [item for item in items if item["active"]]
-    return items
+    return [dict(item) for item in _cached_catalog() if item["active"] or not active_only]
 
 
 def list_choices(*, active_only: bool = True) -> list[tuple[str, str]]:
-    items = list_items(active_only=active_only)
-    return [(item["label"], item["value"]) for item in items]
+    return [(item["label"], item["value"]) for item in _cached_catalog() if item["active"] or not active_only]
 
 
 def create_item(*, label: str, value: str, active: bool = True) -> dict[str, Any]:
@@ -95,7 +143,7 @@ def create_item(*, label: str, value: str, active: bool = True) -> dict[str, Any
     if not clean_label or not clean_value:
         raise ValueError("Label y value son obligatorios.")
 
-    with _LOCK:
+    with file_lock(_lock_path()):
         items = _read_catalog()
         if any(item["label"].lower() == clean_label.lower() for item in items):
             raise ValueError("Ya existe un CAMPO1 con ese label.")
@@ -111,7 +159,7 @@ def create_item(*, label: str, value: str, active: bool = True) -> dict[str, Any
 
 
 def update_item(item_id: int, *, label: str | None = None, value: str | None = None, active: bool | None = None) -> dict[str, Any]:
-    with _LOCK:
+    with file_lock(_lock_path()):
         items = _read_catalog()
         target = next((item for item in items if item["id"] == item_id), None)
         if not target:
@@ -140,7 +188,7 @@ def update_item(item_id: int, *, label: str | None = None, value: str | None = N
 
 
 def delete_item(item_id: int) -> None:
-    with _LOCK:
+    with file_lock(_lock_path()):
         items = _read_catalog()
         next_items = [item for item in items if item["id"] != item_id]
         if len(next_items) == len(items):
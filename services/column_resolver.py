@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Iterable, Mapping, Optional, Sequence
+
+import pandas as pd
+
+from services.constants import COLUMN_MAP
+
+Normalizer = Callable[[object], str]
+Columns = pd.DataFrame | pd.Index | Sequence[object]
+
+
+def compact_key(value: object) -> str:
+    """Minusculas sin espacios, '_' ni '-' (la forma usada por SMS, reglas y plantillas)."""
+    return str(value if value is not None else "").strip().lower().replace(" ", "").replace("_", "").replace("-", "")
+
+
+def folded_key(value: object) -> str:
+    """Como compact_key pero ademas sin tildes."""
+    text = unicodedata.normalize("NFKD", str(value if value is not None else ""))
+    return compact_key(text.encode("ascii", "ignore").decode("ascii"))
+
+
+def alnum_key(value: object) -> str:
+    """Solo letras y numeros ASCII (cargas BIT, Tanner y Porsche)."""
+    text = unicodedata.normalize("NFKD", str(value if value is not None else ""))
+    return re.sub(r"[^a-z0-9]", "", text.encode("ascii", "ignore").decode("ascii").lower())
+
+
+def plain_key(value: object) -> str:
+    """Minusculas sin espacios laterales (IVR y CRM Mail comparan el nombre casi literal)."""
+    return str(value if value is not None else "").lower().strip()
+
+
+def _column_labels(columns: Columns) -> tuple:
+    if isinstance(columns, pd.DataFrame):
+        return tuple(columns.columns)
+    return tuple(columns)
+
+
+@dataclass(frozen=True, eq=False)
+class AliasTable:
+    """
+    Tabla de alias compilada una vez: campo logico -> nombres aceptados.
+
+    Al resolver, cada campo toma la primera columna del archivo (en orden) cuyo nombre
+    normalizado calza con alguno de sus alias. El resultado se cachea por tupla de columnas.
+    """
+
+    fields: Mapping[str, Iterable[str]]
+    normalize: Normalizer = compact_key
+    exclude: Mapping[str, Iterable[str]] = field(default_factory=dict)
+    _lookup: dict[str, tuple[str, ...]] = field(init=False, repr=False)
+    _exclude: dict[str, tuple[str, ...]] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        lookup: dict[str, list[str]] = {}
+        for logical, aliases in self.fields.items():
+            for alias in aliases:
+                targets = lookup.setdefault(self.normalize(alias), [])
+                if logical not in targets:
+                    targets.append(logical)
+        object.__setattr__(self, "fields", {logical: tuple(aliases) for logical, aliases in self.fields.items()})
+        object.__setattr__(self, "_lookup", {key: tuple(value) for key, value in lookup.items()})
+        object.__setattr__(
+            self,
+            "_exclude",
+            {logical: tuple(self.normalize(word) for word in words) for logical, words in self.exclude.items()},
+        )
+
+    def aliases(self, *logicals: str) -> set[str]:
+        names: set[str] = set()
+        for logical in logicals or tuple(self.fields):
+            names.update(self.fields.get(logical, ()))
+        return names
+
+    def resolve(self, columns: Columns) -> dict[str, Optional[str]]:
+        return dict(_resolve(self, _column_labels(columns)))
+
+    def column(self, columns: Columns, logical: str) -> Optional[str]:
+        return _resolve(self, _column_labels(columns)).get(logical)
+
+    def require(self, columns: Columns, logicals: Iterable[str], message: str) -> dict[str, Optional[str]]:
+        """Resuelve todo y, si falta alguno de ``logicals``, los informa juntos en un solo error."""
+        resolved = self.resolve(columns)
+        missing = [logical for logical in logicals if resolved.get(logical) is None]
+        if missing:
+            raise ValueError(message + ", ".join(missing))
+        return resolved
+
+
+@lru_cache(maxsize=512)
+def _resolve(table: AliasTable, labels: tuple) -> dict[str, Optional[str]]:
+    resolved: dict[str, Optional[str]] = dict.fromkeys(table.fields)
+    for label in labels:
+        key = table.normalize(label)
+        for logical in table._lookup.get(key, ()):
+            if resolved[logical] is not None:
+                continue
+            if any(word in key for word in table._exclude.get(logical, ())):
+                continue
+            resolved[logical] = label
+    return resolved
+
+
+@lru_cache(maxsize=256)
+def _adhoc_table(aliases: frozenset[str], normalize: Normalizer) -> AliasTable:
+    return AliasTable({"": aliases}, normalize)
+
+
+def find_column(columns: Columns, aliases: Iterable[str], normalize: Normalizer = compact_key) -> Optional[str]:
+    """Primera columna que calza con ``aliases``; para busquedas puntuales fuera de una tabla."""
+    return _adhoc_table(frozenset(aliases), normalize).column(columns, "")
+
+
+# Alias genericos de constants.COLUMN_MAP (el nombre logico tambien cuenta como alias).
+COLUMN_MAP_TABLE = AliasTable({logical: {logical} | set(aliases) for logical, aliases in COLUMN_MAP.items()})
@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import os
 import tempfile
+import threading
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -43,12 +44,107 @@ def item_count(data: Any) -> int:
     return 0
 
 
+def _read_only(self: Any, *args: Any, **kwargs: Any) -> None:
+    raise TypeError("La configuracion leida desde cache es de solo lectura; usa thaw() para editarla.")
+
+
+class FrozenDict(dict):
+    """dict de solo lectura (sigue siendo dict para isinstance y json.dumps)."""
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict) -> dict:
+        return thaw(self)
+
+    def __reduce__(self) -> tuple:
+        return FrozenDict, (dict(self),)
+
+
+class FrozenList(list):
+    """list de solo lectura (sigue siendo list para isinstance y json.dumps)."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict) -> list:
+        return thaw(self)
+
+    def __reduce__(self) -> tuple:
+        return FrozenList, (list(self),)
+
+
+def freeze(data: Any) -> Any:
+    if isinstance(data, dict):
+        return FrozenDict((key, freeze(value)) for key, value in data.items())
+    if isinstance(data, list):
+        return FrozenList(freeze(value) for value in data)
+    return data
+
+
+def thaw(data: Any) -> Any:
+    """Copia editable (dict/list normales) de un valor devuelto por read_json."""
+    if isinstance(data, dict):
+        return {key: thaw(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [thaw(value) for value in data]
+    return data
+
+
+# Cache de lectura por ruta, validado con (mtime, tamano) del archivo en cada acceso.
+_CACHE: dict[Path, tuple[tuple[int, int], Any]] = {}
+_CACHE_LOCK = threading.Lock()
+_CACHE_STATS = {"hits": 0, "misses": 0}
+
+
+def _signature(stat: os.stat_result) -> tuple[int, int]:
+    return stat.st_mtime_ns, stat.st_size
+
+
 def read_json(filename: str, *, default: Any = None) -> Any:
+    """
+    JSON parseado de config/<filename>, o ``default`` si no existe.
+
+    El resultado se comparte entre llamadas mientras el archivo no cambie, por eso se
+    devuelve inmutable (FrozenDict/FrozenList); usa thaw() si necesitas modificarlo.
+    """
     path = _resolve_config_path(filename)
-    if not path.exists():
+    try:
+        signature = _signature(path.stat())
+    except FileNotFoundError:
         return default
+    with _CACHE_LOCK:
+        cached = _CACHE.get(path)
+        if cached and cached[0] == signature:
+            _CACHE_STATS["hits"] += 1
+            return cached[1]
+
     with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+        signature = _signature(os.fstat(handle.fileno()))
+        data = freeze(json.load(handle))
+    with _CACHE_LOCK:
+        _CACHE_STATS["misses"] += 1
+        _CACHE[path] = (signature, data)
+    return data
+
+
+def invalidate(filename: str | None = None) -> None:
+    with _CACHE_LOCK:
+        if filename is None:
+            _CACHE.clear()
+        else:
+            _CACHE.pop(_resolve_config_path(filename), None)
+
+
+def cache_stats() -> dict[str, int]:
+    with _CACHE_LOCK:
+        return {**_CACHE_STATS, "entries": len(_CACHE)}
 
 
 def status(filename: str) -> ConfigStatus:
@@ -79,6 +175,7 @@ def write_json(filename: str, data: Any, *, backup: bool = True) -> Path:
             handle.write(payload)
         os.replace(tmp_name, path)
     finally:
+        invalidate(filename)
         tmp_path = Path(tmp_name)
         if tmp_path.exists():
             tmp_path.unlink()
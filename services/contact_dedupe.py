@@ -23,3 +23,16 @@ def dedupe_by_column_keep_first_normalized(df: pd.DataFrame, column: str | None)
     if not duplicate_mask.any():
         return df
     return df.loc[~duplicate_mask].copy()
+
+
+def dedupe_by_column_within_groups(df: pd.DataFrame, column: str | None, group_column: str) -> pd.DataFrame:
+    """Como ``dedupe_by_column_keep_first`` pero cada grupo conserva su propia primera fila por clave."""
+    if not column or column not in df.columns or df.empty:
+        return df
+
+    keys = df[column].fillna("").astype(str).str.strip()
+    pairs = pd.DataFrame({"group": df[group_column].to_numpy(), "key": keys.to_numpy()})
+    duplicate_mask = keys.ne("").to_numpy() & pairs.duplicated(keep="first").to_numpy()
+    if not duplicate_mask.any():
+        return df
+    return df.loc[~duplicate_mask].copy()
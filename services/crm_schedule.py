@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+def parse_hora(value: str) -> time:
+    """Parsea hora HH:MM o HH:MM:SS."""
+    value = (value or "").strip()
+    for fmt in ("%H:%M:%S", "%H:%M"):
+        try:
+            return datetime.strptime(value, fmt).time()
+        except ValueError:
+            continue
+    raise ValueError("Formato de hora inválido (usa HH:MM o HH:MM:SS).")
+
+
+def window_seconds(hora_inicio: str, hora_fin: str) -> tuple[int, int]:
+    """Segundos del dia de inicio y fin; valida formato y que fin sea mayor."""
+    t_ini = parse_hora(hora_inicio)
+    t_fin = parse_hora(hora_fin)
+    ini = t_ini.hour * 3600 + t_ini.minute * 60 + t_ini.second
+    fin = t_fin.hour * 3600 + t_fin.minute * 60 + t_fin.second
+    if fin <= ini:
+        raise ValueError("La hora fin debe ser mayor a la hora inicio.")
+    return ini, fin
+
+
+def check_capacity(n: int, hora_inicio: str, hora_fin: str) -> None:
+    """Valida que el rango horario admita ``n`` registros con precision de segundos."""
+    ini, fin = window_seconds(hora_inicio, hora_fin)
+    rango_seg = fin - ini
+    if n > (rango_seg + 1):
+        raise ValueError(
+            f"El rango {hora_inicio}-{hora_fin} no alcanza para {n} registros. "
+            f"Con precision de segundos, la capacidad maxima es {rango_seg + 1}."
+        )
+
+
+@lru_cache(maxsize=1)
+def _time_labels() -> np.ndarray:
+    labels = [f"{h:02d}:{m:02d}:{s:02d}" for h in range(24) for m in range(60) for s in range(60)]
+    return np.array(labels, dtype=object)
+
+
+def schedule_offsets(n: int, span_seconds: int) -> np.ndarray:
+    """Offsets en segundos repartidos uniformemente en [0, span], redondeo half-even."""
+    if n <= 0:
+        return np.empty(0, dtype=np.int64)
+    if n == 1:
+        return np.zeros(1, dtype=np.int64)
+    # Mismo orden de operaciones que round((span * i) / (n - 1)) para no cambiar ningun segundo.
+    return np.round((float(span_seconds) * np.arange(n, dtype=np.float64)) / (n - 1)).astype(np.int64)
+
+
+def format_seconds(fecha: date, seconds: np.ndarray) -> np.ndarray:
+    """Formatea segundos del dia (ordenados) como 'YYYY-MM-DD HH:MM:SS'."""
+    n = len(seconds)
+    if n == 0:
+        return np.empty(0, dtype=object)
+    # Los segundos vienen ordenados: se formatea cada valor distinto una sola vez.
+    changed = np.empty(n, dtype=bool)
+    changed[0] = True
+    np.not_equal(seconds[1:], seconds[:-1], out=changed[1:])
+    prefix = fecha.strftime("%Y-%m-%d ")
+    labels = np.array([prefix + label for label in _time_labels()[seconds[changed]]], dtype=object)
+    return labels[np.cumsum(changed) - 1]
+
+
+def build_fecha_gestion(
+    n: int,
+    fecha: date,
+    hora_inicio: str,
+    hora_fin: str,
+    intervalo_segundos: int | None = None,
+    index: Optional[pd.Index] = None,
+) -> pd.Series:
+    """
+    Columna FECHA_GESTION ('YYYY-MM-DD HH:MM:SS') para n registros repartidos en
+    todo el rango [inicio, fin]. El intervalo es solo referencial para la UI.
+    """
+    ini, fin = window_seconds(hora_inicio, hora_fin)
+    if n <= 0:
+        return pd.Series([], index=index, dtype=object, name="FECHA_GESTION")
+    check_capacity(n, hora_inicio, hora_fin)
+
+    values = format_seconds(fecha, ini + schedule_offsets(n, fin - ini))
+    return pd.Series(values, index=index, dtype=object, name="FECHA_GESTION")
+
+
+def grouped_fecha_gestion(
+    groups: np.ndarray,
+    counts: np.ndarray,
+    fecha: date,
+    hora_inicio: str,
+    hora_fin: str,
+) -> np.ndarray:
+    """
+    FECHA_GESTION para filas ordenadas por grupo: cada grupo reparte sus ``counts[g]``
+    registros en todo el rango, igual que ``build_fecha_gestion`` por separado.
+    """
+    ini, fin = window_seconds(hora_inicio, hora_fin)
+    span = fin - ini
+    over = np.flatnonzero(counts > span + 1)
+    if over.size:
+        check_capacity(int(counts[over[0]]), hora_inicio, hora_fin)
+    if len(groups) == 0:
+        return np.empty(0, dtype=object)
+    starts = np.cumsum(counts) - counts
+    position = np.arange(len(groups), dtype=np.int64) - starts[groups]
+    denom = counts[groups] - 1
+    # Mismas operaciones que schedule_offsets por grupo; los grupos de una fila quedan en 0.
+    offsets = np.round((float(span) * position.astype(np.float64)) / np.maximum(denom, 1).astype(np.float64))
+    offsets = np.where(denom > 0, offsets, 0).astype(np.int64)
+    return format_seconds(fecha, ini + offsets)
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import pickle
+import re
+import tempfile
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from utils.file_lock import file_lock
+from utils.paths import storage_path
+
+logger = logging.getLogger(__name__)
+
+CRM_SESSION_TTL_MINUTES = int(os.getenv("CRM_SESSION_TTL_MINUTES", "90"))
+
+_TOKEN_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+@dataclass(frozen=True)
+class CrmSession:
+    token: str
+    mode: str
+    source: str
+    filename: str
+    created_at: float
+    rows: int
+
+
+def sessions_dir() -> Path:
+    return storage_path("sessions", "crm")
+
+
+def _max_bytes() -> int:
+    return int(float(os.getenv("CRM_SESSION_MAX_MB", "512")) * 1024 * 1024)
+
+
+def _meta_path(token: str) -> Path:
+    return sessions_dir() / f"{token}.json"
+
+
+def _data_path(token: str) -> Path:
+    return sessions_dir() / f"{token}.pkl"
+
+
+def _lock_path() -> Path:
+    return sessions_dir() / ".lock"
+
+
+def _remove(path: Path) -> None:
+    try:
+        path.unlink(missing_ok=True)
+    except OSError as exc:
+        logger.debug("No se pudo eliminar %s: %s", path.name, exc)
+
+
+def _drop(token: str) -> None:
+    _remove(_data_path(token))
+    _remove(_meta_path(token))
+
+
+def _expired(created_at: float, now: float) -> bool:
+    return now - created_at > CRM_SESSION_TTL_MINUTES * 60
+
+
+def _read_meta(token: str) -> Optional[CrmSession]:
+    try:
+        raw = json.loads(_meta_path(token).read_text(encoding="utf-8"))
+        return CrmSession(**raw)
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _write_atomic(path: Path, write) -> None:
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    os.close(fd)
+    try:
+        write(tmp_name)
+        os.replace(tmp_name, path)
+    except Exception:
+        _remove(Path(tmp_name))
+        raise
+
+
+def _prune(keep: Optional[str] = None) -> None:
+    """Elimina sesiones vencidas y, por LRU (mtime del archivo de datos), las que excedan el tamano maximo.
+
+    Debe llamarse con el bloqueo tomado.
+    """
+    directory = sessions_dir()
+    if not directory.exists():
+        return
+    now = time.time()
+    alive: list[tuple[float, int, str]] = []
+    for meta_path in directory.glob("*.json"):
+        token = meta_path.stem
+        meta = _read_meta(token)
+        if meta is None or _expired(meta.created_at, now):
+            _drop(token)
+            continue
+        try:
+            stat = _data_path(token).stat()
+        except FileNotFoundError:
+            _drop(token)
+            continue
+        alive.append((stat.st_mtime, stat.st_size, token))
+
+    total = sum(size for _, size, _ in alive)
+    limit = _max_bytes()
+    for _, size, token in sorted(alive):
+        if total <= limit:
+            break
+        if token == keep:
+            continue
+        _drop(token)
+        total -= size
+
+
+def create_session(df: pd.DataFrame, *, mode: str, source: str, filename: str) -> CrmSession:
+    """Guarda el DataFrame ya parseado para que cada generacion CRM lo lea sin volver a parsear."""
+    directory = sessions_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    session = CrmSession(
+        token=uuid.uuid4().hex,
+        mode=mode,
+        source=source,
+        filename=filename,
+        created_at=time.time(),
+        rows=len(df),
+    )
+    _write_atomic(_data_path(session.token), df.to_pickle)
+    payload = json.dumps(asdict(session), ensure_ascii=False)
+    _write_atomic(_meta_path(session.token), lambda name: Path(name).write_text(payload, encoding="utf-8"))
+    with file_lock(_lock_path()):
+        _prune(keep=session.token)
+    return session
+
+
+def load_session(token: str) -> Optional[tuple[CrmSession, pd.DataFrame]]:
+    if not _TOKEN_RE.match(token or ""):
+        return None
+    meta = _read_meta(token)
+    if meta is None:
+        return None
+    if _expired(meta.created_at, time.time()):
+        with file_lock(_lock_path()):
+            _drop(token)
+        return None
+    data_path = _data_path(token)
+    try:
+        df = pd.read_pickle(data_path)
+        os.utime(data_path)
+    except (OSError, ValueError, EOFError, pickle.UnpicklingError) as exc:
+        logger.debug("Sesion CRM %s no disponible: %s", token, exc)
+        return None
+    return meta, df
+
+
+def cleanup_sessions() -> None:
+    with file_lock(_lock_path()):
+        _prune()
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+import unicodedata
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Optional
+
+from repositories import ejecutivos_repo
+from repositories.ejecutivos_repo import Ejecutivo
+
+logger = logging.getLogger(__name__)
+
+FUZZY_THRESHOLD = 0.92
+_FUZZY_CANDIDATES = 25
+_MATCH_MEMO_LIMIT = 50000
+
+# mandante -> (vence_en segun time.monotonic, directorio)
+_CACHE: dict[str, tuple[float, "EjecutivoDirectory"]] = {}
+_LOCK = threading.Lock()
+
+
+def _normalize_spaces(value: object) -> str:
+    return " ".join(str(value or "").split()).strip()
+
+
+def _ascii_fold(value: str) -> str:
+    return unicodedata.normalize("NFKD", value or "").encode("ascii", "ignore").decode("ascii")
+
+
+def _fuzzy_key(value: object) -> str:
+    return _ascii_fold(_normalize_spaces(value)).lower()
+
+
+def _token_key(value: str) -> str:
+    return " ".join(sorted(value.split()))
+
+
+def _trigrams(value: str) -> set[str]:
+    padded = f"  {value} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _directory_ttl_seconds() -> int:
+    return int(os.getenv("EJECUTIVOS_DIRECTORY_TTL", "300"))
+
+
+def _error_ttl_seconds() -> int:
+    return int(os.getenv("EJECUTIVOS_DIRECTORY_ERROR_TTL", "30"))
+
+
+class EjecutivoDirectory:
+    """Ejecutivos activos de un mandante indexados por nombre_clave y alias.
+
+    Las busquedas prueban el nombre exacto, luego sin mayusculas y por ultimo
+    sin acentos; los nombres clave tienen prioridad sobre los alias. Si no hay
+    coincidencia exacta, ``match`` usa un indice de trigramas sobre
+    nombre_mostrar, nombre_clave y alias (tambien con tokens ordenados) para
+    comparar solo contra los candidatos mas cercanos. Con ``require_phone`` solo
+    cuentan ejecutivos con telefono: un exacto sin telefono cae al difuso.
+    """
+
+    def __init__(self, mandante: str, entries: list[tuple[Ejecutivo, list[str]]]):
+        self.mandante = mandante
+        self.ejecutivos: list[Ejecutivo] = [ejecutivo for ejecutivo, _ in entries]
+        self._exact: dict[str, Ejecutivo] = {}
+        self._casefold: dict[str, Ejecutivo] = {}
+        self._folded: dict[str, Ejecutivo] = {}
+        for ejecutivo, _ in entries:
+            self._index(ejecutivo.nombre_clave, ejecutivo)
+        for ejecutivo, aliases in entries:
+            for alias in aliases:
+                self._index(alias, ejecutivo)
+
+        self._options: list[tuple[str, Ejecutivo]] = []
+        self._postings: dict[str, list[int]] = {}
+        seen_options: set[tuple[str, int]] = set()
+        for ejecutivo, aliases in entries:
+            names = [
+                ejecutivo.nombre_mostrar or "",
+                (ejecutivo.nombre_clave or "").replace("_", " "),
+                *aliases,
+            ]
+            for name in names:
+                key = _fuzzy_key(name)
+                if not key:
+                    continue
+                for option in (key, _token_key(key)):
+                    marker = (option, id(ejecutivo))
+                    if marker in seen_options:
+                        continue
+                    seen_options.add(marker)
+                    option_id = len(self._options)
+                    self._options.append((option, ejecutivo))
+                    for gram in _trigrams(option):
+                        self._postings.setdefault(gram, []).append(option_id)
+        self._match_memo: dict[str, Optional[Ejecutivo]] = {}
+        self._memo_lock = threading.Lock()
+
+    def _index(self, name: str, ejecutivo: Ejecutivo) -> None:
+        text = _normalize_spaces(name)
+        if not text:
+            return
+        self._exact.setdefault(text, ejecutivo)
+        self._casefold.setdefault(text.casefold(), ejecutivo)
+        self._folded.setdefault(_ascii_fold(text).casefold(), ejecutivo)
+
+    def __len__(self) -> int:
+        return len(self.ejecutivos)
+
+    def get(self, nombre: str, require_phone: bool = False) -> Optional[Ejecutivo]:
+        text = _normalize_spaces(nombre)
+        if not text:
+            return None
+        found = self._exact.get(text)
+        if found is None:
+            found = self._casefold.get(text.casefold())
+        if found is None:
+            found = self._folded.get(_ascii_fold(text).casefold())
+        if found is not None and require_phone and not found.telefono:
+            return None
+        return found
+
+    def match(self, nombre: str, threshold: float = FUZZY_THRESHOLD, require_phone: bool = False) -> Optional[Ejecutivo]:
+        target = _fuzzy_key(nombre)
+        if not target:
+            return None
+        memo_key = f"{threshold}|{int(require_phone)}|{target}"
+        with self._memo_lock:
+            if memo_key in self._match_memo:
+                return self._match_memo[memo_key]
+
+        queries = list(dict.fromkeys([target, _token_key(target)]))
+        shared: Counter[int] = Counter()
+        for query in queries:
+            for gram in _trigrams(query):
+                shared.update(self._postings.get(gram, ()))
+        if require_phone:
+            ranked = [option_id for option_id, _ in shared.most_common() if self._options[option_id][1].telefono]
+            candidate_ids = sorted(ranked[:_FUZZY_CANDIDATES])
+        else:
+            candidate_ids = sorted(option_id for option_id, _ in shared.most_common(_FUZZY_CANDIDATES))
+
+        best: Optional[Ejecutivo] = None
+        best_score = 0.0
+        for option_id in candidate_ids:
+            option, ejecutivo = self._options[option_id]
+            for query in queries:
+                # Cota superior del ratio segun largos; evita SequenceMatcher innecesarios.
+                bound = 2.0 * min(len(query), len(option)) / (len(query) + len(option))
+                if bound < threshold or bound <= best_score:
+                    continue
+                matcher = SequenceMatcher(None, query, option)
+                quick = matcher.quick_ratio()
+                if quick < threshold or quick <= best_score:
+                    continue
+                score = matcher.ratio()
+                if score > best_score:
+                    best_score = score
+                    best = ejecutivo
+        found = best if best and best_score >= threshold else None
+
+        with self._memo_lock:
+            if len(self._match_memo) >= _MATCH_MEMO_LIMIT:
+                self._match_memo.clear()
+            self._match_memo[memo_key] = found
+        return found
+
+    def resolve(self, nombre: str, require_phone: bool = False) -> Optional[Ejecutivo]:
+        return self.get(nombre, require_phone=require_phone) or self.match(nombre, require_phone=require_phone)
+
+
+def load_directory(mandante: str) -> EjecutivoDirectory:
+    try:
+        entries = ejecutivos_repo.list_directory_entries(mandante)
+    except Exception as exc:  # pragma: no cover - fallback when tabla no existe
+        logger.debug("No se pudo cargar directorio de ejecutivos (%s): %s", mandante, exc)
+        # Cache negativo corto: con la BD caida no se reintenta (ni se espera el timeout) en cada busqueda.
+        directory = EjecutivoDirectory(mandante, [])
+        with _LOCK:
+            _CACHE[mandante] = (time.monotonic() + _error_ttl_seconds(), directory)
+        return directory
+    directory = EjecutivoDirectory(mandante, entries)
+    with _LOCK:
+        _CACHE[mandante] = (time.monotonic() + _directory_ttl_seconds(), directory)
+    return directory
+
+
+def get_directory(mandante: str) -> EjecutivoDirectory:
+    with _LOCK:
+        cached = _CACHE.get(mandante)
+    if cached and time.monotonic() < cached[0]:
+        return cached[1]
+    return load_directory(mandante)
+
+
+def clear_directory_cache() -> None:
+    with _LOCK:
+        _CACHE.clear()
+
+
+def warm_up() -> list[str]:
+    """Carga el directorio de cada mandante con ejecutivos activos; devuelve los mandantes cargados."""
+    try:
+        mandantes = sorted({ejecutivo.mandante for ejecutivo in ejecutivos_repo.list_ejecutivos(activos=True) if ejecutivo.mandante})
+    except Exception as exc:
+        logger.warning("No se pudo precargar el directorio de ejecutivos: %s", exc)
+        return []
+    for mandante in mandantes:
+        load_directory(mandante)
+    return mandantes
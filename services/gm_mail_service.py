@@ -1,18 +1,18 @@
 from __future__ import annotations
 
-import re
-import unicodedata
 from datetime import date, datetime
 from typing import Any
 
 import pandas as pd
 
 from config import EMAIL_RE
+from services.column_resolver import find_column, folded_key
 from services.contact_dedupe import dedupe_by_column_keep_first, dedupe_by_column_keep_first_normalized
 from services.gm_mail_templates import get_default_gm_mail_template, get_gm_mail_template
 from services import gm_mail_sources
 from services.mail_service import build_mail_crm_output
 from services.santander_consumer_sources import normalize_operation
+from utils.excel_reader import read_input_table
 
 OPERATION_COLUMN_KEYS = {"OPERACION", "OP"}
 CRM_EXCLUDED_SEEDS = {
@@ -21,19 +21,10 @@ CRM_EXCLUDED_SEEDS = {
 }
 
 
-def normalize_header(value: object) -> str:
-    text = str(value or "").strip().upper()
-    text = "".join(
-        char for char in unicodedata.normalize("NFD", text)
-        if unicodedata.category(char) != "Mn"
-    )
-    return re.sub(r"\s+", " ", text)
-
-
 def find_operation_column(columns: list[object]) -> object:
-    for column in columns:
-        if normalize_header(column) in OPERATION_COLUMN_KEYS:
-            return column
+    column = find_column(columns, OPERATION_COLUMN_KEYS, folded_key)
+    if column is not None:
+        return column
     raise ValueError("El archivo debe contener una columna OPERACION u OP.")
 
 
@@ -153,7 +144,7 @@ def build_gm_mail_from_excel(
     template_key: str = "gm_comercial_84995",
     delivery_date: date | None = None,
 ) -> pd.DataFrame:
-    df_origin = pd.read_excel(file_storage)
+    df_origin = read_input_table(file_storage)
     return build_gm_mail_output(df_origin, template_key=template_key, delivery_date=delivery_date)
 
 
@@ -1,10 +1,12 @@
 
 import pandas as pd
-from datetime import datetime, timedelta, date, time
+from datetime import date
 from typing import cast
 import io
 from services import campo1_catalog
+from services.column_resolver import AliasTable, plain_key
 from services.contact_dedupe import dedupe_by_column_keep_first
+from services.crm_schedule import build_fecha_gestion
 
 
 def get_campo1_choices() -> list[tuple[str, str]]:
@@ -20,67 +22,18 @@ POSSIBLE_NAMES = {
     "USUARIO": {"usuario", "usuario_crm", "agente", "ejecutivo", "usuario_gestion", "usuario crm", "usuario gestion"},
 }
 
-def _pick_col(df: pd.DataFrame, logical_name: str) -> str | None:
-    """Devuelve el nombre real de la columna que matchea el logical_name usando sinónimos."""
-    targets = {s.lower().strip() for s in POSSIBLE_NAMES.get(logical_name, set())}
-    for col in df.columns:
-        key = str(col).lower().strip()
-        if key in targets:
-            return col
-    return None
+INPUT_COLUMNS = set().union(*(POSSIBLE_NAMES[key] for key in ("TELEFONO", "RUT", "OP", "NOMBRE")))
+
+IVR_COLUMNS = AliasTable(POSSIBLE_NAMES, normalize=plain_key)
 
 def _as_text(series: pd.Series) -> pd.Series:
     """Normaliza a texto, quita sufijo '.0' y espacios laterales."""
     return series.astype(str).str.replace(r"\.0$", "", regex=True).str.strip()
 
-def _parse_hora(s: str) -> time:
-    """Parsea hora HH:MM o HH:MM:SS."""
-    s = (s or "").strip()
-    for fmt in ("%H:%M:%S", "%H:%M"):
-        try:
-            return datetime.strptime(s, fmt).time()
-        except ValueError:
-            pass
-    raise ValueError("Formato de hora inválido (usa HH:MM o HH:MM:SS).")
-
-
-def _generate_schedule(n: int, fecha: date, hora_inicio: str, hora_fin: str, intervalo_segundos: int | None) -> list[str]:
-    """
-    Genera una lista de timestamps 'YYYY-MM-DD HH:MM:SS' para n registros,
-    dentro del rango [inicio, fin]. Si intervalo es None, se auto-ajusta para que quepan todos.
-    """
-    t_ini = _parse_hora(hora_inicio)
-    t_fin = _parse_hora(hora_fin)
-    dt_ini = datetime.combine(fecha, t_ini)
-    dt_fin = datetime.combine(fecha, t_fin)
-    if dt_fin <= dt_ini:
-        raise ValueError("La hora fin debe ser mayor a la hora inicio.")
-    rango_seg = int((dt_fin - dt_ini).total_seconds())
-    if n <= 0:
-        return []
-    if n > (rango_seg + 1):
-        raise ValueError(
-            f"El rango {hora_inicio}-{hora_fin} no alcanza para {n} registros. "
-            f"Con precision de segundos, la capacidad maxima es {rango_seg + 1}."
-        )
-
-    if n == 1:
-        return [dt_ini.strftime("%Y-%m-%d %H:%M:%S")]
-
-    # Distribucion uniforme en todo el rango para aprovechar la ventana completa.
-    # El intervalo queda como referencia operativa, sin bloquear el proceso.
-    span = (dt_fin - dt_ini).total_seconds()
-    offsets = [int(round((span * i) / (n - 1))) for i in range(n)]
-    schedule = [dt_ini + timedelta(seconds=offset) for offset in offsets]
-    return [dt.strftime("%Y-%m-%d %H:%M:%S") for dt in schedule]
-
-
 def build_ivr_output(df: pd.DataFrame, campo1_value: str) -> pd.DataFrame:
     base = df.copy()
-    tel_col = _pick_col(base, "TELEFONO")
-    rut_col = _pick_col(base, "RUT")
-    op_col  = _pick_col(base, "OP")
-    nom_col = _pick_col(base, "NOMBRE")
+    cols = IVR_COLUMNS.resolve(base)
+    tel_col, rut_col, op_col, nom_col = cols["TELEFONO"], cols["RUT"], cols["OP"], cols["NOMBRE"]
     if tel_col is None:
         raise ValueError("Falta columna de TELEFONO (acepta: Telefono, Teléfono, Fono, Celular, Móvil).")
     base = dedupe_by_column_keep_first(base, rut_col)
@@ -134,9 +87,8 @@ def build_crm_output(
     intervalo_segundos: int | None = None,
 ) -> pd.DataFrame:
     base = df.copy()
-    tel_col = _pick_col(base, "TELEFONO")
-    rut_col = _pick_col(base, "RUT")
-    op_col  = _pick_col(base, "OP")  # NRO_DOCUMENTO
+    cols = IVR_COLUMNS.resolve(base)
+    tel_col, rut_col, op_col = cols["TELEFONO"], cols["RUT"], cols["OP"]  # OP -> NRO_DOCUMENTO
     faltantes = []
     if not rut_col: faltantes.append("RUT")
     if not op_col:  faltantes.append("NRO_DOCUMENTO/OP")
@@ -148,7 +100,7 @@ def build_crm_output(
     nro_doc  = _as_text(base.loc[:, op_col])
     telefono = _as_text(base.loc[:, tel_col])
     n = len(base)
-    fechas = _generate_schedule(n, fecha, hora_inicio, hora_fin, intervalo_segundos)
+    fechas = build_fecha_gestion(n, fecha, hora_inicio, hora_fin, intervalo_segundos, index=base.index)
     out_cols = ["RUT", "NRO_DOCUMENTO", "FECHA_GESTION", "TELEFONO", "OBSERVACION", "USUARIO", "CORREO"]
     out = pd.DataFrame({col: pd.Series(index=base.index, dtype=object) for col in out_cols})
     out["RUT"]            = rut
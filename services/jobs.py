@@ -0,0 +1,282 @@
+"""Background jobs for long generations: SQLite job table, thread pool and progress reporting."""
+from __future__ import annotations
+
+import contextvars
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, Any, Callable, Iterable, Optional, Union
+
+from services import artifact_registry
+from utils.paths import storage_path
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = "jobs"
+_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+QUEUED, RUNNING, DONE, ERROR = "queued", "running", "done", "error"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    rows_done INTEGER,
+    rows_total INTEGER,
+    rows_output INTEGER,
+    error TEXT NOT NULL DEFAULT '',
+    artifact_token TEXT NOT NULL DEFAULT '',
+    download_name TEXT NOT NULL DEFAULT '',
+    pid INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+)
+"""
+
+_EXECUTOR_LOCK = threading.Lock()
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_RECOVERED = False
+_CURRENT: contextvars.ContextVar[Optional["_Reporter"]] = contextvars.ContextVar("job_reporter", default=None)
+
+
+@dataclass(frozen=True)
+class JobOutput:
+    """Salida de un generador: archivo (stream o bloques de bytes), nombre, mimetype y filas escritas."""
+
+    data: Union[IO[bytes], Iterable[bytes]]
+    download_name: str
+    mimetype: str
+    rows: Optional[int] = None
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    status: str
+    progress: float
+    message: str
+    rows_done: Optional[int]
+    rows_total: Optional[int]
+    rows_output: Optional[int]
+    error: str
+    artifact_token: str
+    download_name: str
+    pid: int
+    created_at: float
+    started_at: Optional[float]
+    finished_at: Optional[float]
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data.pop("artifact_token")
+        data.pop("pid")
+        data["progress"] = round(self.progress, 4)
+        return data
+
+
+def db_path() -> Path:
+    return storage_path("jobs", "jobs.sqlite3")
+
+
+def _max_workers() -> int:
+    return max(int(os.getenv("JOBS_MAX_WORKERS", "2")), 1)
+
+
+def _retention_seconds() -> float:
+    return float(os.getenv("JOBS_RETENTION_HOURS", "24")) * 3600
+
+
+def _progress_interval() -> float:
+    return float(os.getenv("JOBS_PROGRESS_INTERVAL", "0.5"))
+
+
+def _connect() -> sqlite3.Connection:
+    path = db_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(_SCHEMA)
+    return conn
+
+
+def _update(job_id: str, **fields: Any) -> None:
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    with closing(_connect()) as conn:
+        conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":  # pragma: no cover - en Windows se sirve con un solo proceso (waitress)
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+_ORPHAN_ERROR = "El trabajo se interrumpio porque el servidor se reinicio."
+
+
+def _fail_orphan(conn: sqlite3.Connection, job_id: str) -> None:
+    conn.execute(
+        "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ? AND status IN (?, ?)",
+        (ERROR, _ORPHAN_ERROR, time.time(), job_id, QUEUED, RUNNING),
+    )
+
+
+def _recover() -> None:
+    """Marca como fallidos los trabajos de procesos que ya no existen y borra los antiguos."""
+    global _RECOVERED
+    if _RECOVERED:
+        return
+    _RECOVERED = True
+    with closing(_connect()) as conn:
+        rows = conn.execute("SELECT id, pid FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)).fetchall()
+        for row in rows:
+            if not _pid_alive(row["pid"]):
+                _fail_orphan(conn, row["id"])
+        conn.execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND created_at < ?",
+            (DONE, ERROR, time.time() - _retention_seconds()),
+        )
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _recover()
+            _EXECUTOR = ThreadPoolExecutor(max_workers=_max_workers(), thread_name_prefix="job")
+        return _EXECUTOR
+
+
+class _Reporter:
+    def __init__(self, job_id: str) -> None:
+        self.job_id = job_id
+        self.rows_done: Optional[int] = None
+        self.rows_total: Optional[int] = None
+        self.message = ""
+        self._last_write = 0.0
+
+    def update(self, done: Optional[int], total: Optional[int], message: Optional[str]) -> None:
+        if total is not None:
+            self.rows_total = total
+        if done is not None:
+            self.rows_done = done
+        changed_message = message is not None and message != self.message
+        if message is not None:
+            self.message = message
+        now = time.monotonic()
+        if not changed_message and now - self._last_write < _progress_interval():
+            return
+        self._last_write = now
+        progress = 0.0
+        if self.rows_total and self.rows_done is not None:
+            progress = min(self.rows_done / self.rows_total, 0.99)
+        _update(
+            self.job_id,
+            progress=progress,
+            message=self.message,
+            rows_done=self.rows_done,
+            rows_total=self.rows_total,
+        )
+
+
+def report_progress(done: Optional[int] = None, total: Optional[int] = None, message: Optional[str] = None) -> None:
+    """Informa avance del trabajo en curso; fuera de un trabajo no hace nada."""
+    reporter = _CURRENT.get()
+    if reporter is not None:
+        reporter.update(done, total, message)
+
+
+def _store_output(output: JobOutput) -> artifact_registry.Artifact:
+    artifact = artifact_registry.reserve(NAMESPACE)
+    target = artifact.directory / (Path(output.download_name).name or "salida")
+    try:
+        with target.open("wb") as handle:
+            if hasattr(output.data, "read"):
+                shutil.copyfileobj(output.data, handle)
+            else:
+                for chunk in output.data:
+                    handle.write(chunk)
+        return artifact_registry.publish(artifact, {"download": (str(target), output.download_name, output.mimetype)})
+    except Exception:
+        artifact_registry.discard(artifact)
+        raise
+
+
+def _run(job_id: str, func: Callable[..., JobOutput], args: tuple, kwargs: dict) -> None:
+    reporter = _Reporter(job_id)
+    token = _CURRENT.set(reporter)
+    _update(job_id, status=RUNNING, started_at=time.time())
+    try:
+        output = func(*args, **kwargs)
+        artifact = _store_output(output)
+        _update(
+            job_id,
+            status=DONE,
+            progress=1.0,
+            message="Listo",
+            rows_done=reporter.rows_total if reporter.rows_total is not None else reporter.rows_done,
+            rows_output=output.rows,
+            artifact_token=artifact.token,
+            download_name=output.download_name,
+            finished_at=time.time(),
+        )
+    except ValueError as exc:
+        _update(job_id, status=ERROR, error=str(exc), finished_at=time.time())
+    except Exception as exc:
+        logger.exception("Fallo el trabajo %s", job_id)
+        _update(job_id, status=ERROR, error=f"Ocurrió un error procesando el archivo: {exc}", finished_at=time.time())
+    finally:
+        _CURRENT.reset(token)
+
+
+def submit(kind: str, func: Callable[..., JobOutput], *args: Any, **kwargs: Any) -> str:
+    """Encola ``func(*args, **kwargs)`` y devuelve el id del trabajo. ``func`` no debe usar el request de Flask."""
+    executor = _executor()
+    job_id = uuid.uuid4().hex
+    with closing(_connect()) as conn:
+        conn.execute(
+            "INSERT INTO jobs (id, kind, status, pid, created_at) VALUES (?, ?, ?, ?, ?)",
+            (job_id, kind, QUEUED, os.getpid(), time.time()),
+        )
+    executor.submit(_run, job_id, func, args, kwargs)
+    return job_id
+
+
+def get(job_id: str) -> Optional[Job]:
+    if not _ID_RE.match(job_id or ""):
+        return None
+    with closing(_connect()) as conn:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        # Un worker que murio o se reciclo deja su trabajo en curso: se marca fallido al consultarlo.
+        if row and row["status"] in (QUEUED, RUNNING) and not _pid_alive(row["pid"]):
+            _fail_orphan(conn, job_id)
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return Job(**dict(row)) if row else None
+
+
+def resolve_download(job: Job) -> Optional[artifact_registry.ArtifactFile]:
+    if job.status != DONE or not job.artifact_token:
+        return None
+    return artifact_registry.resolve(job.artifact_token, "download", namespace=NAMESPACE)
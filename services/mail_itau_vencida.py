@@ -5,6 +5,7 @@ from typing import Optional, cast
 
 import pandas as pd
 
+from services.column_resolver import find_column
 from services.contact_dedupe import dedupe_by_column_keep_first
 
 
@@ -13,13 +14,13 @@ def build_itau_vencida(df: pd.DataFrame, template, mandante: Optional[str]) -> p
 
     base = mt._prepare_itau_base(df)
 
-    oper_col = mt._find_column(base, {"oper", "operacion", "nro_operacion", "id_credito"})
-    rut_col = mt._find_column(base, {"rut", "rut_cliente", "id_cliente"})
-    dv_col = mt._find_column(base, {"dv1", "dv", "digito", "dígito", "dv_rut"})
-    nombre_col = mt._find_column(base, {"nombre", "nombre_cliente", "cliente", "contacto"})
-    masividad_col = mt._find_column(base, {"masividad", "tipo", "canal"})
-    email_col = mt._find_column(base, {"email", "mail", "correo", "dest_email", "dest_mail"})
-    agente_col = mt._find_column(base, mt.AGENTE_COLUMN_ALIASES)
+    oper_col = find_column(base, {"oper", "operacion", "nro_operacion", "id_credito"})
+    rut_col = find_column(base, {"rut", "rut_cliente", "id_cliente"})
+    dv_col = find_column(base, {"dv1", "dv", "digito", "dígito", "dv_rut"})
+    nombre_col = find_column(base, {"nombre", "nombre_cliente", "cliente", "contacto"})
+    masividad_col = find_column(base, {"masividad", "tipo", "canal"})
+    email_col = find_column(base, {"email", "mail", "correo", "dest_email", "dest_mail"})
+    agente_col = find_column(base, mt.AGENTE_COLUMN_ALIASES)
 
     required = {
         "Oper": oper_col,
@@ -73,9 +74,14 @@ def build_itau_vencida(df: pd.DataFrame, template, mandante: Optional[str]) -> p
     year_str = str(datetime.now().year)
     mandante_resolve = mandante or template.mandante
 
+    ejecutivos_by_agente = {
+        agente: mt._resolve_itau_ejecutivo(mandante_resolve, agente)
+        for agente in dict.fromkeys(agente_series.tolist())
+    }
+
     records: list[dict[str, str]] = []
     for idx, agente in enumerate(agente_series.tolist()):
-        ejecutivo = mt._resolve_itau_ejecutivo(mandante_resolve, agente)
+        ejecutivo = ejecutivos_by_agente[agente]
         ejecutivo_name = mt._normalize_agent_text((ejecutivo.nombre_mostrar if ejecutivo else "") or agente)
         mail_from = (ejecutivo.reenviador if ejecutivo else "") or (ejecutivo.correo if ejecutivo else "") or ""
         correo = (ejecutivo.correo if ejecutivo else "") or ""
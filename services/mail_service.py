@@ -1,8 +1,10 @@
 # services/mail_service.py
 import pandas as pd
-from datetime import datetime, timedelta, date, time
+from datetime import datetime, date
 
+from services.column_resolver import AliasTable, plain_key
 from services.contact_dedupe import dedupe_by_column_keep_first
+from services.crm_schedule import build_fecha_gestion
 
 REQUIRED_COLUMNS = {
     "RUT": {"rut", "id_cliente", "id cliente"},
@@ -11,60 +13,18 @@ REQUIRED_COLUMNS = {
     "MAIL": {"mail", "correo", "email", "e-mail", "dest_email", "dest_mail", "mail_cliente", "email_cliente"},
 }
 
-def _find_col(df: pd.DataFrame, logical: str, *, exclude_keywords: set[str] | None = None) -> str | None:
-    exclude_keywords = {kw.lower() for kw in (exclude_keywords or set())}
-    targets = {logical.lower()} | {alias.lower() for alias in REQUIRED_COLUMNS.get(logical, set())}
-    for col in df.columns:
-        key = str(col).strip().lower()
-        if exclude_keywords and any(keyword in key for keyword in exclude_keywords):
-            continue
-        if key in targets:
-            return col
-    return None
+# El nombre logico tambien cuenta como alias; MAIL ignora columnas del agente (MAIL_AGENTE, etc.).
+MAIL_COLUMNS = AliasTable(
+    {logical: {logical} | aliases for logical, aliases in REQUIRED_COLUMNS.items()},
+    normalize=plain_key,
+    exclude={"MAIL": {"agente"}},
+)
 
 
 def _normalize_series(series: pd.Series) -> pd.Series:
     return series.astype(str).str.replace(r"\.0$", "", regex=True).str.strip()
 
 
-def _parse_hora(value: str) -> time:
-    value = (value or "").strip()
-    for fmt in ("%H:%M:%S", "%H:%M"):
-        try:
-            return datetime.strptime(value, fmt).time()
-        except ValueError:
-            continue
-    raise ValueError("Formato de hora inválido (usa HH:MM o HH:MM:SS).")
-
-
-def _generate_schedule(n: int, fecha: date, hora_inicio: str, hora_fin: str, intervalo_segundos: int | None) -> list[str]:
-    t_ini = _parse_hora(hora_inicio)
-    t_fin = _parse_hora(hora_fin)
-    dt_ini = datetime.combine(fecha, t_ini)
-    dt_fin = datetime.combine(fecha, t_fin)
-    if dt_fin <= dt_ini:
-        raise ValueError("La hora fin debe ser mayor a la hora inicio.")
-    if n <= 0:
-        return []
-
-    rango_seg = int((dt_fin - dt_ini).total_seconds())
-    if n > (rango_seg + 1):
-        raise ValueError(
-            f"El rango {hora_inicio}-{hora_fin} no alcanza para {n} registros. "
-            f"Con precision de segundos, la capacidad maxima es {rango_seg + 1}."
-        )
-
-    if n == 1:
-        return [dt_ini.strftime("%Y-%m-%d %H:%M:%S")]
-
-    span = (dt_fin - dt_ini).total_seconds()
-    offsets = [int(round((span * i) / (n - 1))) for i in range(n)]
-    return [
-        (dt_ini + timedelta(seconds=offset)).strftime("%Y-%m-%d %H:%M:%S")
-        for offset in offsets
-    ]
-
-
 def build_mail_crm_output(
     df: pd.DataFrame,
     fecha: date,
@@ -76,9 +36,8 @@ def build_mail_crm_output(
     require_operacion: bool = True,
 ) -> pd.DataFrame:
     base = df.copy()
-    rut_col = _find_col(base, "RUT")
-    op_col = _find_col(base, "OPERACION")
-    mail_col = _find_col(base, "MAIL", exclude_keywords={"agente"})
+    cols = MAIL_COLUMNS.resolve(base)
+    rut_col, op_col, mail_col = cols["RUT"], cols["OPERACION"], cols["MAIL"]
 
     required_pairs = [("RUT", rut_col), ("MAIL", mail_col)]
     if require_operacion:
@@ -92,7 +51,7 @@ def build_mail_crm_output(
     operacion = _normalize_series(base.loc[:, op_col]) if op_col else pd.Series([""] * len(base), index=base.index)
     correo = _normalize_series(base.loc[:, mail_col])
 
-    fechas = _generate_schedule(len(base), fecha, hora_inicio, hora_fin, intervalo_segundos)
+    fechas = build_fecha_gestion(len(base), fecha, hora_inicio, hora_fin, intervalo_segundos, index=base.index)
 
     out_cols = ["RUT", "NRO_DOCUMENTO", "FECHA_GESTION", "TELEFONO", "OBSERVACION", "USUARIO", "CORREO"]
     out = pd.DataFrame({col: pd.Series(dtype=object) for col in out_cols}, index=base.index)
@@ -5,7 +5,6 @@ import json
 from dataclasses import dataclass
 from datetime import date, datetime
 from typing import Optional
-from difflib import SequenceMatcher
 import re
 import unicodedata
 
@@ -13,9 +12,11 @@ import pandas as pd
 from openpyxl import load_workbook
 
 from repositories import ejecutivos_repo
-from services import config_store
+from services import config_store, ejecutivos_directory
+from services.column_resolver import find_column, folded_key
 from services.contact_dedupe import dedupe_by_column_keep_first, dedupe_by_column_keep_first_normalized
 from services.gm_mail_templates import get_gm_mail_template
+from services.template_registry import TemplateRegistry
 from utils.paths import archive_path, config_path, PROJECT_ROOT
 
 TEMPLATE_COLUMNS_TANNER = [
@@ -310,44 +311,39 @@ _DEFAULT_MAIL_TEMPLATE_OPTIONS: list[MailTemplate] = [
 ]
 
 
-def _load_mail_templates_from_config() -> list[MailTemplate]:
-    path = config_path("mail_templates.json")
-    if not path.exists():
-        return _DEFAULT_MAIL_TEMPLATE_OPTIONS
+def _build_mail_templates(raw_items: list[dict]) -> list[MailTemplate]:
+    return [
+        MailTemplate(
+            code=str(item["code"]).strip(),
+            label=str(item["label"]).strip(),
+            message_id=int(item["message_id"]),
+            institucion=str(item["institucion"]).strip(),
+            segmentoinstitucion=str(item["segmentoinstitucion"]).strip(),
+            mandante=str(item["mandante"]).strip(),
+        )
+        for item in raw_items
+    ]
 
-    try:
-        raw_items = config_store.read_json("mail_templates.json")
-        templates = [
-            MailTemplate(
-                code=str(item["code"]).strip(),
-                label=str(item["label"]).strip(),
-                message_id=int(item["message_id"]),
-                institucion=str(item["institucion"]).strip(),
-                segmentoinstitucion=str(item["segmentoinstitucion"]).strip(),
-                mandante=str(item["mandante"]).strip(),
-            )
-            for item in raw_items
-        ]
-    except (OSError, ValueError, TypeError, KeyError, json.JSONDecodeError):
-        return _DEFAULT_MAIL_TEMPLATE_OPTIONS
-    return templates or _DEFAULT_MAIL_TEMPLATE_OPTIONS
+
+MAIL_TEMPLATES: TemplateRegistry[MailTemplate] = TemplateRegistry(
+    "mail_templates.json",
+    _build_mail_templates,
+    key=lambda template: template.code,
+    message_id=lambda template: template.message_id,
+    defaults=_DEFAULT_MAIL_TEMPLATE_OPTIONS,
+)
 
 
-MAIL_TEMPLATE_OPTIONS: list[MailTemplate] = _load_mail_templates_from_config()
+def mail_template_options() -> tuple[MailTemplate, ...]:
+    return MAIL_TEMPLATES.items()
 
 
 def get_template_by_id(template_id: int) -> Optional[MailTemplate]:
-    for template in MAIL_TEMPLATE_OPTIONS:
-        if template.message_id == template_id:
-            return template
-    return None
+    return MAIL_TEMPLATES.get_by_message_id(template_id)
 
 
 def get_template(code: str) -> Optional[MailTemplate]:
-    for template in MAIL_TEMPLATE_OPTIONS:
-        if template.code == code:
-            return template
-    return None
+    return MAIL_TEMPLATES.get(code)
 
 
 def build_mail_template(df: pd.DataFrame, template_code: str, mandante: Optional[str] = None, template_date: date | None = None) -> pd.DataFrame:
@@ -498,16 +494,16 @@ def _build_tanner_medios_pago(df: pd.DataFrame, template: MailTemplate, mandante
     base = df.copy()
     base.columns = [str(col).strip() for col in base.columns]
 
-    rut_col = _find_column(base, TANNER_REQUIRED_COLUMN_LABELS["RUT+DV"])
+    rut_col = find_column(base, TANNER_REQUIRED_COLUMN_LABELS["RUT+DV"])
     dv_col = None
     if rut_col and "rut+dv" not in rut_col.lower().replace(" ", ""):
-        dv_col = _find_column(base, {"dv", "digito", "dígito", "dv_rut"})
-    op_col = _find_column(base, TANNER_REQUIRED_COLUMN_LABELS["OPERACION"])
-    dest_col = _find_column(base, TANNER_REQUIRED_COLUMN_LABELS["dest_email"])
-    name_from_col = _find_column(base, {"name_from", "nombre_remitente"})
-    mail_agente_col = _find_column(base, TANNER_CONTACT_COLUMN_LABELS["MAIL_AGENTE"])
-    nombre_agente_col = _find_column(base, TANNER_REQUIRED_COLUMN_LABELS["NOMBRE_AGENTE"])
-    phono_col = _find_column(base, TANNER_CONTACT_COLUMN_LABELS["PHONO_AGENTE"])
+        dv_col = find_column(base, {"dv", "digito", "dígito", "dv_rut"})
+    op_col = find_column(base, TANNER_REQUIRED_COLUMN_LABELS["OPERACION"])
+    dest_col = find_column(base, TANNER_REQUIRED_COLUMN_LABELS["dest_email"])
+    name_from_col = find_column(base, {"name_from", "nombre_remitente"})
+    mail_agente_col = find_column(base, TANNER_CONTACT_COLUMN_LABELS["MAIL_AGENTE"])
+    nombre_agente_col = find_column(base, TANNER_REQUIRED_COLUMN_LABELS["NOMBRE_AGENTE"])
+    phono_col = find_column(base, TANNER_CONTACT_COLUMN_LABELS["PHONO_AGENTE"])
 
     missing_required = [
         logical_name
@@ -715,15 +711,6 @@ def _format_gm_date(value: object) -> str:
     return parsed.strftime("%d-%m-%Y")
 
 
-def _find_gm_column(df: pd.DataFrame, candidates: set[str]) -> Optional[str]:
-    normalized = {_normalize_key(col): col for col in df.columns}
-    for candidate in candidates:
-        key = _normalize_key(candidate)
-        if key in normalized:
-            return normalized[key]
-    return None
-
-
 def _build_gm_mail_from_origin(df: pd.DataFrame, template: MailTemplate) -> pd.DataFrame:
     template_key = GM_TEMPLATE_CODE_TO_KEY.get(template.code)
     gm_template = get_gm_mail_template(template_key or "")
@@ -739,14 +726,14 @@ def _build_gm_mail_from_origin(df: pd.DataFrame, template: MailTemplate) -> pd.D
     base = df.copy()
     base.columns = [str(col).strip() for col in base.columns]
 
-    rut_col = _find_gm_column(base, {"rut"})
-    nombre_col = _find_gm_column(base, {"nombre", "nombre cliente", "cliente", "nombre_cliente"})
-    oper_col = _find_gm_column(base, {"operacion", "operación", "op"})
-    email_col = _find_gm_column(base, EMAIL_COLUMN_ALIASES)
-    monto_col = _find_gm_column(base, {"monto cuota", "monto_cuota", "monto"})
-    vencimiento_col = _find_gm_column(base, {"vencimiento cuota", "fecha vcto cuota", "fecha vencimiento cuota", "fecha_vencimiento_cuota"})
-    fecha_entrega_col = _find_gm_column(base, {"fecha de oferta", "fecha entrega", "fecha_entrega"})
-    fecha_valida_col = _find_gm_column(base, {"valido hasta", "válido hasta", "fecha valida", "fecha_valida"})
+    rut_col = find_column(base, {"rut"}, folded_key)
+    nombre_col = find_column(base, {"nombre", "nombre cliente", "cliente", "nombre_cliente"}, folded_key)
+    oper_col = find_column(base, {"operacion", "operación", "op"}, folded_key)
+    email_col = find_column(base, EMAIL_COLUMN_ALIASES, folded_key)
+    monto_col = find_column(base, {"monto cuota", "monto_cuota", "monto"}, folded_key)
+    vencimiento_col = find_column(base, {"vencimiento cuota", "fecha vcto cuota", "fecha vencimiento cuota", "fecha_vencimiento_cuota"}, folded_key)
+    fecha_entrega_col = find_column(base, {"fecha de oferta", "fecha entrega", "fecha_entrega"}, folded_key)
+    fecha_valida_col = find_column(base, {"valido hasta", "válido hasta", "fecha valida", "fecha_valida"}, folded_key)
 
     missing = [
         name
@@ -798,9 +785,9 @@ def _build_itau_castigo(df: pd.DataFrame, template: MailTemplate) -> pd.DataFram
     base = df.copy()
     base.columns = [str(col).strip() for col in base.columns]
 
-    rut_col = _find_column(base, RUT_COLUMN_ALIASES)
-    oper_col = _find_column(base, OPERATION_COLUMN_ALIASES)
-    dest_col = _find_column(base, EMAIL_COLUMN_ALIASES)
+    rut_col = find_column(base, RUT_COLUMN_ALIASES)
+    oper_col = find_column(base, OPERATION_COLUMN_ALIASES)
+    dest_col = find_column(base, EMAIL_COLUMN_ALIASES)
 
     missing = [
         name
@@ -851,10 +838,10 @@ def _build_bit_mail(df: pd.DataFrame, template: MailTemplate) -> pd.DataFrame:
     base = df.copy()
     base.columns = [str(col).strip() for col in base.columns]
 
-    rut_col = _find_column(base, RUT_COLUMN_ALIASES)
-    oper_col = _find_column(base, OPERATION_COLUMN_ALIASES)
-    cliente_col = _find_column(base, {"cliente", "nombre", "nombre_cliente", "contacto"})
-    dest_col = _find_column(base, EMAIL_COLUMN_ALIASES)
+    rut_col = find_column(base, RUT_COLUMN_ALIASES)
+    oper_col = find_column(base, OPERATION_COLUMN_ALIASES)
+    cliente_col = find_column(base, {"cliente", "nombre", "nombre_cliente", "contacto"})
+    dest_col = find_column(base, EMAIL_COLUMN_ALIASES)
 
     missing = [
         name
@@ -905,10 +892,10 @@ def _build_araucana_mail(df: pd.DataFrame, template: MailTemplate, template_date
     base = df.copy()
     base.columns = [str(col).strip() for col in base.columns]
 
-    rut_col = _find_column(base, RUT_COLUMN_ALIASES)
-    nombre_col = _find_column(base, {"nombre", "cliente", "nombre_cliente", "contacto"})
-    dest_col = _find_column(base, EMAIL_COLUMN_ALIASES)
-    oper_col = _find_column(base, OPERATION_COLUMN_ALIASES)
+    rut_col = find_column(base, RUT_COLUMN_ALIASES)
+    nombre_col = find_column(base, {"nombre", "cliente", "nombre_cliente", "contacto"})
+    dest_col = find_column(base, EMAIL_COLUMN_ALIASES)
+    oper_col = find_column(base, OPERATION_COLUMN_ALIASES)
 
     if template.code == ARAUCANA_ALTERNATIVAS_CODE:
         missing = [
@@ -1030,7 +1017,7 @@ def _normalize_phone(value: Optional[str]) -> str:
 def _prepare_itau_base(df: pd.DataFrame) -> pd.DataFrame:
     base = df.copy()
     base.columns = [str(col).strip() for col in base.columns]
-    if _find_column(base, {"masividad"}):
+    if find_column(base, {"masividad"}):
         return base
 
     raw = df.copy()
@@ -1059,45 +1046,7 @@ def _resolve_itau_ejecutivo(mandante: str, agente: str) -> Optional[ejecutivos_r
     if not raw:
         return None
 
-    candidates = [
-        raw,
-        raw.lower(),
-        raw.upper(),
-        _ascii_fold(raw),
-        _ascii_fold(raw).lower(),
-        _ascii_fold(raw).upper(),
-    ]
-    seen: set[str] = set()
-    unique = []
-    for item in candidates:
-        item = _normalize_agent_text(item)
-        if item and item not in seen:
-            seen.add(item)
-            unique.append(item)
-
-    for candidate in unique:
-        found = ejecutivos_repo.fetch_by_mandante_and_nombre(mandante, candidate)
-        if found:
-            return found
-
-    target = _ascii_fold(raw).lower().strip()
-    if not target:
-        return None
-    best = None
-    best_score = 0.0
-    for item in ejecutivos_repo.list_ejecutivos(mandante=mandante, activos=True):
-        options = [
-            _ascii_fold(item.nombre_mostrar or "").lower().strip(),
-            (item.nombre_clave or "").replace("_", " ").lower().strip(),
-        ]
-        for option in options:
-            if not option:
-                continue
-            score = SequenceMatcher(None, target, option).ratio()
-            if score > best_score:
-                best_score = score
-                best = item
-    return best if best and best_score >= 0.92 else None
+    return ejecutivos_directory.get_directory(mandante).resolve(raw)
 
 
 def _apply_current_itau_period(row: dict[str, str]) -> dict[str, str]:
@@ -1187,16 +1136,16 @@ def _build_scj_cobranza(df: pd.DataFrame, template: MailTemplate, mandante: Opti
     base = df.copy()
     base.columns = [str(col).strip() for col in base.columns]
 
-    rut_col = _find_column(base, RUT_COLUMN_ALIASES)
+    rut_col = find_column(base, RUT_COLUMN_ALIASES)
     dv_col = None
     if rut_col and "rut+dv" not in rut_col.lower().replace(" ", ""):
-        dv_col = _find_column(base, {"dv", "digito", "dígito", "dv_rut"})
-    op_col = _find_column(base, OPERATION_COLUMN_ALIASES)
-    dest_col = _find_column(base, EMAIL_COLUMN_ALIASES)
-    name_from_col = _find_column(base, {"name_from", "nombre_remitente"})
-    mail_agente_col = _find_column(base, {"mail_agente", "correo_agente"})
-    nombre_agente_col = _find_column(base, AGENTE_COLUMN_ALIASES)
-    phono_col = _find_column(base, {"phono_agente", "fono_agente", "telefono_agente", "telefono"})
+        dv_col = find_column(base, {"dv", "digito", "dígito", "dv_rut"})
+    op_col = find_column(base, OPERATION_COLUMN_ALIASES)
+    dest_col = find_column(base, EMAIL_COLUMN_ALIASES)
+    name_from_col = find_column(base, {"name_from", "nombre_remitente"})
+    mail_agente_col = find_column(base, {"mail_agente", "correo_agente"})
+    nombre_agente_col = find_column(base, AGENTE_COLUMN_ALIASES)
+    phono_col = find_column(base, {"phono_agente", "fono_agente", "telefono_agente", "telefono"})
 
     if not (rut_col and op_col and dest_col):
         raise ValueError("Faltan columnas requeridas para la plantilla de Santander Consumer Judicial.")
@@ -1329,9 +1278,9 @@ def _build_sc_telefonia_descuento(df: pd.DataFrame, template: MailTemplate) -> p
     base = df.copy()
     base.columns = [str(col).strip() for col in base.columns]
 
-    cliente_col = _find_column(base, {"nombre_cliente", "cliente", "nombre"})
-    oper_col = _find_column(base, OPERATION_COLUMN_ALIASES)
-    email_col = _find_column(base, EMAIL_COLUMN_ALIASES)
+    cliente_col = find_column(base, {"nombre_cliente", "cliente", "nombre"})
+    oper_col = find_column(base, OPERATION_COLUMN_ALIASES)
+    email_col = find_column(base, EMAIL_COLUMN_ALIASES)
 
     if not (cliente_col and oper_col and email_col):
         raise ValueError("Faltan columnas requeridas para Santander Consumer Telefonía (cliente, operacion, mail).")
@@ -1364,8 +1313,8 @@ def _build_sc_telefonia_medios_pago(df: pd.DataFrame, template: MailTemplate) ->
     base = df.copy()
     base.columns = [str(col).strip() for col in base.columns]
 
-    rut_col = _find_column(base, RUT_COLUMN_ALIASES)
-    email_col = _find_column(base, EMAIL_COLUMN_ALIASES)
+    rut_col = find_column(base, RUT_COLUMN_ALIASES)
+    email_col = find_column(base, EMAIL_COLUMN_ALIASES)
 
     if not (rut_col and email_col):
         raise ValueError("Faltan columnas requeridas para Medios de Pago Telefonía (RUT y MAIL).")
@@ -1403,23 +1352,6 @@ def _build_sc_telefonia_medios_pago(df: pd.DataFrame, template: MailTemplate) ->
     return pd.concat([seed, output], ignore_index=True)
 
 
-def _find_column(df: pd.DataFrame, candidates: set[str]) -> Optional[str]:
-    def norm(value: str) -> str:
-        return (
-            value.lower()
-            .replace(" ", "")
-            .replace("_", "")
-            .replace("-", "")
-        )
-
-    lowered = {norm(col): col for col in df.columns}
-    for candidate in candidates:
-        key = norm(candidate)
-        if key in lowered:
-            return lowered[key]
-    return None
-
-
 def _format_expected_columns(field_map: dict[str, set[str]]) -> str:
     parts = []
     for logical_name, aliases in field_map.items():
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 from datetime import datetime
-import re
-import unicodedata
 
 import pandas as pd
 
+from services.column_resolver import AliasTable, alnum_key
+
 
 COLUMNAS_CRM = [
     "Nro_Documento", "RUT - DV", "NOMBRE", "AD1", "NombreProducto", "AD2", "AD3", "AD4", "AD5", "AD6", "AD7",
@@ -20,36 +20,41 @@ COLUMNAS_CRM = [
 ]
 
 
-def _normalize_text(value: str) -> str:
-    txt = unicodedata.normalize("NFKD", str(value or ""))
-    txt = txt.encode("ascii", "ignore").decode("ascii")
-    txt = txt.lower()
-    txt = re.sub(r"[^a-z0-9]+", "", txt)
-    return txt
-
-
 def _find_header_row(raw: pd.DataFrame) -> int:
-    target = _normalize_text("N° Contrato")
+    target = alnum_key("N° Contrato")
     for i in range(len(raw.index)):
         vals = raw.iloc[i].fillna("").astype(str).tolist()
-        if any(_normalize_text(v) == target for v in vals):
+        if any(alnum_key(v) == target for v in vals):
             return i
     raise ValueError("No se encontro la fila de encabezados (que contenga 'N° Contrato').")
 
 
-def _find_col(df: pd.DataFrame, aliases: set[str]) -> str | None:
-    by_norm = {_normalize_text(col): col for col in df.columns}
-    for alias in aliases:
-        key = _normalize_text(alias)
-        if key in by_norm:
-            return by_norm[key]
-    return None
-
-
 def _as_clean_text(series: pd.Series) -> pd.Series:
     return series.fillna("").astype(str).str.replace(r"\.0$", "", regex=True).str.strip()
 
 
+PORSCHE_COLUMNS = AliasTable(
+    {
+        "CONTRATO": {"N° Contrato", "Nro Contrato", "No Contrato"},
+        "RUT": {"Rut Cliente", "RUT Cliente"},
+        "NOMBRE": {"Nombre Cliente"},
+        "CUOTAS_PAGADAS": {"Cuotas Pagadas"},
+        "CUOTAS_TOTALES": {"Cuotas Totales"},
+        "CUOTAS_MORA": {"Cuotas en mora"},
+        "INTERESES_MORA": {"Intereses Mora"},
+        "GASTOS": {"Gastos Cobranza"},
+        "VALOR_CUOTA": {"Valor Cuota"},
+        "MONTO_ADEUDADO": {"Monto Adeudado"},
+        "MARCA": {"Marca Vehiculo", "Marca Vehiculo", "Marca Vehiculo", "Marca Vehículo"},
+        "MODELO": {"Modelo Vehiculo", "Modelo Vehículo"},
+        "EMAIL": {"E-mail", "Email", "Correo"},
+        "FONO": {"Fono cliente", "Telefono cliente"},
+        "TRAMO": {"Tramo de mora"},
+    },
+    normalize=alnum_key,
+)
+
+
 def build_porsche_asignacion(df_input: pd.DataFrame) -> pd.DataFrame:
     raw = df_input.copy()
     header_idx = _find_header_row(raw)
@@ -59,21 +64,22 @@ def build_porsche_asignacion(df_input: pd.DataFrame) -> pd.DataFrame:
     df.columns = headers
     df = df.dropna(how="all").reset_index(drop=True)
 
-    contrato_col = _find_col(df, {"N° Contrato", "Nro Contrato", "No Contrato"})
-    rut_col = _find_col(df, {"Rut Cliente", "RUT Cliente"})
-    nombre_col = _find_col(df, {"Nombre Cliente"})
-    cuotas_pagadas_col = _find_col(df, {"Cuotas Pagadas"})
-    cuotas_totales_col = _find_col(df, {"Cuotas Totales"})
-    cuotas_mora_col = _find_col(df, {"Cuotas en mora"})
-    intereses_mora_col = _find_col(df, {"Intereses Mora"})
-    gastos_col = _find_col(df, {"Gastos Cobranza"})
-    valor_cuota_col = _find_col(df, {"Valor Cuota"})
-    monto_adeudado_col = _find_col(df, {"Monto Adeudado"})
-    marca_col = _find_col(df, {"Marca Vehiculo", "Marca Vehiculo", "Marca Vehiculo", "Marca Vehículo"})
-    modelo_col = _find_col(df, {"Modelo Vehiculo", "Modelo Vehículo"})
-    email_col = _find_col(df, {"E-mail", "Email", "Correo"})
-    fono_col = _find_col(df, {"Fono cliente", "Telefono cliente"})
-    tramo_col = _find_col(df, {"Tramo de mora"})
+    cols = PORSCHE_COLUMNS.resolve(df)
+    contrato_col = cols["CONTRATO"]
+    rut_col = cols["RUT"]
+    nombre_col = cols["NOMBRE"]
+    cuotas_pagadas_col = cols["CUOTAS_PAGADAS"]
+    cuotas_totales_col = cols["CUOTAS_TOTALES"]
+    cuotas_mora_col = cols["CUOTAS_MORA"]
+    intereses_mora_col = cols["INTERESES_MORA"]
+    gastos_col = cols["GASTOS"]
+    valor_cuota_col = cols["VALOR_CUOTA"]
+    monto_adeudado_col = cols["MONTO_ADEUDADO"]
+    marca_col = cols["MARCA"]
+    modelo_col = cols["MODELO"]
+    email_col = cols["EMAIL"]
+    fono_col = cols["FONO"]
+    tramo_col = cols["TRAMO"]
 
     required = {
         "N° Contrato": contrato_col,
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import io
+import time
+from typing import IO, Any, Optional
+
+import chardet
+from openpyxl import load_workbook
+
+from services.column_resolver import AliasTable
+from services.constants import COLUMN_MAP
+from services.ivr_service import IVR_COLUMNS, POSSIBLE_NAMES as IVR_NAMES
+from services.mail_service import MAIL_COLUMNS, REQUIRED_COLUMNS as MAIL_NAMES
+from services.sms_itau_vencida import CARTERIZADO_ALIASES, MASIVIDAD_ALIASES
+from services.sms_service import ALIAS_GROUPS as SMS_NAMES, SMS_COLUMNS
+
+SAMPLE_ROWS = 5
+CSV_SAMPLE_BYTES = 64 * 1024
+CHARDET_SAMPLE_BYTES = 8 * 1024
+
+# Union de los alias de todos los generadores: solo para el resumen sin proceso.
+FIELD_ALIASES: dict[str, set[str]] = {
+    "RUT": SMS_NAMES["RUT"] | IVR_NAMES["RUT"] | MAIL_NAMES["RUT"],
+    "OP": SMS_NAMES["OP"] | IVR_NAMES["OP"] | MAIL_NAMES["OPERACION"],
+    "FONO": SMS_NAMES["FONO"] | IVR_NAMES["TELEFONO"],
+    "MAIL": set(COLUMN_MAP["mail"]) | MAIL_NAMES["MAIL"],
+    "NOMBRE": IVR_NAMES["NOMBRE"] | MAIL_NAMES["NOMBRE"],
+    "MENSAJE": {"mensaje"} | set(COLUMN_MAP["mensaje"]),
+    "CARTERIZADO": set(CARTERIZADO_ALIASES),
+    "MASIVIDAD": set(MASIVIDAD_ALIASES),
+    "USUARIO": set(IVR_NAMES["USUARIO"]),
+}
+
+PREFLIGHT_COLUMNS = AliasTable(FIELD_ALIASES)
+
+# Itau resuelve estas columnas con find_column (compact_key), igual que esta tabla.
+ITAU_COLUMNS = AliasTable({"CARTERIZADO": CARTERIZADO_ALIASES, "MASIVIDAD": MASIVIDAD_ALIASES})
+
+# Por proceso, cada campo se resuelve con la tabla (y normalizacion) del generador: campo -> (tabla, campo en la tabla).
+_SMS_FIELDS = {"RUT": (SMS_COLUMNS, "RUT"), "OP": (SMS_COLUMNS, "OP"), "FONO": (SMS_COLUMNS, "FONO")}
+_IVR_FIELDS = {
+    "RUT": (IVR_COLUMNS, "RUT"),
+    "OP": (IVR_COLUMNS, "OP"),
+    "FONO": (IVR_COLUMNS, "TELEFONO"),
+    "NOMBRE": (IVR_COLUMNS, "NOMBRE"),
+}
+PROCESS_TABLES: dict[str, dict[str, tuple[AliasTable, str]]] = {
+    "sms": _SMS_FIELDS,
+    "sms_itau": {**_SMS_FIELDS, "CARTERIZADO": (ITAU_COLUMNS, "CARTERIZADO"), "MASIVIDAD": (ITAU_COLUMNS, "MASIVIDAD")},
+    "ivr": _IVR_FIELDS,
+    "ivr_crm": _IVR_FIELDS,
+    "mail_crm": {
+        "RUT": (MAIL_COLUMNS, "RUT"),
+        "OP": (MAIL_COLUMNS, "OPERACION"),
+        "MAIL": (MAIL_COLUMNS, "MAIL"),
+        "NOMBRE": (MAIL_COLUMNS, "NOMBRE"),
+    },
+}
+
+PROCESS_FIELDS: dict[str, tuple[str, ...]] = {
+    "sms": ("RUT", "OP", "FONO"),
+    "sms_itau": ("RUT", "OP", "FONO", "CARTERIZADO", "MASIVIDAD"),
+    "ivr": ("FONO",),
+    "ivr_crm": ("RUT", "OP", "FONO"),
+    "mail_crm": ("RUT", "OP", "MAIL"),
+}
+
+
+def map_fields(columns: list[str], proceso: str = "") -> dict[str, Optional[str]]:
+    """Primera columna del archivo que calza con cada campo logico (None si no hay).
+
+    Con ``proceso`` se usan las tablas del generador, asi un campo detectado es uno que el
+    generador acepta; sin proceso se usa la union de alias.
+    """
+    if not proceso:
+        return PREFLIGHT_COLUMNS.resolve(columns)
+    return {field: table.column(columns, logical) for field, (table, logical) in PROCESS_TABLES[proceso].items()}
+
+
+def _cell_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _stream_size(stream: IO[bytes]) -> int:
+    stream.seek(0, io.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    return size
+
+
+def _inspect_xlsx(stream: IO[bytes]) -> dict[str, Any]:
+    workbook = load_workbook(stream, read_only=True, data_only=True, keep_links=False)
+    try:
+        sheet = workbook.worksheets[0]
+        rows = [
+            [_cell_text(value) for value in row]
+            for row in sheet.iter_rows(min_row=1, max_row=SAMPLE_ROWS + 1, values_only=True)
+        ]
+        # En modo read_only max_row sale de la dimension declarada en el archivo (sin recorrerlo).
+        max_row = sheet.max_row
+        return {
+            "format": "xlsx",
+            "sheet": sheet.title,
+            "encoding": None,
+            "delimiter": None,
+            "header": rows[0] if rows else [],
+            "rows": rows[1:],
+            "rows_estimate": max(max_row - 1, 0) if max_row else None,
+            "rows_exact": False,
+        }
+    finally:
+        workbook.close()
+
+
+def _detect_encoding(head: bytes) -> str:
+    # chardet es lento: solo se usa si el archivo no es UTF-8 valido.
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError:
+        return chardet.detect(head[:CHARDET_SAMPLE_BYTES]).get("encoding") or "latin-1"
+    return "utf-8-sig" if head.startswith(codecs.BOM_UTF8) else "utf-8"
+
+
+def _inspect_csv(stream: IO[bytes], size: int) -> dict[str, Any]:
+    head = stream.read(CSV_SAMPLE_BYTES)
+    complete = len(head) >= size
+    if not complete and b"\n" in head:
+        head = head[: head.rfind(b"\n") + 1]
+    encoding = _detect_encoding(head)
+    text = head.decode(encoding, errors="replace")
+    try:
+        delimiter = csv.Sniffer().sniff(text[:8192], delimiters=";,\t|").delimiter
+    except csv.Error:
+        delimiter = ";"
+    lines = text.splitlines()
+    rows = [row for row in csv.reader(lines[: SAMPLE_ROWS + 1], delimiter=delimiter)]
+
+    data_lines = max(len(lines) - 1, 0)
+    if complete:
+        estimate = data_lines
+    else:
+        estimate = int(size / (len(head) / max(len(lines), 1))) - 1
+    return {
+        "format": "csv",
+        "sheet": None,
+        "encoding": encoding,
+        "delimiter": delimiter,
+        "header": rows[0] if rows else [],
+        "rows": rows[1:],
+        "rows_estimate": max(estimate, 0),
+        "rows_exact": complete,
+    }
+
+
+def inspect_upload(stream: IO[bytes], filename: str, proceso: str = "") -> dict[str, Any]:
+    """Lee solo el encabezado y algunas filas del archivo para validar antes de procesarlo."""
+    if proceso and proceso not in PROCESS_FIELDS:
+        raise ValueError(f"Proceso desconocido: {proceso}. Usa {', '.join(PROCESS_FIELDS)}.")
+    started = time.perf_counter()
+    name = (filename or "").lower()
+    size = _stream_size(stream)
+    if name.endswith((".xlsx", ".xlsm")):
+        info = _inspect_xlsx(stream)
+    elif name.endswith((".csv", ".txt")):
+        info = _inspect_csv(stream, size)
+    else:
+        raise ValueError("Formato no soportado para validación previa (usa XLSX o CSV).")
+
+    header = info.pop("header")
+    sample = info.pop("rows")
+    fields = map_fields([col for col in header if col], proceso)
+    required = PROCESS_FIELDS[proceso] if proceso else ()
+    return {
+        "ok": True,
+        "filename": filename,
+        "size_bytes": size,
+        **info,
+        "columns": header,
+        "fields": fields,
+        "proceso": proceso or None,
+        "missing": [field for field in required if not fields.get(field)],
+        "sample": sample,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
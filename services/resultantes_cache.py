@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from utils.paths import storage_path
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+_READ_CHUNK = 256 * 1024
+
+
+def cache_dir() -> Path:
+    return storage_path("cache", "resultantes")
+
+
+def cache_enabled() -> bool:
+    return os.getenv("RESULTANTES_CACHE_ENABLED", "1").lower() in {"1", "true", "yes"}
+
+
+def _ttl_seconds() -> float:
+    return float(os.getenv("RESULTANTES_CACHE_TTL", str(7 * 24 * 3600)))
+
+
+def _max_bytes() -> int:
+    return int(float(os.getenv("RESULTANTES_CACHE_MAX_MB", "512")) * 1024 * 1024)
+
+
+def is_cacheable_range(fecha_fin: date, today: Optional[date] = None) -> bool:
+    """Solo se guardan rangos cerrados: la fecha final debe ser anterior a hoy."""
+    return fecha_fin < (today or date.today())
+
+
+def cache_key(mandante: str, identity: dict[str, Any], fecha_inicio: date, fecha_fin: date) -> str:
+    payload = {
+        "version": CACHE_FORMAT_VERSION,
+        "mandante": mandante,
+        "identity": identity,
+        "fecha_inicio": fecha_inicio.isoformat(),
+        "fecha_fin": fecha_fin.isoformat(),
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=True)
+    return hashlib.sha256(raw.encode("ascii")).hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return cache_dir() / f"{key}.bin"
+
+
+def _remove(path: Path) -> None:
+    # En Windows un archivo abierto por otra descarga no se puede borrar; se reintenta luego.
+    try:
+        path.unlink(missing_ok=True)
+    except OSError as exc:
+        logger.debug("No se pudo eliminar %s de la cache: %s", path.name, exc)
+
+
+def lookup(key: str) -> Optional[Path]:
+    path = _entry_path(key)
+    try:
+        age = time.time() - path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    if age >= _ttl_seconds():
+        _remove(path)
+        return None
+    return path
+
+
+def iter_file(path: Path) -> Iterator[bytes]:
+    """Abre la entrada de inmediato (FileNotFoundError si fue eliminada) y la lee por bloques."""
+    handle = path.open("rb")
+
+    def chunks() -> Iterator[bytes]:
+        with handle:
+            while True:
+                chunk = handle.read(_READ_CHUNK)
+                if not chunk:
+                    break
+                yield chunk
+
+    return chunks()
+
+
+def store_stream(key: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Reenvia ``chunks`` y los guarda en cache; la entrada se publica solo si el
+    stream termina completo."""
+    directory = cache_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{key}.", suffix=".tmp", dir=str(directory))
+    completed = False
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+                yield chunk
+        try:
+            os.replace(tmp_name, _entry_path(key))
+            completed = True
+        except OSError as exc:
+            logger.debug("No se pudo publicar la resultante en cache (%s): %s", key, exc)
+    finally:
+        if not completed:
+            _remove(Path(tmp_name))
+    evict()
+
+
+def store_bytes(key: str, payload: bytes) -> None:
+    for _ in store_stream(key, [payload]):
+        pass
+
+
+def evict() -> None:
+    directory = cache_dir()
+    if not directory.exists():
+        return
+    now = time.time()
+    ttl = _ttl_seconds()
+    entries: list[tuple[float, int, Path]] = []
+    for path in directory.glob("*.bin"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        if now - stat.st_mtime >= ttl:
+            _remove(path)
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    limit = _max_bytes()
+    for _, size, path in sorted(entries):
+        if total <= limit:
+            break
+        _remove(path)
+        total -= size
+        logger.debug("Resultante eliminada de cache por tamano: %s", path.name)
+
+
+def clear() -> None:
+    directory = cache_dir()
+    if not directory.exists():
+        return
+    for path in directory.glob("*.bin"):
+        _remove(path)
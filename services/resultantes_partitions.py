@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Optional
+
+import pandas as pd
+
+from utils.paths import storage_path
+
+logger = logging.getLogger(__name__)
+
+_SUFFIX = ".pkl.gz"
+
+
+def _retention_days() -> int:
+    return int(os.getenv("RESULTANTES_PARTITION_RETENTION_DAYS", "62"))
+
+
+def partition_dir(mandante: str, identity: dict[str, Any]) -> Path:
+    """Carpeta de particiones diarias; cambia si cambia la cartera o la consulta."""
+    raw = json.dumps(identity, sort_keys=True, ensure_ascii=True)
+    digest = hashlib.sha256(raw.encode("ascii")).hexdigest()[:16]
+    return storage_path("cache", "resultantes_diario", mandante.lower().replace(" ", "_"), digest)
+
+
+def _day_path(directory: Path, day: date) -> Path:
+    return directory / f"{day.isoformat()}{_SUFFIX}"
+
+
+def load_day(directory: Path, day: date) -> Optional[pd.DataFrame]:
+    path = _day_path(directory, day)
+    if not path.exists():
+        return None
+    try:
+        return pd.read_pickle(path, compression="gzip")
+    except Exception as exc:
+        logger.debug("Particion ilegible %s, se vuelve a consultar: %s", path.name, exc)
+        return None
+
+
+def save_day(directory: Path, day: date, df: pd.DataFrame) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{day.isoformat()}.", suffix=".tmp", dir=str(directory))
+    os.close(fd)
+    try:
+        df.to_pickle(tmp_name, compression="gzip")
+        os.replace(tmp_name, _day_path(directory, day))
+    except Exception:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def cleanup(directory: Path, today: Optional[date] = None) -> None:
+    if not directory.exists():
+        return
+    cutoff = (today or date.today()) - timedelta(days=_retention_days())
+    for path in directory.glob(f"*{_SUFFIX}"):
+        try:
+            day = date.fromisoformat(path.name[: -len(_SUFFIX)])
+        except ValueError:
+            continue
+        if day < cutoff:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as exc:
+                logger.debug("No se pudo eliminar particion %s: %s", path.name, exc)
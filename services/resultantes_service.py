@@ -1,13 +1,18 @@
 from __future__ import annotations
 
-from datetime import date, datetime
-from typing import Any
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Iterable, Iterator
 
 import pandas as pd
 
 from repositories import resultantes_repo
+from services import resultantes_cache, resultantes_partitions
+from services.jobs import report_progress
 from utils.excel_export import df_to_xlsx_bytes
 
+logger = logging.getLogger(__name__)
+
 
 SUPPORTED_RESULTANTES_MANDANTES = [
     "TANNER",
@@ -70,33 +75,160 @@ def _sanitize_field(value: Any) -> str:
     return text.replace("\r", " ").replace("\n", " ").replace("|", "/")
 
 
+def _iter_tanner_txt(batches: Iterable[list[dict[str, Any]]]) -> Iterator[bytes]:
+    """Codifica cada lote de filas como lineas pipe-delimited en latin-1."""
+    written = 0
+    for rows in batches:
+        if not rows:
+            continue
+        written += len(rows)
+        report_progress(done=written)
+        lines = [
+            "|".join(_sanitize_field(row.get(field, "")) for field in TANNER_OUTPUT_FIELDS) + "|\n"
+            for row in rows
+        ]
+        yield "".join(lines).encode("latin-1", errors="replace")
+
+
 def _build_tanner_txt(rows: list[dict[str, Any]]) -> bytes:
-    if not rows:
-        return b""
+    return b"".join(_iter_tanner_txt([rows]))
+
+
+def _porsche_frame(batches: Iterable[list[dict[str, Any]]]) -> pd.DataFrame:
+    frames = [pd.DataFrame(rows).reindex(columns=PORSCHE_OUTPUT_COLUMNS) for rows in batches if rows]
+    if not frames:
+        return pd.DataFrame(columns=PORSCHE_OUTPUT_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _build_porsche_xlsx(batches: Iterable[list[dict[str, Any]]]) -> bytes:
+    return df_to_xlsx_bytes(_porsche_frame(batches), sheet_name="Gestiones")
+
+
+def _gestion_days(values: pd.Series) -> pd.Series:
+    """Dia de cada "Fecha de Gestion": acepta datetime, texto ISO (AAAA-MM-DD...) o DD-MM-AAAA."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.dt.date
+    text = values.astype("string").str.strip()
+    year_first = text.str.match(r"^\d{4}[-/]").fillna(False).astype(bool)
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    if year_first.any():
+        parsed[year_first] = pd.to_datetime(text[year_first], format="ISO8601", errors="coerce")
+    if (~year_first).any():
+        parsed[~year_first] = pd.to_datetime(text[~year_first], dayfirst=True, format="mixed", errors="coerce")
+    return parsed.dt.date
 
-    lines: list[str] = []
-    for row in rows:
-        values = [_sanitize_field(row.get(field, "")) for field in TANNER_OUTPUT_FIELDS]
-        lines.append("|".join(values) + "|")
 
-    return ("\n".join(lines) + "\n").encode("latin-1", errors="replace")
+def _porsche_consolidado_frame(fecha_inicio: date, fecha_fin: date, refresh: bool = False) -> pd.DataFrame:
+    """Une particiones diarias guardadas para los dias cerrados y consulta solo hoy.
 
+    Los dias cerrados que faltan se consultan en un solo rango y se reparten por
+    "Fecha de Gestion" antes de guardarse.
+    """
+    identity = resultantes_repo.query_identity("PORSCHE")
+    if identity is None:
+        return _porsche_frame(resultantes_repo.iter_porsche_resultantes(fecha_inicio, fecha_fin))
 
-def _build_porsche_xlsx(rows: list[dict[str, Any]]) -> bytes:
-    if not rows:
-        df = pd.DataFrame(columns=PORSCHE_OUTPUT_COLUMNS)
+    today = date.today()
+    directory = resultantes_partitions.partition_dir("PORSCHE", identity)
+    closed_end = min(fecha_fin, today - timedelta(days=1))
+    days = [fecha_inicio + timedelta(days=offset) for offset in range((closed_end - fecha_inicio).days + 1)]
+
+    by_day: dict[date, pd.DataFrame] = {}
+    if not refresh:
+        for day in days:
+            cached = resultantes_partitions.load_day(directory, day)
+            if cached is not None:
+                by_day[day] = cached
+
+    missing = [day for day in days if day not in by_day]
+    if missing:
+        queried = _porsche_frame(resultantes_repo.iter_porsche_resultantes(missing[0], missing[-1]))
+        gestion_days = _gestion_days(queried["Fecha de Gestion"])
+        parts = {day: queried.loc[gestion_days == day].reset_index(drop=True) for day in missing}
+        # La consulta trae tambien los dias ya guardados entre missing[0] y missing[-1].
+        in_range = sum(len(part) for part in parts.values()) + int(
+            gestion_days.isin([day for day in days if missing[0] <= day <= missing[-1] and day not in parts]).sum()
+        )
+        if in_range != len(queried):
+            # Fechas que no calzan con ningun dia consultado: no se guardan particiones incompletas.
+            logger.warning(
+                "Resultantes Porsche: %s de %s filas sin dia reconocible en 'Fecha de Gestion' entre %s y %s; no se guardan particiones.",
+                len(queried) - in_range,
+                len(queried),
+                missing[0],
+                missing[-1],
+            )
+            # La consulta cubre todo [missing[0], missing[-1]]: reemplaza tambien los dias guardados de ese tramo.
+            frames = [by_day[day] for day in days if day < missing[0]]
+            frames.append(queried)
+            frames.extend(by_day[day] for day in days if day > missing[-1])
+        else:
+            for day, part in parts.items():
+                resultantes_partitions.save_day(directory, day, part)
+                by_day[day] = part
+            resultantes_partitions.cleanup(directory, today)
+            frames = [by_day[day] for day in days]
     else:
-        df = pd.DataFrame(rows)
-        df = df.reindex(columns=PORSCHE_OUTPUT_COLUMNS)
-    return df_to_xlsx_bytes(df, sheet_name="Gestiones")
+        frames = [by_day[day] for day in days]
 
+    if fecha_fin >= today:
+        frames.append(_porsche_frame(resultantes_repo.iter_porsche_resultantes(max(fecha_inicio, today), fecha_fin)))
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame(columns=PORSCHE_OUTPUT_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
 
-def build_resultante_file(
+
+def _primed(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    # Adelanta el primer bloque para que los errores de consulta ocurran antes de responder.
+    first = next(chunks, None)
+    if first is None:
+        return iter(())
+
+    def replay() -> Iterator[bytes]:
+        try:
+            yield first
+            yield from chunks
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+
+    return replay()
+
+
+def _cached_or_query(
+    mandante_key: str,
+    fecha_inicio: date,
+    fecha_fin: date,
+    produce: Callable[[], Iterator[bytes]],
+    use_cache: bool,
+) -> Iterator[bytes]:
+    identity = resultantes_repo.query_identity(mandante_key)
+    if not (resultantes_cache.cache_enabled() and identity and resultantes_cache.is_cacheable_range(fecha_fin)):
+        return produce()
+
+    key = resultantes_cache.cache_key(mandante_key, identity, fecha_inicio, fecha_fin)
+    if use_cache:
+        cached = resultantes_cache.lookup(key)
+        if cached is not None:
+            try:
+                return resultantes_cache.iter_file(cached)
+            except FileNotFoundError:
+                pass
+    return resultantes_cache.store_stream(key, produce())
+
+
+def stream_resultante_file(
     mandante: str,
     fecha_inicio: date,
     fecha_fin: date,
     modo: str = "rango",
-) -> tuple[bytes, str, str]:
+    use_cache: bool = True,
+) -> tuple[Iterator[bytes], str, str]:
+    """Devuelve el contenido por bloques; los rangos ya cerrados se sirven desde
+    la cache en disco salvo que ``use_cache`` sea False (en ese caso se regenera)."""
     mandante_key = (mandante or "").strip().upper()
     if mandante_key not in SUPPORTED_RESULTANTES_MANDANTES:
         raise ValueError("Mandante de resultantes no soportado.")
@@ -104,17 +236,36 @@ def build_resultante_file(
     fecha_tag = fecha_inicio.strftime("%Y%m%d")
 
     if mandante_key == "TANNER":
-        rows = resultantes_repo.fetch_tanner_resultantes(fecha_inicio, fecha_fin)
-        payload = _build_tanner_txt(rows)
+        def produce() -> Iterator[bytes]:
+            return _iter_tanner_txt(resultantes_repo.iter_tanner_resultantes(fecha_inicio, fecha_fin))
+
+        chunks = _cached_or_query(mandante_key, fecha_inicio, fecha_fin, produce, use_cache)
         filename = f"{fecha_tag}_BaseGestiones2_200.txt"
-        return payload, filename, "text/plain; charset=latin-1"
+        return _primed(chunks), filename, "text/plain; charset=latin-1"
 
     if mandante_key == "PORSCHE":
-        rows = resultantes_repo.fetch_porsche_resultantes(fecha_inicio, fecha_fin)
-        payload = _build_porsche_xlsx(rows)
+        def produce() -> Iterator[bytes]:
+            if (modo or "").strip().lower() == "consolidado":
+                df = _porsche_consolidado_frame(fecha_inicio, fecha_fin, refresh=not use_cache)
+                return iter([df_to_xlsx_bytes(df, sheet_name="Gestiones")])
+            return iter([_build_porsche_xlsx(resultantes_repo.iter_porsche_resultantes(fecha_inicio, fecha_fin))])
+
+        chunks = _cached_or_query(mandante_key, fecha_inicio, fecha_fin, produce, use_cache)
         filename = f"Gestiones_{fecha_fin.strftime('%Y%m%d')}.xlsx"
-        return payload, filename, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        return _primed(chunks), filename, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
-    payload = b""
     filename = f"resultantes_{mandante_key.replace(' ', '_')}_{fecha_tag}.txt"
-    return payload, filename, "text/plain; charset=utf-8"
+    return iter(()), filename, "text/plain; charset=utf-8"
+
+
+def build_resultante_file(
+    mandante: str,
+    fecha_inicio: date,
+    fecha_fin: date,
+    modo: str = "rango",
+    use_cache: bool = True,
+) -> tuple[bytes, str, str]:
+    chunks, filename, mimetype = stream_resultante_file(
+        mandante, fecha_inicio, fecha_fin, modo=modo, use_cache=use_cache
+    )
+    return b"".join(chunks), filename, mimetype
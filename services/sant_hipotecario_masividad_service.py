@@ -5,6 +5,8 @@ from datetime import datetime
 import numpy as np
 import pandas as pd
 
+from utils.excel_export import write_df_xlsx
+
 
 def generar_masividad(df: pd.DataFrame, output_dir: str) -> dict:
     """Genera Excel Masividad desde df base."""
@@ -76,6 +78,6 @@ def generar_masividad(df: pd.DataFrame, output_dir: str) -> dict:
     masiv_name = f"Masividad Hipotecario {fecha_actual}.xlsx"
     masiv_path = os.path.join(output_dir, masiv_name)
 
-    df_mas.to_excel(masiv_path, index=False)
+    write_df_xlsx(df_mas, masiv_path, sheet_name="Sheet1")
 
     return {"masiv_path": masiv_path, "masiv_name": masiv_name, "df": df_mas}
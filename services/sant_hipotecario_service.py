@@ -6,6 +6,8 @@ from datetime import datetime
 import pandas as pd
 import chardet
 
+from utils.excel_export import write_df_xlsx
+
 
 def _detect_encoding(file_bytes: bytes) -> str:
     result = chardet.detect(file_bytes)
@@ -86,6 +88,6 @@ def generar_crm(df: pd.DataFrame, output_dir: str) -> dict:
     crm_name = f"ARCHIVO DE CARGA ASIGNACION HIPOTECARIO {fecha_actual}.xlsx"
     crm_path = os.path.join(output_dir, crm_name)
 
-    df_crm.to_excel(crm_path, index=False)
+    write_df_xlsx(df_crm, crm_path, sheet_name="Sheet1")
 
     return {"crm_path": crm_path, "crm_name": crm_name}
@@ -1,14 +1,12 @@
 from __future__ import annotations
 
-import json
 import unicodedata
-from difflib import SequenceMatcher
 
 import pandas as pd
 
 from repositories import ejecutivos_repo
-from services import config_store
-from utils.paths import config_path
+from services import ejecutivos_directory
+from services.template_registry import TemplateRegistry
 
 
 SC_EXECUTIVE_MANDANTE = "Santander Consumer Terreno"
@@ -38,50 +36,7 @@ def resolve_ejecutivo(nombre: str, exec_cache: dict[str, ejecutivos_repo.Ejecuti
     if cache_key in exec_cache:
         return exec_cache[cache_key]
 
-    candidates = [
-        raw,
-        raw.lower(),
-        raw.upper(),
-        ascii_fold(raw),
-        ascii_fold(raw).lower(),
-        ascii_fold(raw).upper(),
-    ]
-
-    found = None
-    seen: set[str] = set()
-    for candidate in candidates:
-        candidate = normalize_agent_text(candidate)
-        if not candidate or candidate in seen:
-            continue
-        seen.add(candidate)
-        found = ejecutivos_repo.fetch_by_mandante_and_nombre(SC_EXECUTIVE_MANDANTE, candidate)
-        if found:
-            break
-
-    if not found:
-        target = ascii_fold(raw).lower().strip()
-        target_tokens = token_key(raw)
-        best_match = None
-        best_score = 0.0
-        for ejecutivo in ejecutivos_repo.list_ejecutivos(mandante=SC_EXECUTIVE_MANDANTE, activos=True):
-            options = [
-                ascii_fold(ejecutivo.nombre_mostrar or "").lower().strip(),
-                (ejecutivo.nombre_clave or "").replace("_", " ").lower().strip(),
-                token_key(ejecutivo.nombre_mostrar or ""),
-                token_key((ejecutivo.nombre_clave or "").replace("_", " ")),
-            ]
-            for option in options:
-                if not option:
-                    continue
-                score = max(
-                    SequenceMatcher(None, target, option).ratio(),
-                    SequenceMatcher(None, target_tokens, option).ratio(),
-                )
-                if score > best_score:
-                    best_score = score
-                    best_match = ejecutivo
-        found = best_match if best_match and best_score >= 0.92 else None
-
+    found = ejecutivos_directory.get_directory(SC_EXECUTIVE_MANDANTE).resolve(raw)
     exec_cache[cache_key] = found
     return found
 
@@ -101,32 +56,28 @@ _DEFAULT_SUPERVISOR_RM = {
 }
 
 
-def load_supervisors() -> dict[str, dict[str, str]]:
-    defaults = {
-        "supervisor_regiones": _DEFAULT_SUPERVISOR_REGIONES,
-        "supervisor_rm": _DEFAULT_SUPERVISOR_RM,
-    }
-    path = config_path("santander_consumer_supervisors.json")
-    if not path.exists():
-        return defaults
+_SUPERVISOR_DEFAULTS = {
+    "supervisor_regiones": _DEFAULT_SUPERVISOR_REGIONES,
+    "supervisor_rm": _DEFAULT_SUPERVISOR_RM,
+}
+
 
-    try:
-        raw = config_store.read_json("santander_consumer_supervisors.json")
-        loaded = {}
-        for key, fallback in defaults.items():
-            item = raw.get(key) or {}
-            loaded[key] = {
-                field: str(item.get(field) or fallback[field]).strip()
-                for field in fallback
-            }
-    except (OSError, TypeError, ValueError, json.JSONDecodeError):
-        return defaults
-    return loaded
+def _build_supervisors(raw: dict) -> list[dict[str, str]]:
+    return [
+        {
+            "key": key,
+            **{field: str((raw.get(key) or {}).get(field) or fallback[field]).strip() for field in fallback},
+        }
+        for key, fallback in _SUPERVISOR_DEFAULTS.items()
+    ]
 
 
-_SUPERVISORS = load_supervisors()
-SUPERVISOR_REGIONES = _SUPERVISORS["supervisor_regiones"]
-SUPERVISOR_RM = _SUPERVISORS["supervisor_rm"]
+SUPERVISORS: TemplateRegistry[dict[str, str]] = TemplateRegistry(
+    "santander_consumer_supervisors.json",
+    _build_supervisors,
+    key=lambda item: item["key"],
+    defaults=[{"key": key, **fallback} for key, fallback in _SUPERVISOR_DEFAULTS.items()],
+)
 
 
 def apply_supervisor_override(df: pd.DataFrame, asignacion_mode: str) -> pd.DataFrame:
@@ -142,10 +93,10 @@ def apply_supervisor_override(df: pd.DataFrame, asignacion_mode: str) -> pd.Data
 
     if mode == "supervisor_regiones":
         mask = ~is_rm
-        supervisor = SUPERVISOR_REGIONES
+        supervisor = SUPERVISORS.get("supervisor_regiones")
     else:
         mask = is_rm
-        supervisor = SUPERVISOR_RM
+        supervisor = SUPERVISORS.get("supervisor_rm")
 
     out.loc[mask, "name_from"] = supervisor["name_from"]
     out.loc[mask, "EJECUTIVO"] = supervisor["name_from"]
@@ -4,10 +4,13 @@ from datetime import date, datetime
 
 import pandas as pd
 
+from services.column_resolver import find_column
 from services.contact_dedupe import dedupe_by_column_keep_first, dedupe_by_column_keep_first_normalized
+from services.jobs import report_progress
 from services.santander_consumer_templates import SantanderConsumerTemplate, get_santander_consumer_template
 from services import santander_consumer_assignments as sc_assignments
 from services import santander_consumer_sources as sc_sources
+from utils.excel_reader import read_input_table
 
 
 SPANISH_MONTHS = [
@@ -103,26 +106,6 @@ OPERATION_COLUMN_ALIASES = {
 }
 
 
-def _normalize_key(value: str) -> str:
-    return (
-        (value or "")
-        .strip()
-        .lower()
-        .replace(" ", "")
-        .replace("_", "")
-        .replace("-", "")
-    )
-
-
-def _find_operation_column(df: pd.DataFrame) -> str | None:
-    normalized = {_normalize_key(col): col for col in df.columns}
-    candidates = {_normalize_key(name) for name in OPERATION_COLUMN_ALIASES}
-    for candidate in candidates:
-        if candidate in normalized:
-            return normalized[candidate]
-    return None
-
-
 def _resolve_template(template_key: str) -> SantanderConsumerTemplate:
     template = get_santander_consumer_template(template_key)
     if not template:
@@ -142,7 +125,7 @@ def build_santander_consumer_terreno_output(
     if template.key == "medios_pago":
         return _build_medios_pago_output(base, template)
 
-    op_col = _find_operation_column(base)
+    op_col = find_column(base, OPERATION_COLUMN_ALIASES)
     if not op_col:
         raise ValueError("El Excel no contiene una columna de operación (ej: OPERACION, NRO_OPERACION, NUM_OP).")
 
@@ -151,6 +134,7 @@ def build_santander_consumer_terreno_output(
         raise ValueError("La columna de operación está vacía.")
 
     ops_to_query = list(dict.fromkeys([op for op in operation_values.tolist() if op]))
+    report_progress(total=len(operation_values), message="Consultando operaciones en base")
     db_rows = sc_sources.fetch_tmp_bench_rows(ops_to_query)
     now = datetime.now()
     mes_curso = SPANISH_MONTHS[now.month - 1]
@@ -167,11 +151,15 @@ def build_santander_consumer_terreno_output(
             ]
         )
     )
+    report_progress(message="Consultando correos")
     email_by_rut = sc_sources.fetch_emails_by_rut(ruts_to_query)
     exec_cache = {}
 
+    report_progress(done=0, message="Asignando ejecutivos")
     out_rows: list[dict[str, str]] = []
-    for op in operation_values.tolist():
+    for index, op in enumerate(operation_values.tolist(), start=1):
+        if index % 1000 == 0:
+            report_progress(done=index)
         row = db_rows.get(op)
         if row:
             rut_normalized = sc_sources.rut_only_numbers(row.get("fld_RUT"))
@@ -248,7 +236,7 @@ def build_santander_consumer_terreno_output(
 
 
 def _build_medios_pago_output(base: pd.DataFrame, template: SantanderConsumerTemplate) -> pd.DataFrame:
-    op_col = _find_operation_column(base)
+    op_col = find_column(base, OPERATION_COLUMN_ALIASES)
     if not op_col:
         raise ValueError("El Excel no contiene una columna de operación (ej: OPERACION, NRO_OPERACION, NUM_OP).")
 
@@ -306,7 +294,7 @@ def build_santander_consumer_terreno_from_excel(
     asignacion_mode: str = "normal",
     offer_deadline: date | None = None,
 ) -> pd.DataFrame:
-    df = pd.read_excel(file_storage, dtype=str)
+    df = read_input_table(file_storage, dtype=str)
     return build_santander_consumer_terreno_output(
         df,
         template_key=template_key,
@@ -1,10 +1,8 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 
-from services import config_store
-from utils.paths import config_path
+from services.template_registry import TemplateRegistry
 
 
 @dataclass(frozen=True)
@@ -26,33 +24,30 @@ _DEFAULT_SANTANDER_CONSUMER_TEMPLATES: tuple[SantanderConsumerTemplate, ...] = (
 )
 
 
-def _load_templates_from_config() -> tuple[SantanderConsumerTemplate, ...]:
-    path = config_path("santander_consumer_templates.json")
-    if not path.exists():
-        return _DEFAULT_SANTANDER_CONSUMER_TEMPLATES
-
-    try:
-        raw_items = config_store.read_json("santander_consumer_templates.json")
-        templates = tuple(
-            SantanderConsumerTemplate(
-                key=str(item["key"]).strip(),
-                label=str(item["label"]).strip(),
-                message_id=int(item["message_id"]),
-                nro_cuotas=str(item.get("nro_cuotas") or "").strip(),
-            )
-            for item in raw_items
+def _build_templates(raw_items: list[dict]) -> list[SantanderConsumerTemplate]:
+    return [
+        SantanderConsumerTemplate(
+            key=str(item["key"]).strip(),
+            label=str(item["label"]).strip(),
+            message_id=int(item["message_id"]),
+            nro_cuotas=str(item.get("nro_cuotas") or "").strip(),
         )
-    except (OSError, ValueError, TypeError, KeyError, json.JSONDecodeError):
-        return _DEFAULT_SANTANDER_CONSUMER_TEMPLATES
-    return templates or _DEFAULT_SANTANDER_CONSUMER_TEMPLATES
+        for item in raw_items
+    ]
 
 
-SANTANDER_CONSUMER_TEMPLATES: tuple[SantanderConsumerTemplate, ...] = _load_templates_from_config()
+SANTANDER_CONSUMER_TEMPLATES: TemplateRegistry[SantanderConsumerTemplate] = TemplateRegistry(
+    "santander_consumer_templates.json",
+    _build_templates,
+    key=lambda template: template.key,
+    message_id=lambda template: template.message_id,
+    defaults=_DEFAULT_SANTANDER_CONSUMER_TEMPLATES,
+)
+
+
+def list_santander_consumer_templates() -> tuple[SantanderConsumerTemplate, ...]:
+    return SANTANDER_CONSUMER_TEMPLATES.items()
 
 
 def get_santander_consumer_template(template_key: str) -> SantanderConsumerTemplate | None:
-    key = (template_key or "").strip().lower()
-    for template in SANTANDER_CONSUMER_TEMPLATES:
-        if template.key == key:
-            return template
-    return None
+    return SANTANDER_CONSUMER_TEMPLATES.get((template_key or "").strip().lower())
@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import re
-import unicodedata
 from datetime import date
 from typing import Any
 
@@ -9,9 +7,11 @@ import pandas as pd
 
 from config import EMAIL_RE
 from services import sc_telefonia_mail_sources
+from services.column_resolver import find_column, folded_key
 from services.contact_dedupe import dedupe_by_column_keep_first, dedupe_by_column_keep_first_normalized
 from services.sc_telefonia_mail_templates import get_default_sc_telefonia_mail_template, get_sc_telefonia_mail_template
 from services.santander_consumer_sources import normalize_operation
+from utils.excel_reader import read_input_table
 
 OPERATION_COLUMN_KEYS = {"OPERACION", "OP", "NRO OPERACION", "N OPERACION"}
 MONTHS_ES = {
@@ -30,20 +30,10 @@ MONTHS_ES = {
 }
 
 
-def normalize_header(value: object) -> str:
-    text = str(value or "").strip().upper()
-    text = "".join(
-        char for char in unicodedata.normalize("NFD", text)
-        if unicodedata.category(char) != "Mn"
-    )
-    text = re.sub(r"[_\-]+", " ", text)
-    return re.sub(r"\s+", " ", text)
-
-
 def find_operation_column(columns: list[object]) -> object:
-    for column in columns:
-        if normalize_header(column) in OPERATION_COLUMN_KEYS:
-            return column
+    column = find_column(columns, OPERATION_COLUMN_KEYS, folded_key)
+    if column is not None:
+        return column
     raise ValueError("El archivo debe contener una columna OPERACION, OP, NRO_OPERACION o N_OPERACION.")
 
 
@@ -161,7 +151,7 @@ def build_sc_telefonia_mail_from_excel(
     selected_date: date | None = None,
     executive_key: str = "",
 ) -> pd.DataFrame:
-    df_origin = pd.read_excel(file_storage)
+    df_origin = read_input_table(file_storage)
     return build_sc_telefonia_mail_output(
         df_origin,
         template_key=template_key,
@@ -1,31 +1,24 @@
 from __future__ import annotations
 
-from functools import lru_cache
 from typing import Any
 
-from services.config_store import read_json
+from services.template_registry import dict_template_registry
 
 CONFIG_FILENAME = "sc_telefonia_mail_templates.json"
 
+SC_TELEFONIA_MAIL_TEMPLATES = dict_template_registry(CONFIG_FILENAME)
+
 
-@lru_cache(maxsize=1)
 def list_sc_telefonia_mail_templates() -> list[dict[str, Any]]:
-    data = read_json(CONFIG_FILENAME, default=[])
-    if not isinstance(data, list):
-        return []
-    return [item for item in data if isinstance(item, dict)]
+    return list(SC_TELEFONIA_MAIL_TEMPLATES.items())
 
 
 def get_sc_telefonia_mail_template(key: str) -> dict[str, Any] | None:
-    key = (key or "").strip()
-    for item in list_sc_telefonia_mail_templates():
-        if item.get("key") == key:
-            return item
-    return None
+    return SC_TELEFONIA_MAIL_TEMPLATES.get((key or "").strip())
 
 
 def get_default_sc_telefonia_mail_template() -> dict[str, Any]:
-    templates = list_sc_telefonia_mail_templates()
+    templates = SC_TELEFONIA_MAIL_TEMPLATES.items()
     if not templates:
         raise ValueError("No hay plantillas Santander Consumer Telefonia configuradas.")
     return templates[0]
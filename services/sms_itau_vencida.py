@@ -3,13 +3,13 @@ from __future__ import annotations
 import json
 import re
 import unicodedata
-from difflib import SequenceMatcher
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
-from repositories import ejecutivos_repo
-from services import config_store
+from services import config_store, ejecutivos_directory
+from services.column_resolver import find_column
 from utils.paths import PROJECT_ROOT, archive_path, config_path
 
 
@@ -36,16 +36,8 @@ ITAU_MASIVIDAD_TO_TEMPLATE = {
     "SMS CAMPAÑA": "CAMPANA",
 }
 
-
-def _normalize_key(value: str) -> str:
-    return (
-        (value or "")
-        .strip()
-        .lower()
-        .replace(" ", "")
-        .replace("_", "")
-        .replace("-", "")
-    )
+CARTERIZADO_ALIASES = {"carterizado", "carterizado<", "agente", "ejecutivo", "nombre_agente", "nombre agente", "carterizado abril"}
+MASIVIDAD_ALIASES = {"masividad", "tipo_sms", "tipo sms", "gestion", "gestion"}
 
 
 def normalize_spaces(value: str) -> str:
@@ -63,15 +55,6 @@ def filename_token(value: str) -> str:
     return text or "MANDANTE"
 
 
-def _find_first_column(df: pd.DataFrame, aliases: set[str]) -> str | None:
-    normalized = {_normalize_key(col): col for col in df.columns}
-    for alias in aliases:
-        key = _normalize_key(alias)
-        if key in normalized:
-            return normalized[key]
-    return None
-
-
 def _find_itau_sms_file(filename: str) -> Path | None:
     for directory in ITAU_SMS_DIRS:
         path = directory / filename
@@ -150,62 +133,18 @@ def _resolve_itau_phone(mandante: str, carterizado_name: str) -> str:
     if not raw:
         return ""
 
-    candidates = [
-        raw,
-        raw.lower(),
-        raw.upper(),
-        ascii_fold(raw),
-        ascii_fold(raw).lower(),
-        ascii_fold(raw).upper(),
-    ]
-    seen: set[str] = set()
-    unique_candidates: list[str] = []
-    for item in candidates:
-        item = normalize_spaces(item)
-        if item and item not in seen:
-            seen.add(item)
-            unique_candidates.append(item)
-
-    for candidate in unique_candidates:
-        ejecutivo = ejecutivos_repo.fetch_by_mandante_and_nombre(mandante, candidate)
-        if ejecutivo and ejecutivo.telefono:
-            phone = _normalize_contact_phone(ejecutivo.telefono)
-            if phone:
-                return phone
-
-    target = ascii_fold(raw).lower().strip()
-    if target:
-        try:
-            best_score = 0.0
-            best_phone = ""
-            for ejecutivo in ejecutivos_repo.list_ejecutivos(mandante=mandante, activos=True):
-                options = [
-                    ascii_fold(ejecutivo.nombre_mostrar or "").lower().strip(),
-                    (ejecutivo.nombre_clave or "").replace("_", " ").lower().strip(),
-                ]
-                for option in options:
-                    if not option:
-                        continue
-                    score = SequenceMatcher(None, target, option).ratio()
-                    if score > best_score and ejecutivo.telefono:
-                        best_score = score
-                        best_phone = _normalize_contact_phone(ejecutivo.telefono)
-            if best_score >= 0.92 and best_phone:
-                return best_phone
-        except Exception:
-            pass
+    ejecutivo = ejecutivos_directory.get_directory(mandante).resolve(raw, require_phone=True)
+    if ejecutivo and ejecutivo.telefono:
+        return _normalize_contact_phone(ejecutivo.telefono)
     return ""
 
 
 def build_itau_carterizado_messages(df: pd.DataFrame, mandante: str) -> pd.Series:
-    carterizado_col = _find_first_column(
-        df,
-        {"carterizado", "carterizado<", "agente", "ejecutivo", "nombre_agente", "nombre agente", "carterizado abril"},
-    )
+    carterizado_col = find_column(df, CARTERIZADO_ALIASES)
     if not carterizado_col:
         raise ValueError("No se encontró la columna CARTERIZADO/AGENTE en el Excel.")
 
-    masividad_col = _find_first_column(df, {"masividad", "tipo_sms", "tipo sms", "gestion", "gestion"})
+    masividad_col = find_column(df, MASIVIDAD_ALIASES)
     if not masividad_col:
         raise ValueError("No se encontró la columna MASIVIDAD en el Excel de Itaú.")
 
@@ -226,45 +165,44 @@ def build_itau_carterizado_messages(df: pd.DataFrame, mandante: str) -> pd.Serie
             template_cache[key] = _strip_trailing_phone(load_itau_sms_template(key))
         return template_cache[key]
 
-    phones: list[str] = []
-    templates: list[str] = []
-    missing: list[str] = []
-    invalid_masividades: list[str] = []
+    # Un archivo trae pocas combinaciones distintas de MASIVIDAD y CARTERIZADO: se resuelve cada
+    # par una vez y el resultado se reparte a las filas por indice.
+    masividad_codes, masividades = pd.factorize(df[masividad_col].fillna("").astype(str), sort=False)
+    carterizado_codes, carterizados = pd.factorize(df[carterizado_col].fillna("").astype(str), sort=False)
+    width = max(len(carterizados), 1)
+    pair_codes, pair_keys = pd.factorize(masividad_codes * width + carterizado_codes, sort=False)
+
+    templates = [_template_text_from_masividad(value) for value in masividades]
+    if masividades.size and not any(templates):
+        uniq_invalid: list[str] = []
+        for value in masividades:
+            item = normalize_spaces(value) or "(vacío)"
+            if item not in uniq_invalid:
+                uniq_invalid.append(item)
+        raise ValueError(
+            "No se encontraron valores de MASIVIDAD válidos para SMS Itaú. "
+            f"Valores detectados: {', '.join(uniq_invalid[:8])}"
+        )
 
-    raw_carterizados = df[carterizado_col].fillna("").astype(str).tolist()
-    raw_masividades = df[masividad_col].fillna("").astype(str).tolist()
-    for raw_name, raw_masividad in zip(raw_carterizados, raw_masividades):
-        template_text = _template_text_from_masividad(raw_masividad)
-        templates.append(template_text)
+    phone_cache: dict[str, str] = {}
+    pair_messages: list[str] = []
+    uniq: list[str] = []
+    for key in pair_keys.tolist():
+        masividad_code, carterizado_code = divmod(key, width)
+        template_text = templates[masividad_code]
         if not template_text:
-            invalid_masividades.append(normalize_spaces(raw_masividad) or "(vacío)")
-            phones.append("")
+            pair_messages.append("")
             continue
-
-        carterizado = normalize_spaces(raw_name)
-        phone = _resolve_itau_phone(mandante, carterizado)
-        phones.append(phone)
-        if not phone:
-            missing.append(carterizado or "(vacío)")
-
-    if invalid_masividades:
-        uniq_invalid = []
-        for item in invalid_masividades:
-            if item not in uniq_invalid:
-                uniq_invalid.append(item)
-        only_invalid = all(not t for t in templates)
-        if only_invalid:
-            raise ValueError(
-                "No se encontraron valores de MASIVIDAD válidos para SMS Itaú. "
-                f"Valores detectados: {', '.join(uniq_invalid[:8])}"
-            )
-
-    messages = [f"{tpl} {phone}".strip() if tpl and phone else "" for tpl, phone in zip(templates, phones)]
-    if not any(messages):
-        uniq = []
-        for name in missing:
-            if name not in uniq:
-                uniq.append(name)
+        carterizado = normalize_spaces(carterizados[carterizado_code])
+        if carterizado not in phone_cache:
+            phone_cache[carterizado] = _resolve_itau_phone(mandante, carterizado)
+        phone = phone_cache[carterizado]
+        pair_messages.append(f"{template_text} {phone}".strip() if phone else "")
+        if not phone and (carterizado or "(vacío)") not in uniq:
+            uniq.append(carterizado or "(vacío)")
+
+    messages = np.asarray(pair_messages, dtype=object)[pair_codes]
+    if not any(pair_messages):
         preview = ", ".join(uniq[:8])
         extra = "" if len(uniq) <= 8 else f" ... (+{len(uniq) - 8} más)"
         raise ValueError(
@@ -347,11 +285,8 @@ def prepend_itau_seed_rows(
     if not seeds:
         return carga, 0
 
-    target_types = {
-        seed_type
-        for seed_type in mensaje_series.fillna("").astype(str).map(_seed_type_from_message).tolist()
-        if seed_type
-    }
+    messages = mensaje_series.fillna("").astype(str).unique()
+    target_types = {seed_type for seed_type in map(_seed_type_from_message, messages) if seed_type}
     if not target_types:
         return carga, 0
 
@@ -1,25 +1,19 @@
 # services/sms_service.py
+import numpy as np
 import pandas as pd
-from datetime import datetime, date, time, timedelta
+from datetime import date
+from typing import Iterator, Sequence
 
+from services.column_resolver import AliasTable
 from services.constants import COLUMN_MAP
-from services.contact_dedupe import dedupe_by_column_keep_first
+from services.contact_dedupe import dedupe_by_column_keep_first, dedupe_by_column_within_groups
+from services.crm_schedule import build_fecha_gestion, grouped_fecha_gestion
 
 REQUIRED_COLUMNS = {"RUT", "OP", "FONO"}
 SEED_PHONE = "976900353"
 SEED_PHONE_INTL = "56" + SEED_PHONE
 SEED_ID = "PRB"
-
-
-def _normalize_name(value: str) -> str:
-    return (
-        (value or "")
-        .strip()
-        .lower()
-        .replace(" ", "")
-        .replace("_", "")
-        .replace("-", "")
-    )
+GROUP_COLUMN = "__grupo"
 
 
 ALIAS_GROUPS = {
@@ -27,31 +21,23 @@ ALIAS_GROUPS = {
     "OP": {"op", "operacion"} | set(COLUMN_MAP.get("operacion", set())),
     "FONO": {"fono", "telefono"} | set(COLUMN_MAP.get("telefono", set())),
 }
+SMS_COLUMNS = AliasTable(ALIAS_GROUPS)
 
 
-def _resolve_column(df: pd.DataFrame, logical: str) -> str | None:
-    aliases = {_normalize_name(alias) for alias in ALIAS_GROUPS.get(logical, set())}
-    normalized_cols = {_normalize_name(col): col for col in df.columns}
-    for alias in aliases:
-        if alias in normalized_cols:
-            return normalized_cols[alias]
-    return None
+def input_columns(include_mensaje: bool = False) -> set[str]:
+    """Encabezados que usa la salida SMS; el resto del Excel no se necesita cargar."""
+    names = set().union(*ALIAS_GROUPS.values())
+    if include_mensaje:
+        names |= {"mensaje"} | set(COLUMN_MAP.get("mensaje", set()))
+    return names
 
 
-def _prepare_base_df(df: pd.DataFrame) -> pd.DataFrame:
+def _prepare_base_df(df: pd.DataFrame, group_codes: np.ndarray | None = None) -> pd.DataFrame:
     base = df.copy()
-    rename_map: dict[str, str] = {}
-    missing: list[str] = []
-    for logical in REQUIRED_COLUMNS:
-        column = _resolve_column(base, logical)
-        if not column:
-            missing.append(logical)
-        else:
-            rename_map[column] = logical
-    if missing:
-        raise ValueError(f"Faltan columnas en el Excel: {', '.join(sorted(missing))}")
-
-    base = base.rename(columns=rename_map)
+    resolved = SMS_COLUMNS.require(base, sorted(REQUIRED_COLUMNS), "Faltan columnas en el Excel: ")
+    base = base.rename(columns={resolved[logical]: logical for logical in REQUIRED_COLUMNS})
+    if group_codes is not None:
+        base[GROUP_COLUMN] = group_codes
     header_mask = (
         base["RUT"].astype(str).str.strip().str.upper().isin({"RUT", "ID", "ID_CLIENTE"})
         & base["OP"].astype(str).str.strip().str.upper().isin({"OP", "OPERACION", "OPERACIÓN", "NRO_DOCUMENTO"})
@@ -59,7 +45,10 @@ def _prepare_base_df(df: pd.DataFrame) -> pd.DataFrame:
     )
     if header_mask.any():
         base = base.loc[~header_mask].copy()
-    base = dedupe_by_column_keep_first(base, "RUT")
+    if group_codes is None:
+        base = dedupe_by_column_keep_first(base, "RUT")
+    else:
+        base = dedupe_by_column_within_groups(base, "RUT", GROUP_COLUMN)
 
     base["FONO"] = (
         base["FONO"].astype(str).str.replace(r"\.0$", "", regex=True).str.strip()
@@ -69,45 +58,6 @@ def _prepare_base_df(df: pd.DataFrame) -> pd.DataFrame:
     return base
 
 
-def _parse_hora(value: str) -> time:
-    value = (value or "").strip()
-    for fmt in ("%H:%M:%S", "%H:%M"):
-        try:
-            return datetime.strptime(value, fmt).time()
-        except ValueError:
-            continue
-    raise ValueError("Formato de hora inválido (usa HH:MM o HH:MM:SS).")
-
-
-def _generate_schedule(n: int, fecha: date, hora_inicio: str, hora_fin: str, intervalo_segundos: int | None) -> list[str]:
-    t_ini = _parse_hora(hora_inicio)
-    t_fin = _parse_hora(hora_fin)
-    dt_ini = datetime.combine(fecha, t_ini)
-    dt_fin = datetime.combine(fecha, t_fin)
-    if dt_fin <= dt_ini:
-        raise ValueError("La hora fin debe ser mayor a la hora inicio.")
-    rango_seg = int((dt_fin - dt_ini).total_seconds())
-    if n <= 0:
-        return []
-
-    if n > (rango_seg + 1):
-        raise ValueError(
-            f"El rango {hora_inicio}-{hora_fin} no alcanza para {n} registros. "
-            f"Con precision de segundos, la capacidad maxima es {rango_seg + 1}."
-        )
-
-    if n == 1:
-        return [dt_ini.strftime("%Y-%m-%d %H:%M:%S")]
-
-    # Se distribuye toda la base a lo largo del rango completo.
-    # El intervalo ingresado pasa a ser referencial para validacion UI,
-    # evitando rechazos innecesarios cuando hay capacidad en el rango.
-    span = (dt_fin - dt_ini).total_seconds()
-    offsets = [int(round((span * i) / (n - 1))) for i in range(n)]
-    schedule = [dt_ini + timedelta(seconds=offset) for offset in offsets]
-    return [dt.strftime("%Y-%m-%d %H:%M:%S") for dt in schedule]
-
-
 def _build_crm_from_base(
     base: pd.DataFrame,
     usuario: str,
@@ -117,7 +67,7 @@ def _build_crm_from_base(
     observacion: str,
     intervalo_segundos: int | None = None,
 ) -> pd.DataFrame:
-    schedule = _generate_schedule(len(base), fecha, hora_inicio, hora_fin, intervalo_segundos)
+    schedule = build_fecha_gestion(len(base), fecha, hora_inicio, hora_fin, intervalo_segundos, index=base.index)
     df1 = pd.DataFrame({
         "RUT": base["RUT"],
         "NRO_DOCUMENTO": base["OP"].astype(str),
@@ -202,6 +152,47 @@ def build_crm_output(
     return _build_crm_from_base(base, usuario, fecha, hora_inicio, hora_fin, obs, intervalo_segundos)
 
 
+def iter_crm_outputs_by_group(
+    df: pd.DataFrame,
+    group_codes: np.ndarray,
+    usuarios: Sequence[str],
+    fecha: date,
+    hora_inicio: str,
+    hora_fin: str,
+    observacion: str,
+    intervalo_segundos: int | None = None,
+) -> Iterator[tuple[int, pd.DataFrame]]:
+    """
+    Salida CRM por grupo (``group_codes[i]`` en 0..len(usuarios)-1, -1 descarta la fila).
+
+    Equivale a ``build_crm_output`` sobre las filas de cada grupo, pero prepara la base,
+    deduplica por (grupo, RUT) y arma FECHA_GESTION una sola vez para todo el archivo.
+    """
+    codes = np.asarray(group_codes, dtype=np.int64)
+    keep = np.flatnonzero(codes >= 0)
+    base = _prepare_base_df(df.iloc[keep], group_codes=codes[keep])
+    groups = base.pop(GROUP_COLUMN).to_numpy(dtype=np.int64)
+    order = np.argsort(groups, kind="stable")
+    base = base.iloc[order]
+    groups = groups[order]
+    counts = np.bincount(groups, minlength=len(usuarios))
+    schedule = grouped_fecha_gestion(groups, counts, fecha, hora_inicio, hora_fin)
+
+    salida = pd.DataFrame({
+        "RUT": base["RUT"].to_numpy(),
+        "NRO_DOCUMENTO": base["OP"].astype(str).to_numpy(),
+        "FECHA_GESTION": schedule,
+        "TELEFONO": base["FONO"].to_numpy(),
+        "OBSERVACION": (observacion or "").strip(),
+        "USUARIO": np.asarray(list(usuarios), dtype=object)[groups],
+        "CORREO": " ",
+    })
+    start = 0
+    for code, count in enumerate(counts.tolist()):
+        yield code, salida.iloc[start:start + count].reset_index(drop=True)
+        start += count
+
+
 def build_athenas_output(df: pd.DataFrame, mensaje: str, mensajes_series: pd.Series | None = None) -> pd.DataFrame:
     base = _prepare_base_df(df)
     return _build_athenas_from_base(base, mensaje, mensajes_series)
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 from datetime import datetime
-import re
-import unicodedata
 
 import pandas as pd
 
+from services.column_resolver import AliasTable, alnum_key
+
 
 COLUMNAS_CRM = [
     "Nro_Documento", "RUT - DV", "NOMBRE", "AD1", "NombreProducto", "AD2", "AD3", "AD4", "AD5", "AD6", "AD7",
@@ -40,22 +40,6 @@ TRAMO_TO_MARCA = {
 }
 
 
-def _normalize_key(value: str) -> str:
-    text = unicodedata.normalize("NFKD", str(value or ""))
-    text = text.encode("ascii", "ignore").decode("ascii")
-    text = text.lower().strip().replace(" ", "").replace("_", "")
-    return re.sub(r"[^a-z0-9]", "", text)
-
-
-def _find_col(df: pd.DataFrame, aliases: set[str]) -> str | None:
-    idx = {_normalize_key(c): c for c in df.columns}
-    for alias in aliases:
-        key = _normalize_key(alias)
-        if key in idx:
-            return idx[key]
-    return None
-
-
 def _text(series: pd.Series) -> pd.Series:
     out = series.fillna("").astype(str).str.strip()
     out = out.str.replace(r"\.0$", "", regex=True)
@@ -78,27 +62,52 @@ def _normalize_tramo(series: pd.Series) -> pd.Series:
     )
 
 
+TANNER_COLUMNS = AliasTable(
+    {
+        "ID_CREDITO": {"ID_CREDITO", "IDCREDITO", "NRO_OPERACION", "OPERACION"},
+        "RUT": {"RUT"},
+        "DV": {"DV"},
+        "NOMBRE": {"RAZON_SOCIAL", "NOMBRE_CLIENTE"},
+        "TRAMO": {"TRAMO_INI"},
+        "ESTADO_JUD": {"ESTADO_JUDICIAL"},
+        "VALOR_CUOTA": {"VALOR_CUOTA"},
+        "FECHA_VCTO": {"FECHA_PROX_VCTO"},
+        "MONTO_ADEUDADO": {"MONTO_ADEUDADO"},
+        "SALDO_INSOLUTO": {"SALDO_INSOLUTO_INI"},
+        "PATENTE": {"VEHICULO_1_PATENTE"},
+        "CAMPANA": {"CAMPANAS"},
+        "TRIBUNAL": {"TRIBUNAL"},
+        "EMAIL": {"EMAIL_1", "EMAIL"},
+        "FONO1": {"TELEFONO_1"},
+        "FONO2": {"TELEFONO_2"},
+        "FONO3": {"TELEFONO_3"},
+    },
+    normalize=alnum_key,
+)
+
+
 def build_tanner_asignacion(df_input: pd.DataFrame) -> pd.DataFrame:
     df = df_input.copy()
     df.columns = [str(c).replace("\ufeff", "").strip() for c in df.columns]
 
-    id_credito_col = _find_col(df, {"ID_CREDITO", "IDCREDITO", "NRO_OPERACION", "OPERACION"})
-    rut_col = _find_col(df, {"RUT"})
-    dv_col = _find_col(df, {"DV"})
-    nombre_col = _find_col(df, {"RAZON_SOCIAL", "NOMBRE_CLIENTE"})
-    tramo_col = _find_col(df, {"TRAMO_INI"})
-    estado_jud_col = _find_col(df, {"ESTADO_JUDICIAL"})
-    valor_cuota_col = _find_col(df, {"VALOR_CUOTA"})
-    fecha_vcto_col = _find_col(df, {"FECHA_PROX_VCTO"})
-    monto_adeudado_col = _find_col(df, {"MONTO_ADEUDADO"})
-    saldo_insoluto_col = _find_col(df, {"SALDO_INSOLUTO_INI"})
-    patente_col = _find_col(df, {"VEHICULO_1_PATENTE"})
-    campana_col = _find_col(df, {"CAMPANAS"})
-    tribunal_col = _find_col(df, {"TRIBUNAL"})
-    email_col = _find_col(df, {"EMAIL_1", "EMAIL"})
-    fono1_col = _find_col(df, {"TELEFONO_1"})
-    fono2_col = _find_col(df, {"TELEFONO_2"})
-    fono3_col = _find_col(df, {"TELEFONO_3"})
+    cols = TANNER_COLUMNS.resolve(df)
+    id_credito_col = cols["ID_CREDITO"]
+    rut_col = cols["RUT"]
+    dv_col = cols["DV"]
+    nombre_col = cols["NOMBRE"]
+    tramo_col = cols["TRAMO"]
+    estado_jud_col = cols["ESTADO_JUD"]
+    valor_cuota_col = cols["VALOR_CUOTA"]
+    fecha_vcto_col = cols["FECHA_VCTO"]
+    monto_adeudado_col = cols["MONTO_ADEUDADO"]
+    saldo_insoluto_col = cols["SALDO_INSOLUTO"]
+    patente_col = cols["PATENTE"]
+    campana_col = cols["CAMPANA"]
+    tribunal_col = cols["TRIBUNAL"]
+    email_col = cols["EMAIL"]
+    fono1_col = cols["FONO1"]
+    fono2_col = cols["FONO2"]
+    fono3_col = cols["FONO3"]
 
     required = {
         "ID_CREDITO": id_credito_col,
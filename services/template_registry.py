@@ -0,0 +1,134 @@
+"""Plantillas de config/*.json indexadas por clave y message_id, recargadas al cambiar el archivo."""
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Iterable, Mapping, Optional, TypeVar
+
+from services import config_store
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_REGISTRIES: list["TemplateRegistry[Any]"] = []
+_UNSET = object()
+
+
+@dataclass(frozen=True)
+class TemplateSnapshot(Generic[T]):
+    version: int
+    items: tuple[T, ...]
+    by_key: Mapping[str, T]
+    by_message_id: Mapping[int, T]
+
+
+def _as_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class TemplateRegistry(Generic[T]):
+    """
+    Vista indexada de un archivo de plantillas.
+
+    Cada acceso consulta ``config_store.read_json`` (que valida mtime y tamano); si el JSON
+    cambio, se reconstruye el indice completo y se publica de una vez con ``version`` + 1.
+    Si el archivo no existe o queda vacio se usan ``defaults``; si queda invalido se
+    mantiene la ultima version buena.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        build: Callable[[Any], Iterable[T]],
+        key: Callable[[T], str],
+        message_id: Optional[Callable[[T], Any]] = None,
+        defaults: Iterable[T] = (),
+    ) -> None:
+        self.filename = filename
+        self._build = build
+        self._key = key
+        self._message_id = message_id
+        self._defaults = tuple(defaults)
+        self._lock = threading.Lock()
+        self._source: Any = _UNSET
+        self._error = ""
+        self._snapshot = self._index(self._defaults, version=0)
+        _REGISTRIES.append(self)
+
+    def _index(self, items: tuple[T, ...], version: int) -> TemplateSnapshot[T]:
+        by_key: dict[str, T] = {}
+        by_message_id: dict[int, T] = {}
+        for item in items:
+            by_key.setdefault(self._key(item), item)
+            if self._message_id is not None:
+                message_id = _as_int(self._message_id(item))
+                if message_id is not None:
+                    by_message_id.setdefault(message_id, item)
+        return TemplateSnapshot(version=version, items=items, by_key=by_key, by_message_id=by_message_id)
+
+    def _warn(self, exc: Exception) -> None:
+        message = f"{type(exc).__name__}: {exc}"
+        if message != self._error:
+            self._error = message
+            logger.warning("Plantillas invalidas en config/%s, se mantiene la version %s (%s)", self.filename, self._snapshot.version, message)
+
+    def snapshot(self) -> TemplateSnapshot[T]:
+        try:
+            raw = config_store.read_json(self.filename)
+        except (OSError, ValueError) as exc:
+            self._warn(exc)
+            return self._snapshot
+        if raw is self._source:
+            return self._snapshot
+        with self._lock:
+            if raw is self._source:
+                return self._snapshot
+            try:
+                items = tuple(self._build(raw)) if raw is not None else ()
+            except (TypeError, ValueError, KeyError, AttributeError) as exc:
+                self._source = raw
+                self._warn(exc)
+                return self._snapshot
+            self._source = raw
+            self._error = ""
+            self._snapshot = self._index(items or self._defaults, self._snapshot.version + 1)
+            return self._snapshot
+
+    @property
+    def version(self) -> int:
+        return self.snapshot().version
+
+    def items(self) -> tuple[T, ...]:
+        return self.snapshot().items
+
+    def get(self, key: str) -> Optional[T]:
+        return self.snapshot().by_key.get(key)
+
+    def get_by_message_id(self, message_id: Any) -> Optional[T]:
+        value = _as_int(message_id)
+        return self.snapshot().by_message_id.get(value) if value is not None else None
+
+
+def _dict_items(data: Any) -> list[dict[str, Any]]:
+    if not isinstance(data, list):
+        return []
+    return [item for item in data if isinstance(item, dict)]
+
+
+def dict_template_registry(filename: str) -> TemplateRegistry[dict[str, Any]]:
+    """Registro para listas JSON de plantillas con "key" y "fixed_values.message_id" (GM, SC Telefonia)."""
+    return TemplateRegistry(
+        filename,
+        _dict_items,
+        key=lambda item: str(item.get("key") or ""),
+        message_id=lambda item: (item.get("fixed_values") or {}).get("message_id"),
+    )
+
+
+def versions() -> dict[str, int]:
+    return {registry.filename: registry.version for registry in _REGISTRIES}
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from flask import flash, jsonify, redirect, request, url_for
+from flask import flash, jsonify, redirect, request, send_file, url_for
 
 
 def wants_json_response() -> bool:
@@ -26,4 +26,25 @@ def api_error_response(message: str, redirect_endpoint: str, *, status: int = 40
     return redirect(url_for(redirect_endpoint))
 
 
-__all__ = ['api_error_response', 'wants_json_response']
+def wants_background_job() -> bool:
+    """El cliente pide ejecutar en segundo plano (campo/parametro ``async`` o ``Prefer: respond-async``)."""
+    flag = (request.values.get('async') or '').strip().lower()
+    if flag in {'1', 'true', 'on', 'yes'}:
+        return True
+    return 'respond-async' in (request.headers.get('Prefer') or '').lower()
+
+
+def job_accepted_response(job_id: str):
+    return jsonify({
+        'job_id': job_id,
+        'status_url': url_for('jobs.job_status', job_id=job_id),
+        'download_url': url_for('jobs.job_download', job_id=job_id),
+    }), 202
+
+
+def send_output(output):
+    """Envia como adjunto una ``services.jobs.JobOutput`` generada en el mismo request."""
+    return send_file(output.data, as_attachment=True, download_name=output.download_name, mimetype=output.mimetype)
+
+
+__all__ = ['api_error_response', 'job_accepted_response', 'send_output', 'wants_background_job', 'wants_json_response']
@@ -0,0 +1,228 @@
+"""Thread-safe connection pool shared by the database helpers."""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(RuntimeError):
+    pass
+
+
+@dataclass
+class _PooledConnection:
+    conn: Any
+    created_at: float
+    last_used: float
+
+
+class ConnectionPool:
+    """Pool de conexiones con limite de tamano, ping antes de reutilizar,
+    expiracion por inactividad y por vida maxima.
+
+    ``connect`` abre una conexion nueva y ``ping`` debe lanzar una excepcion si la
+    conexion ya no sirve. Al devolver una conexion se hace rollback para no
+    arrastrar transacciones abiertas al siguiente prestamo; si ``reusable``
+    devuelve False la conexion se cierra en vez de volver al pool.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        connect: Callable[[], Any],
+        ping: Callable[[Any], None],
+        reusable: Optional[Callable[[Any], bool]] = None,
+        max_size: int = 5,
+        acquire_timeout: float = 30.0,
+        idle_timeout: float = 300.0,
+        max_lifetime: float = 1800.0,
+    ):
+        self.name = name
+        self._connect = connect
+        self._ping = ping
+        self._reusable = reusable
+        self.max_size = max(1, int(max_size))
+        self.acquire_timeout = float(acquire_timeout)
+        self.idle_timeout = float(idle_timeout)
+        self.max_lifetime = float(max_lifetime)
+
+        self._idle: deque[_PooledConnection] = deque()
+        self._borrowed: dict[int, _PooledConnection] = {}
+        self._opening = 0
+        self._cond = threading.Condition(threading.Lock())
+        self._closed = False
+
+        self._created = 0
+        self._discarded = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._ping_failures = 0
+
+    def _size(self) -> int:
+        return len(self._idle) + len(self._borrowed) + self._opening
+
+    def _expired(self, item: _PooledConnection, now: float) -> bool:
+        if self.max_lifetime > 0 and now - item.created_at >= self.max_lifetime:
+            return True
+        return self.idle_timeout > 0 and now - item.last_used >= self.idle_timeout
+
+    def _close_quietly(self, conn: Any) -> None:
+        try:
+            conn.close()
+        except Exception as exc:  # pragma: no cover - conexion ya cerrada por el servidor
+            logger.debug("Error cerrando conexion del pool %s: %s", self.name, exc)
+
+    def acquire(self) -> Any:
+        started = time.monotonic()
+        deadline = started + self.acquire_timeout
+        waited = False
+        while True:
+            candidate: _PooledConnection | None = None
+            stale: list[_PooledConnection] = []
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError(f"El pool {self.name} esta cerrado.")
+                now = time.monotonic()
+                while self._idle:
+                    item = self._idle.pop()
+                    if self._expired(item, now):
+                        stale.append(item)
+                        continue
+                    candidate = item
+                    break
+                self._discarded += len(stale)
+                if candidate is None:
+                    if self._size() < self.max_size:
+                        self._opening += 1
+                    else:
+                        remaining = deadline - now
+                        if remaining <= 0:
+                            self._record_wait(time.monotonic() - started)
+                            raise PoolTimeoutError(
+                                f"No hay conexiones disponibles en el pool {self.name} "
+                                f"(maximo {self.max_size}, espera {self.acquire_timeout:g}s)."
+                            )
+                        waited = True
+                        self._cond.wait(remaining)
+                        continue
+                else:
+                    self._borrowed[id(candidate.conn)] = candidate
+
+            for item in stale:
+                self._close_quietly(item.conn)
+
+            if candidate is not None:
+                try:
+                    self._ping(candidate.conn)
+                except Exception as exc:
+                    logger.debug("Conexion descartada del pool %s tras ping fallido: %s", self.name, exc)
+                    with self._cond:
+                        self._borrowed.pop(id(candidate.conn), None)
+                        self._discarded += 1
+                        self._ping_failures += 1
+                        self._cond.notify()
+                    self._close_quietly(candidate.conn)
+                    continue
+                item = candidate
+            else:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._opening -= 1
+                        self._cond.notify()
+                    raise
+                now = time.monotonic()
+                item = _PooledConnection(conn=conn, created_at=now, last_used=now)
+                with self._cond:
+                    self._opening -= 1
+                    self._created += 1
+                    self._borrowed[id(conn)] = item
+
+            with self._cond:
+                self._checkouts += 1
+                if waited:
+                    self._record_wait(time.monotonic() - started)
+            return item.conn
+
+    def _record_wait(self, seconds: float) -> None:
+        self._waits += 1
+        self._wait_seconds += seconds
+        self._max_wait_seconds = max(self._max_wait_seconds, seconds)
+
+    def release(self, conn: Any, *, discard: bool = False) -> None:
+        if not discard and self._reusable is not None:
+            try:
+                discard = not self._reusable(conn)
+            except Exception:
+                discard = True
+        if not discard:
+            try:
+                conn.rollback()
+            except Exception as exc:
+                logger.debug("Rollback fallido en pool %s, se descarta la conexion: %s", self.name, exc)
+                discard = True
+        with self._cond:
+            item = self._borrowed.pop(id(conn), None)
+            if item is None:
+                discard = True
+            elif not discard and not self._closed:
+                item.last_used = time.monotonic()
+                self._idle.append(item)
+            else:
+                discard = True
+            if discard:
+                self._discarded += 1
+            self._cond.notify()
+        if discard:
+            self._close_quietly(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close_all(self) -> None:
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._discarded += len(idle)
+            self._cond.notify_all()
+        for item in idle:
+            self._close_quietly(item.conn)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+        self.close_all()
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "name": self.name,
+                "max_size": self.max_size,
+                "open": self._size(),
+                "borrowed": len(self._borrowed),
+                "idle": len(self._idle),
+                "created": self._created,
+                "discarded": self._discarded,
+                "checkouts": self._checkouts,
+                "ping_failures": self._ping_failures,
+                "waits": self._waits,
+                "wait_seconds_total": round(self._wait_seconds, 4),
+                "wait_seconds_max": round(self._max_wait_seconds, 4),
+                "wait_ms_avg": round(self._wait_seconds / self._waits * 1000, 2) if self._waits else 0.0,
+            }
@@ -2,11 +2,15 @@
 from __future__ import annotations
 
 import os
+import threading
 from contextlib import contextmanager
 from pathlib import Path
+from typing import Any, Optional
 
 import mysql.connector
 
+from utils.db_pool import ConnectionPool
+
 
 def _load_env_file() -> None:
     env_path = Path(".env")
@@ -35,10 +39,55 @@ RESULT_DB_CONFIG = {
 }
 
 
+_POOL: Optional[ConnectionPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def _open_connection():
+    return mysql.connector.connect(**RESULT_DB_CONFIG)
+
+
+def _ping(conn) -> None:
+    # Reconecta en el mismo objeto si el servidor cerro la sesion por inactividad.
+    attempts = int(os.getenv("RESULT_DB_POOL_RECONNECT_ATTEMPTS", "1"))
+    conn.ping(reconnect=attempts > 0, attempts=max(attempts, 1), delay=0)
+
+
+def _reusable(conn) -> bool:
+    # Una lectura sin buffer abandonada a medias deja filas pendientes en el socket.
+    return not getattr(conn, "unread_result", False)
+
+
+def get_resultantes_pool() -> ConnectionPool:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ConnectionPool(
+                "resultantes",
+                connect=_open_connection,
+                ping=_ping,
+                reusable=_reusable,
+                max_size=int(os.getenv("RESULT_DB_POOL_SIZE", "5")),
+                acquire_timeout=float(os.getenv("RESULT_DB_POOL_TIMEOUT", "60")),
+                idle_timeout=float(os.getenv("RESULT_DB_POOL_IDLE_TIMEOUT", "300")),
+                max_lifetime=float(os.getenv("RESULT_DB_POOL_MAX_LIFETIME", "1800")),
+            )
+        return _POOL
+
+
+def reset_resultantes_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.close()
+
+
+def resultantes_pool_stats() -> dict[str, Any]:
+    return get_resultantes_pool().stats()
+
+
 @contextmanager
 def get_resultantes_connection():
-    conn = mysql.connector.connect(**RESULT_DB_CONFIG)
-    try:
+    with get_resultantes_pool().connection() as conn:
         yield conn
-    finally:
-        conn.close()
@@ -2,11 +2,15 @@
 from __future__ import annotations
 
 import os
+import threading
 from contextlib import contextmanager
 from pathlib import Path
+from typing import Any, Optional
 
 import pyodbc
 
+from utils.db_pool import ConnectionPool
+
 
 def _load_env_file() -> None:
     env_path = Path(".env")
@@ -53,11 +57,53 @@ def _connection_string() -> str:
     )
 
 
-@contextmanager
-def get_stc_connection():
+_POOL: Optional[ConnectionPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def _open_connection():
     timeout = int(os.getenv("STC_DB_TIMEOUT", "30"))
-    conn = pyodbc.connect(_connection_string(), timeout=timeout, autocommit=False)
+    return pyodbc.connect(_connection_string(), timeout=timeout, autocommit=False)
+
+
+def _ping(conn) -> None:
+    cur = conn.cursor()
     try:
-        yield conn
+        cur.execute("SELECT 1")
+        cur.fetchall()
     finally:
-        conn.close()
+        cur.close()
+
+
+def get_stc_pool() -> ConnectionPool:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ConnectionPool(
+                "stc",
+                connect=_open_connection,
+                ping=_ping,
+                max_size=int(os.getenv("STC_DB_POOL_SIZE", "5")),
+                acquire_timeout=float(os.getenv("STC_DB_POOL_TIMEOUT", "30")),
+                idle_timeout=float(os.getenv("STC_DB_POOL_IDLE_TIMEOUT", "300")),
+                max_lifetime=float(os.getenv("STC_DB_POOL_MAX_LIFETIME", "1800")),
+            )
+        return _POOL
+
+
+def reset_stc_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.close()
+
+
+def stc_pool_stats() -> dict[str, Any]:
+    return get_stc_pool().stats()
+
+
+@contextmanager
+def get_stc_connection():
+    with get_stc_pool().connection() as conn:
+        yield conn
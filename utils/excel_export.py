@@ -1,42 +1,256 @@
 # utils/excel_export.py
 import io
+import logging
+import multiprocessing
+import os
+import pickle
+import tempfile
+import threading
 import zipfile
-from typing import cast
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import IO, Iterable, Optional, Union
 
 import pandas as pd
-from pandas._typing import WriteExcelBuffer
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+
+# Filas por bloque al convertir el DataFrame a valores de celda.
+_ROW_CHUNK = 5000
+
+# Tamano maximo en memoria de un ZIP antes de pasar a archivo temporal en disco.
+ZIP_SPOOL_MAX_BYTES = int(os.getenv("ZIP_SPOOL_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# Hojas con menos celdas que esto se escriben en el proceso actual aunque haya pool.
+EXPORT_PARALLEL_MIN_CELLS = int(os.getenv("EXPORT_PARALLEL_MIN_CELLS", "50000"))
+
+_THIN = Side(style="thin")
+_HEADER_FONT = Font(bold=True)
+_HEADER_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+_HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="top")
+
+XlsxTarget = Union[str, "os.PathLike[str]", IO[bytes]]
+
+logger = logging.getLogger(__name__)
+
+
+def _header_row(ws, columns) -> list:
+    # Mismo estilo de encabezado que pandas.to_excel (negrita, borde fino, centrado).
+    cells = []
+    for column in columns:
+        cell = WriteOnlyCell(ws, value=column)
+        cell.font = _HEADER_FONT
+        cell.border = _HEADER_BORDER
+        cell.alignment = _HEADER_ALIGNMENT
+        cells.append(cell)
+    return cells
+
+
+def _chunk_rows(chunk: pd.DataFrame):
+    columns = []
+    for position in range(chunk.shape[1]):
+        series = chunk.iloc[:, position].astype(object)
+        columns.append(series.where(series.notna(), None).tolist())
+    return zip(*columns)
+
+
+def write_df_xlsx(df: pd.DataFrame, target: XlsxTarget, sheet_name: str = "Hoja1", header: bool = True) -> None:
+    """Escribe el DataFrame como XLSX fila a fila con una hoja write-only de openpyxl.
+
+    ``target`` puede ser una ruta o un stream binario (BytesIO, entrada de un ZIP, etc.).
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_name)
+    if header:
+        ws.append(_header_row(ws, df.columns))
+    if df.shape[1]:
+        for start in range(0, len(df), _ROW_CHUNK):
+            for row in _chunk_rows(df.iloc[start:start + _ROW_CHUNK]):
+                ws.append(row)
+    wb.save(target)
+
 
 def df_to_xlsx_bytes(df: pd.DataFrame, sheet_name: str = "Hoja1", header: bool = True) -> bytes:
     bio = io.BytesIO()
-    excel_buffer = cast(WriteExcelBuffer, bio)
-    with pd.ExcelWriter(excel_buffer, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name=sheet_name, header=header)
+    write_df_xlsx(df, bio, sheet_name=sheet_name, header=header)
     return bio.getvalue()
 
 def df_to_xlsx_bytesio(df: pd.DataFrame, sheet_name: str = "Hoja1", header: bool = True) -> io.BytesIO:
-    bio = io.BytesIO(df_to_xlsx_bytes(df, sheet_name, header=header))
+    bio = io.BytesIO()
+    write_df_xlsx(df, bio, sheet_name=sheet_name, header=header)
     bio.seek(0)
     return bio
 
-def zip_named_dfs_bytes(named_dfs: list[tuple[str, pd.DataFrame]]) -> io.BytesIO:
+def export_workers() -> int:
+    """Procesos para serializar XLSX en paralelo (EXPORT_WORKERS: 0 = desactivado, "auto" = CPUs)."""
+    raw = os.getenv("EXPORT_WORKERS", "0").strip().lower()
+    if raw == "auto":
+        return os.cpu_count() or 1
+    try:
+        return max(int(raw), 0)
+    except ValueError:
+        return 0
+
+
+_POOL_LOCK = threading.Lock()
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_SIZE = 0
+
+
+def _export_pool() -> Optional[ProcessPoolExecutor]:
+    global _POOL, _POOL_SIZE
+    workers = export_workers()
+    if workers < 2:
+        return None
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_SIZE != workers:
+            if _POOL is not None:
+                _POOL.shutdown(wait=False)
+            _POOL = ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context())
+            _POOL_SIZE = workers
+        return _POOL
+
+
+def _pool_context():
+    # Sin fork: el pool nace dentro de un hilo del servidor y un hijo forkeado heredaria locks tomados por otros hilos.
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    context = multiprocessing.get_context(method)
+    if method == "forkserver":
+        context.set_forkserver_preload([__name__])
+    return context
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    # Un pool roto (hijo muerto por OOM, kill, etc.) no se recupera; el siguiente _export_pool crea otro.
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is pool:
+            _POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _encode_frame(df: pd.DataFrame) -> tuple[str, bytes]:
+    # Arrow IPC si pyarrow esta instalado (evita picklear columnas objeto celda a celda); si no, pickle 5.
+    try:
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return "arrow", sink.getvalue().to_pybytes()
+    except (ImportError, TypeError, ValueError, NotImplementedError):
+        return "pickle", pickle.dumps(df, protocol=5)
+
+
+def _decode_frame(kind: str, payload: bytes) -> pd.DataFrame:
+    if kind == "arrow":
+        import pyarrow as pa
+
+        return pa.ipc.open_stream(payload).read_all().to_pandas()
+    return pickle.loads(payload)
+
+
+def _xlsx_worker(kind: str, payload: bytes, sheet_name: str, header: bool) -> bytes:
+    return df_to_xlsx_bytes(_decode_frame(kind, payload), sheet_name=sheet_name, header=header)
+
+
+class ZipBundle:
+    """ZIP de salida escrito sobre un SpooledTemporaryFile.
+
+    Cada archivo se genera directamente dentro de su entrada del ZIP, de modo que
+    solo el archivo en curso vive en memoria. ``finish`` cierra el ZIP y devuelve
+    el handle posicionado al inicio, listo para ``send_file``.
+
+    Con EXPORT_WORKERS >= 2 los XLSX grandes se serializan en un pool de procesos y se
+    agregan al ZIP a medida que terminan (el orden de las entradas puede variar).
+    """
+
+    def __init__(self, max_memory: int = ZIP_SPOOL_MAX_BYTES):
+        self._file = tempfile.SpooledTemporaryFile(max_size=max_memory, mode="w+b")
+        self._zip = zipfile.ZipFile(self._file, "w", compression=zipfile.ZIP_DEFLATED)
+        self._pool = _export_pool()
+        self._pending: dict[Future, tuple[str, tuple, ProcessPoolExecutor]] = {}
+
+    def __enter__(self) -> "ZipBundle":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.close()
+
+    def add_xlsx(self, filename: str, df: pd.DataFrame, sheet_name: str = "Hoja1", header: bool = True) -> None:
+        if self._pool is not None and df.size >= EXPORT_PARALLEL_MIN_CELLS:
+            # Acota los archivos en vuelo para no retener todos los DataFrames serializados.
+            while len(self._pending) >= 2 * _POOL_SIZE:
+                self._drain(FIRST_COMPLETED)
+            job = (*_encode_frame(df), sheet_name, header)
+            pool = self._pool
+            try:
+                self._pending[pool.submit(_xlsx_worker, *job)] = (filename, job, pool)
+            except BrokenProcessPool:
+                self._recover(pool, filename, job)
+            return
+        with self._zip.open(filename, "w") as handle:
+            write_df_xlsx(df, handle, sheet_name=sheet_name, header=header)
+
+    def _drain(self, return_when: str) -> None:
+        done, _ = wait(list(self._pending), return_when=return_when)
+        for future in done:
+            filename, job, pool = self._pending.pop(future)
+            try:
+                self._zip.writestr(filename, future.result())
+            except BrokenProcessPool:
+                self._recover(pool, filename, job)
+
+    def _recover(self, pool: ProcessPoolExecutor, filename: str, job: tuple) -> None:
+        # Reemplaza el pool roto y genera este archivo en el proceso actual.
+        logger.warning("Pool de exportacion roto; se recrea y %s se genera en el proceso actual.", filename)
+        _discard_pool(pool)
+        if self._pool is pool:
+            self._pool = _export_pool()
+        self._zip.writestr(filename, _xlsx_worker(*job))
+
+    def add_csv(self, filename: str, df: pd.DataFrame, encoding: str = "utf-8-sig", **to_csv_kwargs) -> None:
+        with self._zip.open(filename, "w") as handle:
+            with io.TextIOWrapper(handle, encoding=encoding, newline="") as text:
+                df.to_csv(text, **to_csv_kwargs)
+
+    def add_bytes(self, filename: str, payload: bytes) -> None:
+        self._zip.writestr(filename, payload)
+
+    def finish(self) -> IO[bytes]:
+        while self._pending:
+            self._drain(FIRST_COMPLETED)
+        self._zip.close()
+        self._file.seek(0)
+        return self._file
+
+    def close(self) -> None:
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._zip.close()
+        self._file.close()
+
+
+def zip_named_dfs_bytes(named_dfs: Iterable[tuple[str, pd.DataFrame]]) -> IO[bytes]:
     """
-    named_dfs: [(filename.xlsx, dataframe), ...]
+    named_dfs: [(filename.xlsx, dataframe), ...]; acepta un generador para
+    construir cada DataFrame recien cuando se escribe.
     """
-    zip_bio = io.BytesIO()
-    with zipfile.ZipFile(zip_bio, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+    with ZipBundle() as bundle:
         for filename, df in named_dfs:
-            zf.writestr(filename, df_to_xlsx_bytes(df, sheet_name="Hoja1"))
-    zip_bio.seek(0)
-    return zip_bio
+            bundle.add_xlsx(filename, df, sheet_name="Hoja1")
+        return bundle.finish()
 
-def zip_two_excels_bytes(a, b) -> io.BytesIO:
+def zip_two_excels_bytes(a, b) -> IO[bytes]:
     """
     a = (filename, df, sheet_name)
     b = (filename, df, sheet_name)
     """
-    zip_bio = io.BytesIO()
-    with zipfile.ZipFile(zip_bio, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        zf.writestr(a[0], df_to_xlsx_bytes(a[1], a[2]))
-        zf.writestr(b[0], df_to_xlsx_bytes(b[1], b[2]))
-    zip_bio.seek(0)
-    return zip_bio
+    with ZipBundle() as bundle:
+        for filename, df, sheet_name in (a, b):
+            bundle.add_xlsx(filename, df, sheet_name=sheet_name)
+        return bundle.finish()
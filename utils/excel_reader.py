@@ -0,0 +1,54 @@
+"""Central reader for uploaded workbooks: engine selection, column pruning and parse cache."""
+from __future__ import annotations
+
+import importlib.util
+import io
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import pandas as pd
+
+from utils.upload_cache import cached_frame
+
+
+def normalize_header(value: Any) -> str:
+    return str(value if value is not None else "").strip().lower().replace(" ", "").replace("_", "").replace("-", "")
+
+
+def excel_engine() -> Optional[str]:
+    """Motor de lectura: calamine si esta instalado (o si se fuerza por EXCEL_READ_ENGINE), si no openpyxl."""
+    choice = os.getenv("EXCEL_READ_ENGINE", "auto").strip().lower()
+    if choice == "auto":
+        return "calamine" if importlib.util.find_spec("python_calamine") else None
+    return None if choice in {"", "openpyxl"} else choice
+
+
+def _read_bytes(source: Any) -> bytes:
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, (str, Path)):
+        return Path(source).read_bytes()
+    return source.read()
+
+
+def read_input_table(source: Any, columns: Optional[Iterable[str]] = None, **read_kwargs: Any) -> pd.DataFrame:
+    """
+    Lee la primera hoja de un Excel subido (FileStorage, ruta o bytes).
+
+    ``columns`` son nombres o alias aceptados; se comparan normalizados contra la fila de
+    encabezado y solo se cargan las columnas que calzan. Sin ``columns`` se cargan todas.
+    """
+    data = _read_bytes(source)
+    engine = excel_engine()
+    wanted = sorted({normalize_header(name) for name in columns}) if columns is not None else None
+    if wanted is not None:
+        keep = set(wanted)
+        read_kwargs["usecols"] = lambda header: normalize_header(header) in keep
+    variant = json.dumps(
+        {"engine": engine, "columns": wanted, "kwargs": {k: v for k, v in read_kwargs.items() if k != "usecols"}},
+        sort_keys=True,
+        default=str,
+    )
+    return cached_frame(data, variant, lambda raw: pd.read_excel(io.BytesIO(raw), engine=engine, **read_kwargs))
@@ -0,0 +1,104 @@
+"""Cache of parsed uploads keyed by content hash, shared between endpoints and workers."""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from utils.file_lock import file_lock
+from utils.paths import storage_path
+
+logger = logging.getLogger(__name__)
+
+_SUFFIX = ".pkl"
+
+
+def cache_dir() -> Path:
+    return storage_path("cache", "uploads")
+
+
+def cache_enabled() -> bool:
+    return os.getenv("UPLOAD_CACHE_ENABLED", "1").lower() in {"1", "true", "yes"}
+
+
+def _min_bytes() -> int:
+    return int(float(os.getenv("UPLOAD_CACHE_MIN_KB", "64")) * 1024)
+
+
+def _max_bytes() -> int:
+    return int(float(os.getenv("UPLOAD_CACHE_MAX_MB", "1024")) * 1024 * 1024)
+
+
+def _entry_path(data: bytes, variant: str) -> Path:
+    digest = hashlib.sha256(data)
+    digest.update(b"\0" + variant.encode("utf-8"))
+    return cache_dir() / f"{digest.hexdigest()}{_SUFFIX}"
+
+
+def _store(path: Path, df: pd.DataFrame) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.stem[:16]}.", suffix=".tmp", dir=str(path.parent))
+    os.close(fd)
+    try:
+        df.to_pickle(tmp_name)
+        os.replace(tmp_name, path)
+    except Exception:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def evict() -> None:
+    """Elimina las entradas menos usadas (mtime) hasta quedar bajo UPLOAD_CACHE_MAX_MB."""
+    directory = cache_dir()
+    if not directory.exists():
+        return
+    with file_lock(directory / ".lock"):
+        entries = []
+        for path in directory.glob(f"*{_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        limit = _max_bytes()
+        for _, size, path in sorted(entries):
+            if total <= limit:
+                break
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as exc:
+                logger.debug("No se pudo eliminar %s del cache de cargas: %s", path.name, exc)
+                continue
+            total -= size
+
+
+def cached_frame(data: bytes, variant: str, parse: Callable[[bytes], pd.DataFrame]) -> pd.DataFrame:
+    """Devuelve ``parse(data)`` reutilizando el resultado si ya se parseo el mismo contenido."""
+    if not cache_enabled() or len(data) < _min_bytes():
+        return parse(data)
+
+    path = _entry_path(data, variant)
+    try:
+        df = pd.read_pickle(path)
+        os.utime(path)
+        return df
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, EOFError, pickle.UnpicklingError) as exc:
+        logger.debug("Entrada de cache de cargas ilegible %s: %s", path.name, exc)
+
+    df = parse(data)
+    try:
+        _store(path, df)
+        evict()
+    except (OSError, TimeoutError) as exc:
+        logger.warning("No se pudo guardar la carga en cache: %s", exc)
+    return df
+